@@ -138,10 +138,14 @@ export default function SearchPage() {
               const data = JSON.parse(jsonStr);
 
               if (data.type === 'companies_list') {
-                setCompanies(data.companies.map((company: any) => ({
+                const incoming = data.companies.map((company: any) => ({
                   ...company,
                   status: 'searching'
-                })));
+                }));
+                // Streamed searches send one company at a time as a delta
+                setCompanies(prev => data.delta
+                  ? [...prev.filter(company => !incoming.some((c: any) => c.id === company.id)), ...incoming]
+                  : incoming);
               } 
               else if (data.type === 'progress_update') {
                 const { company_id, status, jobs } = data;
@@ -31,7 +31,7 @@ export async function POST(req: NextRequest) {
       '--openai_api_key', user.openaiKey,
       '--google_api_key', user.googleApiKey,
       '--google_cse_id', user.googleCseId,
-      '--text_only'
+      '--stream_companies'
     ]);
 
     const stream = new TransformStream();
@@ -49,8 +49,7 @@ export async function POST(req: NextRequest) {
       }
     });
 
-    pythonProcess.stdout.on('data', async (data) => {
-      const output = data.toString();
+    const handleOutput = async (output: string) => {
       try {
         if (output.includes('"type":')) {
           const jsonData = JSON.parse(output);
@@ -90,6 +89,18 @@ export async function POST(req: NextRequest) {
       } catch (e) {
         console.error('Error processing output:', e);
       }
+    };
+
+    // stdout chunks can hold several JSON lines or end mid-line
+    let stdoutBuffer = '';
+
+    pythonProcess.stdout.on('data', (data) => {
+      stdoutBuffer += data.toString();
+      const lines = stdoutBuffer.split('\n');
+      stdoutBuffer = lines.pop() || '';
+      for (const line of lines) {
+        handleOutput(line);
+      }
     });
 
     pythonProcess.stderr.on('data', (data) => {
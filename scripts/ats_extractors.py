@@ -0,0 +1,202 @@
+import logging
+import re
+from urllib.parse import urljoin, urlparse
+
+from html_parsing import make_soup
+
+
+# Words ignored when matching a job title against the requested position
+POSITION_STOPWORDS = {"and", "the", "for", "with", "of", "in", "a", "an", "to", "or"}
+# Abbreviations and variants read as the same word in titles and positions
+POSITION_SYNONYMS = {"sr": "senior", "snr": "senior", "jr": "junior", "mgr": "manager", "eng": "engineer",
+                     "dev": "developer", "swe": "software engineer", "internship": "intern"}
+
+
+class BoardExtractor:
+    """Parser for one applicant tracking system's job board markup.
+
+    Matched by the host of the page URL, or by a marker string in the HTML
+    for boards embedded in a company's own site. `parse(soup, page_url)`
+    returns (title, location, link) tuples.
+    """
+
+    def __init__(self, name, hosts, markers, parse):
+        self.name = name
+        self.hosts = hosts
+        self.markers = markers
+        self.parse = parse
+
+    def matches_url(self, page_url):
+        host = urlparse(page_url).netloc.lower()
+        return any(host == known or host.endswith("." + known) for known in self.hosts)
+
+    def matches_markup(self, html):
+        return any(marker in html for marker in self.markers)
+
+
+BOARD_EXTRACTORS = []
+
+
+def board_extractor(name, hosts=(), markers=()):
+    """Register a board parser; see BoardExtractor."""
+    def register(parse):
+        BOARD_EXTRACTORS.append(BoardExtractor(name, hosts, markers, parse))
+        return parse
+    return register
+
+
+def find_extractor(page_url, html=None):
+    """Return the extractor for a page, by URL and, if `html` is given, by markup."""
+    for extractor in BOARD_EXTRACTORS:
+        if extractor.matches_url(page_url):
+            return extractor
+    if html:
+        for extractor in BOARD_EXTRACTORS:
+            if extractor.matches_markup(html):
+                return extractor
+    return None
+
+
+def text_of(element):
+    return element.get_text(" ", strip=True) if element else ""
+
+
+@board_extractor("greenhouse", hosts=("boards.greenhouse.io", "job-boards.greenhouse.io"),
+                 markers=('class="opening"', 'class="job-post"'))
+def parse_greenhouse(soup, page_url):
+    listings = []
+    # Classic boards
+    for opening in soup.select("div.opening"):
+        anchor = opening.find("a", href=True)
+        if anchor:
+            listings.append((text_of(anchor), text_of(opening.select_one(".location")),
+                             urljoin(page_url, anchor["href"])))
+    # Current boards
+    for row in soup.select("tr.job-post"):
+        anchor = row.find("a", href=True)
+        if anchor:
+            title = anchor.select_one("p.body--medium") or anchor
+            location = anchor.select_one("p.body__secondary, p.body--metadata")
+            listings.append((text_of(title), text_of(location), urljoin(page_url, anchor["href"])))
+    return listings
+
+
+@board_extractor("lever", hosts=("jobs.lever.co", "jobs.eu.lever.co"),
+                 markers=('class="posting-title"',))
+def parse_lever(soup, page_url):
+    listings = []
+    for posting in soup.select("div.posting"):
+        anchor = posting.select_one("a.posting-title[href]")
+        if anchor:
+            title = anchor.select_one('[data-qa="posting-name"], h5') or anchor
+            location = posting.select_one(".posting-categories .location, .sort-by-location")
+            listings.append((text_of(title), text_of(location), urljoin(page_url, anchor["href"])))
+    return listings
+
+
+@board_extractor("workday", hosts=("myworkdayjobs.com", "myworkdaysite.com"),
+                 markers=('data-automation-id="jobTitle"',))
+def parse_workday(soup, page_url):
+    listings = []
+    for anchor in soup.select('a[data-automation-id="jobTitle"][href]'):
+        item = anchor.find_parent("li") or anchor.parent
+        location = item.select_one('[data-automation-id="locations"] dd') if item else None
+        listings.append((text_of(anchor), text_of(location), urljoin(page_url, anchor["href"])))
+    return listings
+
+
+ASHBY_POSTING_PATH = re.compile(r"/[^/]+/[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}/?$")
+
+
+@board_extractor("ashby", hosts=("jobs.ashbyhq.com",), markers=("ashby-job-posting-brief",))
+def parse_ashby(soup, page_url):
+    listings = []
+    for anchor in soup.find_all("a", href=True):
+        if not ASHBY_POSTING_PATH.search(urlparse(anchor["href"]).path):
+            continue
+        title = anchor.find(["h3", "h2"]) or anchor
+        # Details read "Department • Location • Employment type"
+        details = [part.strip() for part in text_of(anchor.find("p")).split("•") if part.strip()]
+        location = details[1] if len(details) > 1 else (details[0] if details else "")
+        listings.append((text_of(title), location, urljoin(page_url, anchor["href"])))
+    return listings
+
+
+@board_extractor("smartrecruiters", hosts=("careers.smartrecruiters.com", "jobs.smartrecruiters.com"),
+                 markers=('class="opening-job',))
+def parse_smartrecruiters(soup, page_url):
+    listings = []
+    for opening in soup.select("li.opening-job"):
+        anchor = opening.find("a", href=True)
+        if anchor:
+            title = opening.select_one(".job-title") or anchor
+            location = opening.select_one(".job-desc, [itemprop='address']")
+            listings.append((text_of(title), text_of(location), urljoin(page_url, anchor["href"])))
+    return listings
+
+
+def word_stem(word):
+    """Crude stem so that "Engineering" matches "Engineer" and "Scientists" matches "Scientist"."""
+    if len(word) > 5 and word.endswith("ing"):
+        return word[:-3]
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def position_words(text):
+    """Stemmed significant words of a title or position, in order."""
+    # "Front-End" and "Frontend" read the same
+    words = re.findall(r"[a-z0-9+#]+", text.lower().replace("-", ""))
+    expanded = " ".join(POSITION_SYNONYMS.get(word, word) for word in words).split()
+    return [word_stem(word) for word in expanded if word not in POSITION_STOPWORDS]
+
+
+def title_matches_position(title, position):
+    """True if every significant word of the position appears in the job title.
+
+    Words are compared stemmed and with common abbreviations expanded; a
+    position written as separate words also matches the same words run
+    together ("Front End" and "Frontend").
+    """
+    wanted = position_words(position)
+    if not wanted:
+        return False
+    have = position_words(title)
+    # Each title word plus runs of up to three adjacent words written together
+    have_runs = {"".join(have[start:end]) for start in range(len(have))
+                 for end in range(start + 1, min(start + 3, len(have)) + 1)}
+    return set(wanted) <= have_runs or "".join(wanted) in have_runs
+
+
+def board_job(company_name, title, location, link):
+    """A job in the same shape the model extraction returns."""
+    return {
+        "Company Name": company_name or "N/A",
+        "Job Title": title,
+        "Application Link": link,
+        "Job Description": "N/A",
+        "Required Certifications": [],
+        "Location": location or "N/A",
+    }
+
+
+def parse_board(html, page_url, soup=None):
+    """Parse the listings of a known board's HTML as (title, location, link) tuples.
+
+    Pass `soup` if the page is already parsed. Returns None when the page is
+    not a known board or its parser finds no listings at all (e.g. the
+    markup changed), so the caller can fall back to the model.
+    """
+    extractor = find_extractor(page_url, html)
+    if not extractor:
+        return None
+
+    if soup is None:
+        soup = make_soup(html)
+    listings = [listing for listing in extractor.parse(soup, page_url) if listing[0]]
+    if not listings:
+        logging.info(f"Page looks like a {extractor.name} board but no listings were parsed")
+        return None
+    logging.info(f"Parsed {len(listings)} {extractor.name} listings without the model")
+    return listings
@@ -0,0 +1,157 @@
+import logging
+import os
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from job_extraction import listing_jobs
+
+
+# Public job feed endpoints; override to point at a local stub
+GREENHOUSE_API_URL = os.getenv('GREENHOUSE_API_URL', 'https://boards-api.greenhouse.io/v1/boards')
+LEVER_API_URL = os.getenv('LEVER_API_URL', 'https://api.lever.co/v0/postings')
+LEVER_EU_API_URL = os.getenv('LEVER_EU_API_URL', 'https://api.eu.lever.co/v0/postings')
+ASHBY_API_URL = os.getenv('ASHBY_API_URL', 'https://api.ashbyhq.com/posting-api/job-board')
+SMARTRECRUITERS_API_URL = os.getenv('SMARTRECRUITERS_API_URL', 'https://api.smartrecruiters.com/v1/companies')
+FEED_TIMEOUT = 15  # Seconds per feed request
+SMARTRECRUITERS_PAGE_SIZE = 100  # Largest page the postings API serves
+SMARTRECRUITERS_MAX_PAGES = 10
+
+# Shared pooled session for feed requests, sized in configure_feed_session
+feed_session = requests.Session()
+
+
+def configure_feed_session(max_requests):
+    """Size the shared feed session's connection pool for `max_requests` concurrent fetches."""
+    global feed_session
+    max_requests = max(1, max_requests)
+    feed_session = requests.Session()
+    feed_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=max_requests))
+    feed_session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=max_requests))
+
+
+class JobFeed:
+    """Public JSON job feed of one applicant tracking system.
+
+    Matched by the host of a careers URL. `fetch(board, page_url)` takes the
+    board name from the URL and returns (title, location, link) tuples.
+    """
+
+    def __init__(self, name, hosts, fetch):
+        self.name = name
+        self.hosts = hosts
+        self.fetch = fetch
+
+    def matches_url(self, page_url):
+        host = urlparse(page_url).netloc.lower()
+        return any(host == known or host.endswith("." + known) for known in self.hosts)
+
+
+JOB_FEEDS = []
+
+
+def job_feed(name, hosts):
+    """Register a feed fetcher; see JobFeed."""
+    def register(fetch):
+        JOB_FEEDS.append(JobFeed(name, hosts, fetch))
+        return fetch
+    return register
+
+
+def find_feed(page_url):
+    """Return the feed for a careers URL, or None if its board has no known feed."""
+    for feed in JOB_FEEDS:
+        if feed.matches_url(page_url):
+            return feed
+    return None
+
+
+def board_name(page_url):
+    """Board name of an ATS URL: the first path segment, or the `for` parameter of embed URLs."""
+    parsed = urlparse(page_url)
+    embedded_for = parse_qs(parsed.query).get("for")
+    if embedded_for:
+        return embedded_for[0]
+    segments = [segment for segment in parsed.path.split("/") if segment]
+    if segments and segments[0] != "embed":
+        return segments[0]
+    return None
+
+
+def get_json(url, params=None):
+    response = feed_session.get(url, params=params, timeout=FEED_TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+
+@job_feed("greenhouse", hosts=("boards.greenhouse.io", "job-boards.greenhouse.io"))
+def fetch_greenhouse(board, page_url):
+    data = get_json(f"{GREENHOUSE_API_URL}/{board}/jobs")
+    return [(job.get("title"), (job.get("location") or {}).get("name"), job.get("absolute_url"))
+            for job in data.get("jobs", [])]
+
+
+@job_feed("lever", hosts=("jobs.lever.co", "jobs.eu.lever.co"))
+def fetch_lever(board, page_url):
+    api_url = LEVER_EU_API_URL if urlparse(page_url).netloc.lower().endswith("eu.lever.co") else LEVER_API_URL
+    data = get_json(f"{api_url}/{board}", params={"mode": "json"})
+    return [(posting.get("text"), (posting.get("categories") or {}).get("location"), posting.get("hostedUrl"))
+            for posting in data]
+
+
+@job_feed("ashby", hosts=("jobs.ashbyhq.com",))
+def fetch_ashby(board, page_url):
+    data = get_json(f"{ASHBY_API_URL}/{board}")
+    return [(job.get("title"), job.get("location"), job.get("jobUrl"))
+            for job in data.get("jobs", []) if job.get("isListed", True)]
+
+
+@job_feed("smartrecruiters", hosts=("careers.smartrecruiters.com", "jobs.smartrecruiters.com"))
+def fetch_smartrecruiters(board, page_url):
+    listings = []
+    for page in range(SMARTRECRUITERS_MAX_PAGES):
+        data = get_json(f"{SMARTRECRUITERS_API_URL}/{board}/postings",
+                        params={"limit": SMARTRECRUITERS_PAGE_SIZE, "offset": page * SMARTRECRUITERS_PAGE_SIZE})
+        postings = data.get("content", [])
+        for posting in postings:
+            location = posting.get("location") or {}
+            place = ", ".join(part for part in (location.get("city"), location.get("country")) if part)
+            listings.append((posting.get("name"), place,
+                             f"https://jobs.smartrecruiters.com/{board}/{posting.get('id')}"))
+        if len(postings) < SMARTRECRUITERS_PAGE_SIZE or len(listings) >= data.get("totalFound", 0):
+            break
+    return listings
+
+
+def fetch_feed_jobs(api, page_url, position, company_name=None):
+    """Fetch the jobs matching `position` from the public feed behind a careers URL.
+
+    Titles are matched as on a parsed board page: by words, or by one
+    small model request if no title matches that way. Returns None when the
+    URL is not a known board, or the feed or the model request fails, so the
+    caller can fall back to the browser; returns a possibly empty list
+    otherwise.
+    """
+    feed = find_feed(page_url) if page_url else None
+    if not feed:
+        return None
+    board = board_name(page_url)
+    if not board:
+        return None
+
+    try:
+        listings = [listing for listing in feed.fetch(board, page_url) if listing[0]]
+    except (requests.exceptions.RequestException, ValueError, AttributeError, TypeError) as e:
+        logging.warning(f"Could not read the {feed.name} feed for '{board}': {e}")
+        return None
+    logging.info(f"Fetched {len(listings)} jobs from the {feed.name} feed for '{board}'")
+    if not listings:
+        # An empty feed may be a stale board name; let the browser look
+        return None
+
+    try:
+        return listing_jobs(api, listings, position, company_name)
+    except Exception as e:
+        logging.warning(f"Could not match the {feed.name} feed titles for '{board}' to '{position}': {e}")
+        return None
@@ -0,0 +1,51 @@
+"""Time parse_board on the saved ATS boards and count the model calls and tokens it saves per company.
+
+For each board in tests/fixtures/boards, the board path is
+extract_board_jobs: parse the markup, then one small title-selection call
+only if no title contains the position's words. The model path is
+extract_jobs, the listing-block extraction these boards went through before.
+The models are stubs, so tokens are estimated at four characters per token
+and latency is the local parsing time only.
+
+    python benchmarks/bench_board_parsing.py --position "Software Engineer" "Backend Developer"
+"""
+import argparse
+
+import common
+from bench_job_extraction import BOARDS_DIR, ListingModel, saved_board
+from ats_extractors import parse_board
+from conversation import estimate_tokens
+from job_extraction import extract_board_jobs, extract_jobs
+from stub_api import StubAPI
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--position', type=str, nargs='+', default=["Software Engineer", "Backend Developer"],
+                        help='Positions to search for; one that matches no title by words costs a selection call')
+    parser.add_argument('--repeat', type=int, default=50, help='Runs per measurement; the best is reported')
+    args = parser.parse_args()
+
+    print(f"{'board':>20} {'position':>18} {'parse ms':>9} {'jobs':>5} | {'board: calls':>12} {'tokens':>7} "
+          f"| {'model: calls':>12} {'tokens':>7} {'ms':>6}")
+    for path in sorted(BOARDS_DIR.glob("*.html")):
+        html, page_url, listings = saved_board(path.stem)
+        if not listings:
+            continue
+        parse_ms = common.best_time(lambda: parse_board(html, page_url), args.repeat) * 1000
+        for position in args.position:
+            board_api = StubAPI("[0]")
+            jobs = extract_board_jobs(board_api, html, page_url, position, "Acme")
+            board_tokens = sum(estimate_tokens(prompt) + estimate_tokens(board_api.answer) for prompt in board_api.prompts)
+
+            model_api = ListingModel(listings)
+            model_ms = common.best_time(lambda: extract_jobs(ListingModel(listings), html, page_url, position),
+                                        args.repeat) * 1000
+            extract_jobs(model_api, html, page_url, position)
+            model_tokens = model_api.prompt_tokens + model_api.completion_tokens
+            print(f"{path.stem:>20} {position:>18} {parse_ms:>9.2f} {len(jobs):>5} | {len(board_api.prompts):>12} "
+                  f"{board_tokens:>7} | {model_api.calls:>12} {model_tokens:>7} {model_ms:>6.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Time compare_images on 1224x968 screenshots against the old whole-frame uint8 diff.
+
+The frames are a rendered careers page, the same page with one listing
+highlighted (a small change), and the page scrolled by a few rows (a large
+change). The old function read both PNGs from disk and subtracted uint8
+arrays, which wraps around; its total is printed next to the same RGB sum
+computed without wrapping.
+
+    python benchmarks/bench_compare_images.py
+"""
+import argparse
+import io
+import os
+import tempfile
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+import common
+from utils import compare_images
+
+
+WIDTH, HEIGHT = 1224, 968
+
+
+def old_compare_images(img1_path, img2_path):
+    return np.sum(np.abs(np.asarray(Image.open(img1_path)) - np.asarray(Image.open(img2_path))))
+
+
+def careers_page(scroll=0, highlight=None):
+    """A PNG screenshot of a job list; `highlight` shades one listing."""
+    image = Image.new("RGB", (WIDTH, HEIGHT), "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, WIDTH, 60), fill=(20, 40, 90))
+    draw.text((24, 22), "Acme Careers", fill="white")
+    for row in range(30):
+        top = 80 + row * 40 - scroll
+        if highlight == row:
+            draw.rectangle((16, top - 6, WIDTH - 16, top + 28), fill=(230, 236, 250))
+        draw.text((24, top), f"Software Engineer {row + 1} - Remote", fill=(30, 30, 30))
+        draw.text((WIDTH - 200, top), "Apply now", fill=(20, 90, 200))
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20, help='Runs per measurement; the best is reported')
+    args = parser.parse_args()
+
+    page = careers_page()
+    pairs = {
+        "identical": (page, careers_page()),
+        "highlight": (page, careers_page(highlight=4)),
+        "scrolled": (page, careers_page(scroll=120)),
+    }
+
+    print(f"{'pair':>10} {'old ms':>7} {'bytes ms':>9} {'256x256 ms':>11} {'arrays ms':>10} "
+          f"{'old total':>11} {'true total':>11} {'regions':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, (png1, png2) in pairs.items():
+            paths = [os.path.join(directory, f"{name}{index}.png") for index in (1, 2)]
+            for path, png in zip(paths, (png1, png2)):
+                with open(path, "wb") as f:
+                    f.write(png)
+            arrays = [np.asarray(Image.open(io.BytesIO(png))) for png in (png1, png2)]
+
+            timings = [
+                common.best_time(lambda: old_compare_images(*paths), args.repeat),
+                common.best_time(lambda: compare_images(png1, png2), args.repeat),
+                common.best_time(lambda: compare_images(png1, png2, size=(256, 256)), args.repeat),
+                common.best_time(lambda: compare_images(*arrays), args.repeat),
+            ]
+            true_total = int(np.abs(arrays[0].astype(np.int16) - arrays[1]).sum())
+            regions = compare_images(png1, png2)["changed_regions"]
+            print(f"{name:>10} " + " ".join(f"{seconds * 1000:>{width}.1f}"
+                                            for seconds, width in zip(timings, (7, 9, 11, 10)))
+                  + f" {int(old_compare_images(*paths)):>11} {true_total:>11} {len(regions):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Time one labeling pass of get_web_element_rect, per-element WebDriver calls vs in-page descriptors.
+
+Loads benchmarks/fixtures/careers_page.html in headless Chrome. The old pass
+is the labeling script followed by the per-element calls get_web_element_rect
+used to make (innerText, value, tag_name, type, aria-label); it includes the
+in-page descriptor work too, so it slightly overstates the old cost. Needs
+selenium, Chrome and the scraper's own dependencies.
+
+    python benchmarks/bench_element_rects.py --window_height 968 2000 4000
+"""
+import argparse
+import os
+import pathlib
+
+import common
+
+
+def legacy_describe_elements(elements):
+    """The per-element loop get_web_element_rect ran before the script described elements."""
+    web_elements_text = []
+    for idx, element in enumerate(elements):
+        try:
+            element_text = element.get_attribute('innerText') or element.get_attribute('value') or ''
+            element_tag = element.tag_name
+            element_type = element.get_attribute('type') or ''
+            element_aria = element.get_attribute('aria-label') or ''
+
+            desc_parts = []
+            if element_text.strip():
+                desc_parts.append(f"'{element_text.strip()}'")
+            if element_aria:
+                desc_parts.append(f"aria-label='{element_aria}'")
+            if element_type:
+                desc_parts.append(f"type='{element_type}'")
+
+            web_elements_text.append(f"[{idx}]: <{element_tag}> {' '.join(desc_parts)}")
+        except Exception:
+            continue
+    return "\n".join(web_elements_text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--window_height', type=int, nargs='+', default=[968, 4000],
+                        help='Window heights to time; taller windows label more elements')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement; the best is reported')
+    args = parser.parse_args()
+
+    try:
+        from selenium import webdriver
+        from job_scraper import get_web_element_rect
+    except ImportError as e:
+        raise SystemExit(f"This benchmark needs selenium and the scraper's dependencies: {e}")
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    try:
+        driver = webdriver.Chrome(options=options)
+    except Exception as e:
+        raise SystemExit(f"Chrome is not available: {e}")
+
+    page = pathlib.Path(os.path.dirname(os.path.abspath(__file__)), "fixtures", "careers_page.html").as_uri()
+    try:
+        print(f"{'height':>7} {'elements':>9} {'old ms':>8} {'new ms':>8} {'same text':>10}")
+        for height in args.window_height:
+            driver.set_window_size(1224, height)
+            driver.get(page)
+            _, elements, text = get_web_element_rect(driver)
+            same_text = legacy_describe_elements(elements) == text
+
+            new = common.best_time(lambda: get_web_element_rect(driver), args.repeat)
+            old = common.best_time(lambda: legacy_describe_elements(get_web_element_rect(driver)[1]), args.repeat)
+            print(f"{height:>7} {len(elements):>9} {old * 1000:>8.1f} {new * 1000:>8.1f} {same_text!s:>10}")
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Compare jobs found and tokens spent by chunked listing extraction and the old single-shot prompt.
+
+Runs over the saved boards in tests/fixtures/boards and generated non-ATS
+boards of --listings jobs (departments, a navigation bar, a hidden mobile
+menu, filters and a footer around the listings). The model is a stub that
+answers with every known listing whose title and link both appear in its
+prompt, so "found" is the most a real model could return from what it was
+shown. Tokens are estimated at four characters per token.
+
+    python benchmarks/bench_job_extraction.py --listings 40 150 400
+"""
+import argparse
+import json
+import pathlib
+import time
+import types
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+import common
+from conversation import estimate_tokens
+from job_extraction import extract_jobs
+from prompts import JOB_EXTRACTION_PROMPT
+
+
+BOARDS_DIR = pathlib.Path(common.SCRIPTS_DIR, "tests", "fixtures", "boards")
+PAGE_URL = "https://www.acme.com/careers"
+TITLES = ["Software Engineer", "Senior Software Engineer", "Data Scientist", "Product Designer",
+          "Account Executive", "Engineering Manager", "Site Reliability Engineer", "Recruiter"]
+LOCATIONS = ["Remote, US", "San Francisco, CA", "New York, NY", "London, UK", "Berlin, Germany"]
+
+
+class ListingModel:
+    """A chat client that finds every known listing shown to it, and counts calls and tokens."""
+
+    def __init__(self, listings):
+        self.listings = listings
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.chat = self.completions = self
+
+    def create(self, messages, **kwargs):
+        prompt = "\n".join(message["content"] for message in messages)
+        jobs = [{"Job Title": title, "Company Name": "Acme", "Location": location, "Application Link": link}
+                for title, location, link in self.listings if title in prompt and link in prompt]
+        answer = json.dumps(jobs)
+        self.calls += 1
+        self.prompt_tokens += estimate_tokens(prompt)
+        self.completion_tokens += estimate_tokens(answer)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=types.SimpleNamespace(content=answer))])
+
+
+def legacy_extract_jobs(api, html, page_url, position):
+    """The single-shot prompt extract_and_store_job_info sent before listing blocks."""
+    soup = BeautifulSoup(html, 'html.parser')
+    full_text = soup.get_text(separator='\n', strip=True)[:4000]
+    base_url = "{0.scheme}://{0.netloc}".format(urlparse(page_url))
+    links = [urljoin(base_url, a_tag['href']) for a_tag in soup.find_all('a', href=True)]
+    prompt = f"""
+                {JOB_EXTRACTION_PROMPT}
+
+                Position to extract: {position}
+
+                Text Content:
+                {full_text}
+
+                Available Links:
+                {links}
+
+                Please output only the JSON array of job postings. Do not include any explanations or additional text.
+            """
+    response = api.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": "You are an assistant that extracts job postings from text and returns them as a JSON array."},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.2,
+        max_tokens=2000
+    )
+    return json.loads(response.choices[0].message.content)
+
+
+def generated_board(count):
+    """A non-ATS careers page of `count` listings grouped by department, and its listings."""
+    listings = [(f"{TITLES[index % len(TITLES)]} {index + 1}", LOCATIONS[index % len(LOCATIONS)],
+                 f"https://www.acme.com/careers/jobs/{1000 + index}") for index in range(count)]
+    menu = "".join(f"<li class='menu-item'><a href='/{page}'>{page.title()}</a></li>"
+                   for page in ["products", "pricing", "customers", "partners", "blog", "about", "press", "contact"])
+    filters = "".join(f"<label class='filter'><input type='checkbox'> {location}</label>" for location in LOCATIONS)
+    departments = []
+    for start in range(0, count, 25):
+        jobs = "".join(
+            f"<div class='job-card'><h3><a href='{urlparse(link).path}'>{title}</a></h3>"
+            f"<span class='location'>{location}</span><span class='team'>Team {start // 25 + 1}</span>"
+            f"<p>Join a small team building the systems our customers rely on every day. Hybrid or remote, "
+            f"with a learning budget and equity.</p></div>"
+            for title, location, link in listings[start:start + 25])
+        departments.append(f"<section class='department'><h2>Department {start // 25 + 1}</h2>"
+                           f"<div class='jobs'>{jobs}</div></section>")
+    html = (f"<html><head><title>Careers | Acme</title><style>{'.c{color:red}' * 200}</style></head><body>"
+            f"<nav><ul>{menu}</ul></nav><div class='mobile-menu' hidden><ul>{menu}</ul></div>"
+            f"<header><h1>Join Acme</h1><p>{'We build tools for teams. ' * 20}</p></header>"
+            f"<aside>{filters}</aside><main>{''.join(departments)}</main>"
+            f"<footer><ul>{menu}</ul><p>&copy; Acme Inc.</p></footer></body></html>")
+    return html, PAGE_URL, listings
+
+
+def saved_board(name):
+    expected = json.loads((BOARDS_DIR / f"{name}.json").read_text())
+    listings = [tuple(listing) for listing in expected["listings"] or []]
+    return (BOARDS_DIR / f"{name}.html").read_text(), expected["page_url"], listings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--listings', type=int, nargs='+', default=[40, 150],
+                        help='Sizes of the generated non-ATS boards')
+    parser.add_argument('--position', type=str, default="Software Engineer", help='Position sent in the prompts')
+    args = parser.parse_args()
+
+    pages = {path.stem: saved_board(path.stem) for path in sorted(BOARDS_DIR.glob("*.html"))}
+    pages.update({f"generated_{count}": generated_board(count) for count in args.listings})
+
+    print(f"{'page':>20} {'jobs':>5} | {'single-shot: calls':>18} {'in':>6} {'out':>6} {'found':>6} "
+          f"| {'chunked: calls':>14} {'in':>6} {'out':>6} {'found':>6} {'ms':>6}")
+    for name, (html, page_url, listings) in pages.items():
+        old, new = ListingModel(listings), ListingModel(listings)
+        old_found = len(legacy_extract_jobs(old, html, page_url, args.position))
+        started = time.perf_counter()
+        new_found = len(extract_jobs(new, html, page_url, args.position))
+        elapsed = (time.perf_counter() - started) * 1000
+        # Unlabelled pages have no known listings; the stub finds nothing there
+        total = len(listings) if listings else "-"
+        print(f"{name:>20} {total:>5} | {old.calls:>18} {old.prompt_tokens:>6} {old.completion_tokens:>6} "
+              f"{old_found:>6} | {new.calls:>14} {new.prompt_tokens:>6} {new.completion_tokens:>6} "
+              f"{new_found:>6} {elapsed:>6.0f}")
+
+
+if __name__ == "__main__":
+    main()
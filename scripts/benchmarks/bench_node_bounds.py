@@ -0,0 +1,49 @@
+"""Time one accessibility tree observation with per-node client rects vs snapshot bounds.
+
+The old path made two CDP round trips per AX node (DOM.resolveNode, then
+Runtime.callFunctionOn). The stub browser serves recorded-shape responses
+and sleeps `--latency_ms` per round trip to stand in for the WebDriver hop.
+
+    python benchmarks/bench_node_bounds.py --nodes 3000 --latency_ms 0.5
+"""
+import argparse
+import time
+
+import common
+from accessibility_trees import StubCDPBrowser, random_tree, snapshot_info
+from legacy_webarena import legacy_fetch_page_accessibility_tree
+from utils_webarena import fetch_page_accessibility_tree
+
+
+class SlowCDPBrowser(StubCDPBrowser):
+    def __init__(self, nodes, rects, latency):
+        super().__init__(nodes, rects)
+        self.latency = latency
+
+    def execute_cdp_cmd(self, command, params):
+        time.sleep(self.latency)
+        return super().execute_cdp_cmd(command, params)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--nodes', type=int, nargs='+', default=[300, 3000], help='AX tree sizes to time')
+    parser.add_argument('--latency_ms', type=float, default=0.5, help='Simulated latency of one CDP round trip')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement; the best is reported')
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+    print(f"{'nodes':>7} {'old trips':>10} {'old s':>8} {'new trips':>10} {'new s':>8}")
+    for size in args.nodes:
+        nodes, rects = random_tree(size, seed=size)
+        info = snapshot_info(rects)
+        old_browser = SlowCDPBrowser(nodes, rects, latency)
+        new_browser = SlowCDPBrowser(nodes, {}, latency)
+        old = common.best_time(lambda: legacy_fetch_page_accessibility_tree(info, old_browser, True), args.repeat)
+        new = common.best_time(lambda: fetch_page_accessibility_tree(info, new_browser, True), args.repeat)
+        print(f"{size:>7} {old_browser.round_trips // args.repeat:>10} {old:>8.3f} "
+              f"{new_browser.round_trips // args.repeat:>10} {new:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
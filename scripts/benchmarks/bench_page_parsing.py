@@ -0,0 +1,135 @@
+"""Time and measure page parsing for job extraction and application details, html.parser vs the current path.
+
+The default pages are generated: a single-page-app board that is mostly
+inline JSON state and CSS with a hidden mobile menu, and a client-rendered
+board of deeply nested listings. Saved pages can be passed with --pages.
+Extraction is everything extract_jobs does before the model calls (parse,
+drop boilerplate, find and describe the listing blocks); details is the
+100-character page_details text, checked against get_text on the soup
+without hidden elements. Memory is the tracemalloc peak of a separate
+run; lxml's own C allocations are not traced.
+
+    python benchmarks/bench_page_parsing.py
+    PYTHONPATH=/path/to/lxml python benchmarks/bench_page_parsing.py --pages saved/*.html
+"""
+import argparse
+import json
+import pathlib
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+import common
+from html_parsing import HTML_PARSER, drop_hidden, make_soup
+from job_details import DETAILS_LENGTH, page_details
+from job_extraction import BOILERPLATE_TAGS, describe_block, find_listing_blocks
+
+
+PAGE_URL = "https://www.acme.com/careers"
+LEGACY_BOILERPLATE_TAGS = ["script", "style", "noscript", "template", "svg", "nav", "footer"]
+
+
+def state_heavy_page(listings=400):
+    """A board whose source is mostly inline state and styles, as single-page apps ship them."""
+    state = json.dumps({"jobs": [{"id": i, "title": "Engineer " * 5, "body": "lorem ipsum " * 80}
+                                 for i in range(1500)]})
+    return ("<!DOCTYPE html><html><head><title>Careers | Acme</title>"
+            + "<style>" + ".c{color:red}" * 20000 + "</style>"
+            + "<script>window.__STATE__=" + state + "</script><script src='/app.js'></script></head><body>"
+            + "<div id='cookie' style='display: none'><p>We use cookies</p><a href='/privacy'>Privacy</a></div>"
+            + "<nav>" + "".join(f"<a href='/n{i}'>Nav {i}</a>" for i in range(200)) + "</nav>"
+            + "<div class='mobile-menu' hidden>"
+            + "".join(f"<a href='/m{i}'>Menu {i}</a>" for i in range(200)) + "</div>"
+            + "<main><h1>Open roles</h1><ul class='jobs'>"
+            + "".join(f"<li class='job'><svg><path d='M0 0L10 10'/></svg><a href='/jobs/{i}'>Software Engineer {i}</a>"
+                      f"<span class='loc'>Remote</span><span aria-hidden='true'>&rarr;</span></li>"
+                      for i in range(listings))
+            + "</ul></main><footer>" + "".join(f"<a href='/f{i}'>Footer {i}</a>" for i in range(100))
+            + "</footer></body></html>")
+
+
+def tag_heavy_page(listings=6000):
+    """A client-rendered board with several wrapper elements around every listing."""
+    return ("<html><head><title>Careers</title></head><body><div id='root'>"
+            + "".join(f"<div class='row r{i % 7}'><div class='cell'><div class='inner'>"
+                      f"<a class='job-link' href='/jobs/{i}'><div class='t'><span>Software Engineer</span> "
+                      f"<span>{i}</span></div></a></div><div class='cell'><span class='loc'>Remote</span>"
+                      f"<span class='sr-only' style='display:none'>Opens in new tab</span></div></div></div>"
+                      for i in range(listings))
+            + "</div></body></html>")
+
+
+def legacy_listing_texts(html):
+    """extract_jobs' preparation before lxml and hidden-element removal."""
+    soup = BeautifulSoup(html, "html.parser")
+    for element in soup(LEGACY_BOILERPLATE_TAGS):
+        element.decompose()
+    return [describe_block(block, PAGE_URL) for block in find_listing_blocks(soup)]
+
+
+def listing_texts(html):
+    soup = make_soup(html)
+    drop_hidden(soup)
+    for element in soup(BOILERPLATE_TAGS):
+        element.decompose()
+    return [describe_block(block, PAGE_URL) for block in find_listing_blocks(soup)]
+
+
+def legacy_page_details(html):
+    return BeautifulSoup(html, "html.parser").get_text(separator="\n", strip=True)[:DETAILS_LENGTH]
+
+
+def trimmed_body(html):
+    """Roughly what the in-browser script returns: the body without scripts, styles or unrendered elements."""
+    soup = make_soup(html)
+    drop_hidden(soup)
+    return str(soup.body)
+
+
+def peak_megabytes(function):
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', nargs='+', type=pathlib.Path,
+                        help='Saved page sources to measure instead of the generated pages')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement; the best is reported')
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = {path.name: path.read_text(errors="replace") for path in args.pages}
+    else:
+        pages = {"state-heavy": state_heavy_page(), "tag-heavy": tag_heavy_page()}
+
+    print(f"BeautifulSoup backend: {HTML_PARSER}")
+    print(f"{'page':>14} {'MB':>5} {'step':>11} {'old ms':>8} {'new ms':>8} {'old MB':>7} {'new MB':>7} {'result':>12}")
+    for name, html in pages.items():
+        trimmed = trimmed_body(html)
+        steps = [
+            ("extraction", lambda: legacy_listing_texts(html), lambda: listing_texts(html)),
+            ("trimmed", lambda: legacy_listing_texts(html), lambda: listing_texts(trimmed)),
+            ("details", lambda: legacy_page_details(html), lambda: page_details(html)),
+        ]
+        for step, old, new in steps:
+            if step == "details":
+                # The old text also held the title and hidden elements; compare with the visible soup's text
+                soup = make_soup(html)
+                drop_hidden(soup)
+                expected = soup.get_text(separator="\n", strip=True)[:DETAILS_LENGTH]
+                result = "same text" if new() == expected else "differs"
+            else:
+                result = f"{len(old())} -> {len(new())}"
+            timings = [common.best_time(function, args.repeat) * 1000 for function in (old, new)]
+            peaks = [peak_megabytes(function) for function in (old, new)]
+            print(f"{name:>14} {len(html) / 1e6:>5.1f} {step:>11} {timings[0]:>8.1f} {timings[1]:>8.1f} "
+                  f"{peaks[0]:>7.1f} {peaks[1]:>7.1f} {result:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Time cleaning the parsed accessibility tree, old vs streaming, alone and fused with parsing.
+
+"clean" times the cleaner on an already parsed tree string. "parse+clean"
+times the whole step from AX nodes to cleaned text: the old recursive
+parser and cleaner one after the other, vs the current line iterators
+chained in one pass.
+
+    python benchmarks/bench_tree_cleaning.py --nodes 10000 100000 300000
+"""
+import argparse
+import sys
+
+import common
+from accessibility_trees import random_tree, with_bounds
+from legacy_webarena import legacy_clean_accesibility_tree, legacy_parse_accessibility_tree
+from utils_webarena import clean_accesibility_tree, iter_accessibility_tree_lines, iter_clean_accessibility_tree_lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--nodes', type=int, nargs='+', default=[10000, 100000, 300000],
+                        help='AX tree sizes to time')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement; the best is reported')
+    args = parser.parse_args()
+    # The old parser recurses once per level of the tree
+    sys.setrecursionlimit(100000)
+
+    print(f"{'nodes':>7} {'lines':>7} {'clean old s':>12} {'new s':>7} {'parse+clean old s':>18} {'new s':>7}")
+    for size in args.nodes:
+        nodes, rects = random_tree(size, seed=size)
+        tree = with_bounds(nodes, rects)
+        text, _ = legacy_parse_accessibility_tree(tree)
+        assert clean_accesibility_tree(text) == legacy_clean_accesibility_tree(text)
+
+        clean_old = common.best_time(lambda: legacy_clean_accesibility_tree(text), args.repeat)
+        clean_new = common.best_time(lambda: clean_accesibility_tree(text), args.repeat)
+        both_old = common.best_time(
+            lambda: legacy_clean_accesibility_tree(legacy_parse_accessibility_tree(tree)[0]), args.repeat)
+        both_new = common.best_time(
+            lambda: "\n".join(iter_clean_accessibility_tree_lines(iter_accessibility_tree_lines(tree, {}))),
+            args.repeat)
+        print(f"{size:>7} {text.count(chr(10)) + 1:>7} {clean_old:>12.3f} {clean_new:>7.3f} "
+              f"{both_old:>18.3f} {both_new:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Time viewport pruning of a long job list, old splicing vs the linear pass.
+
+The page is one list of listings with only the first screenful visible.
+The old splicing searched the parent's childIds for every removed node:
+cheap when nodes arrive in document order, quadratic when they arrive
+level by level, as the spliced-in children pile up ahead of the siblings
+still to be removed. Both orders are timed; the old code only up to
+`--old_max` nodes.
+
+    python benchmarks/bench_viewport_pruning.py --nodes 1000 10000 30000 100000
+"""
+import argparse
+
+import common
+from accessibility_trees import VIEWPORT, job_list_tree, with_bounds
+from legacy_webarena import legacy_prune_nodes_outside_viewport
+from utils_webarena import prune_nodes_outside_viewport
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--nodes', type=int, nargs='+', default=[1000, 10000, 30000, 100000],
+                        help='AX tree sizes to time')
+    parser.add_argument('--old_max', type=int, default=30000, help='Largest tree the old code is timed on')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement; the best is reported')
+    args = parser.parse_args()
+
+    print(f"{'order':>9} {'nodes':>7} {'old s':>8} {'new s':>8}")
+    for order, size in [(order, size) for order in ("document", "breadth") for size in args.nodes]:
+        nodes, rects = job_list_tree(size // 3, breadth_first=order == "breadth")
+
+        def setup():
+            tree = with_bounds(nodes, rects)
+            return tree, {node["nodeId"]: cursor for cursor, node in enumerate(tree)}
+
+        def timed(prune):
+            return common.best_time(lambda prepared: prune(*prepared, VIEWPORT), args.repeat, setup)
+
+        new = timed(prune_nodes_outside_viewport)
+        old = f"{timed(legacy_prune_nodes_outside_viewport):.3f}" if size <= args.old_max else "-"
+        print(f"{order:>9} {size:>7} {old:>8} {new:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""Shared setup for the benchmarks: run them from anywhere as `python benchmarks/bench_<name>.py`."""
+import os
+import sys
+import time
+
+# The scripts run as flat modules from scripts/ and scripts/utils/; the
+# benchmarks also reuse the synthetic inputs and frozen old code of the tests
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(SCRIPTS_DIR, "tests"))
+sys.path.insert(0, os.path.join(SCRIPTS_DIR, "utils"))
+sys.path.insert(0, SCRIPTS_DIR)
+
+
+def best_time(function, repeat=5, setup=None):
+    """Best wall time of `repeat` calls, in seconds.
+
+    With `setup`, each call gets a fresh `setup()` result as its argument,
+    made outside the timed region.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        args = (setup(),) if setup else ()
+        started = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
@@ -0,0 +1,193 @@
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+
+# Storage types cleared for every origin a driver visited during a task
+STORAGE_TYPES = "local_storage,session_storage,indexeddb,websql,service_workers,cache_storage"
+MAX_HISTORY_ENTRIES = 50  # Chrome's session history limit per tab; older entries drop out beyond it
+
+
+class BrowserPool:
+    """Keep a fixed number of warm Chrome drivers alive across companies.
+
+    Workers lease a driver with `pool.lease()`. On release the driver is reset
+    (extra windows closed, cookies, storage and history cleared, about:blank
+    loaded) and handed back to the pool, or quit and replaced lazily if it
+    crashed or has served `max_tasks` companies.
+    """
+
+    def __init__(self, create_driver, size, max_tasks=10):
+        self.create_driver = create_driver
+        self.size = max(1, size)
+        self.max_tasks = max_tasks
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._task_counts = {}
+        self._created = 0
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @contextmanager
+    def lease(self):
+        """Lease a healthy driver for the duration of one task."""
+        driver = self._acquire()
+        try:
+            yield driver
+        finally:
+            self._release(driver)
+
+    def _acquire(self):
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                driver = self._create_or_wait()
+                if driver is None:
+                    continue
+
+            if self.is_healthy(driver):
+                return driver
+            logging.warning("Browser pool: leased driver failed health check, recycling")
+            self._discard(driver)
+
+    def _create_or_wait(self):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Browser pool is closed")
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+
+        if not can_create:
+            # Poll so a slot freed by a recycled driver is noticed
+            try:
+                return self._idle.get(timeout=1)
+            except queue.Empty:
+                return None
+
+        try:
+            driver = self.create_driver()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+        with self._lock:
+            self._task_counts[driver] = 0
+        logging.info(f"Browser pool: started driver {self._created}/{self.size}")
+        return driver
+
+    def _release(self, driver):
+        with self._lock:
+            self._task_counts[driver] = self._task_counts.get(driver, 0) + 1
+            task_count = self._task_counts[driver]
+            closed = self._closed
+
+        if closed:
+            self._discard(driver)
+            return
+
+        if task_count >= self.max_tasks:
+            logging.info(f"Browser pool: recycling driver after {task_count} tasks")
+            self._discard(driver)
+            return
+
+        try:
+            self.reset(driver)
+        except Exception as e:
+            logging.warning(f"Browser pool: failed to reset driver, recycling: {e}")
+            self._discard(driver)
+            return
+
+        self._idle.put(driver)
+
+    def _discard(self, driver):
+        with self._lock:
+            self._task_counts.pop(driver, None)
+            self._created -= 1
+        try:
+            driver.quit()
+        except Exception as e:
+            logging.warning(f"Browser pool: error quitting driver: {e}")
+
+    @staticmethod
+    def is_healthy(driver):
+        """Return True if the driver still responds to commands."""
+        try:
+            driver.execute_script("return 1;")
+            return bool(driver.window_handles)
+        except Exception:
+            return False
+
+    @staticmethod
+    def reset(driver):
+        """Return a driver to a clean state between companies.
+
+        Storage is cleared for every origin the task loaded, taken from each
+        window's session history and frames. If a history is full, older
+        origins may be missing from it, so the reset fails and the driver is
+        recycled instead.
+        """
+        handles = driver.window_handles
+        origins = set()
+
+        # Close the extra windows opened by clicks, remembering their origins
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            origins |= _window_origins(driver)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        origins |= _window_origins(driver)
+
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        for origin in origins:
+            if origin:
+                driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                    "origin": origin,
+                    "storageTypes": STORAGE_TYPES
+                })
+
+        driver.implicitly_wait(0)
+        driver.get("about:blank")
+        # Start the next task with an empty history, so it never fills up across tasks
+        driver.execute_cdp_cmd("Page.resetNavigationHistory", {})
+
+    def close(self):
+        """Quit every idle driver; leased drivers are quit on release."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+
+def _origin(url):
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https"):
+        return None
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+def _window_origins(driver):
+    """Origins of every page the current window loaded: its session history and current frames."""
+    entries = driver.execute_cdp_cmd("Page.getNavigationHistory", {})["entries"]
+    if len(entries) >= MAX_HISTORY_ENTRIES:
+        raise RuntimeError(f"session history holds {len(entries)} entries, visited origins may be missing")
+    urls = [driver.current_url, *(entry["url"] for entry in entries)]
+
+    frames = [driver.execute_cdp_cmd("Page.getFrameTree", {})["frameTree"]]
+    while frames:
+        frame = frames.pop()
+        urls.append(frame["frame"]["url"])
+        frames.extend(frame.get("childFrames", []))
+    return {_origin(url) for url in urls}
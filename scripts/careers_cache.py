@@ -0,0 +1,108 @@
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+
+# Legal-form suffixes dropped when normalizing company names
+COMPANY_SUFFIXES = {
+    "inc", "incorporated", "llc", "llp", "ltd", "limited", "corp", "corporation",
+    "co", "company", "plc", "gmbh", "ag", "sa", "bv", "holdings", "group",
+}
+
+DAY = 24 * 60 * 60
+
+
+def normalize_company_name(name):
+    """Reduce a company name to a cache key, e.g. 'The Acme Corp.' -> 'acme'."""
+    words = re.sub(r"[^a-z0-9&]+", " ", (name or "").lower()).split()
+    if words and words[0] == "the":
+        words = words[1:]
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+class CareersUrlCache:
+    """On-disk cache of careers URLs keyed by normalized company name.
+
+    Companies with no careers hit are cached too (as NULL) with a shorter
+    TTL, so they are not searched again on every run. Safe to share between
+    threads, and between the processes of concurrent runs: a lookup or store
+    that fails (e.g. the file stays locked past `timeout` seconds) is logged
+    and treated as a miss, never raised.
+    """
+
+    def __init__(self, path, ttl_days=30, negative_ttl_days=3, timeout=5):
+        self.path = path
+        self.ttl = ttl_days * DAY
+        self.negative_ttl = negative_ttl_days * DAY
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        # Readers in other processes do not block a writer, and vice versa
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS careers_urls (
+                company_key TEXT PRIMARY KEY,
+                company_name TEXT NOT NULL,
+                careers_url TEXT,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, company_name):
+        """Return (found, careers_url); careers_url is None for a cached miss."""
+        key = normalize_company_name(company_name)
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT careers_url, fetched_at FROM careers_urls WHERE company_key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logging.warning(f"Careers URL cache lookup failed for {company_name}: {e}")
+                self.errors += 1
+                row = None
+            if row:
+                careers_url, fetched_at = row
+                ttl = self.ttl if careers_url else self.negative_ttl
+                if time.time() - fetched_at < ttl:
+                    self.hits += 1
+                    return True, careers_url
+            self.misses += 1
+            return False, None
+
+    def put(self, company_name, careers_url):
+        """Store a lookup result; pass None to record that nothing was found."""
+        key = normalize_company_name(company_name)
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO careers_urls (company_key, company_name, careers_url, fetched_at)"
+                    " VALUES (?, ?, ?, ?)",
+                    (key, company_name, careers_url, time.time())
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logging.warning(f"Careers URL cache store failed for {company_name}: {e}")
+                self.errors += 1
+                self._conn.rollback()
+
+    def log_stats(self):
+        total = self.hits + self.misses
+        hit_rate = self.hits / total * 100 if total else 0
+        logging.info(f"Careers URL cache: {self.hits} hits, {self.misses} misses ({hit_rate:.0f}% hit rate), "
+                     f"{self.errors} errors")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
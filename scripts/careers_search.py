@@ -0,0 +1,69 @@
+import logging
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from orchestrator import RateLimiter
+
+
+GOOGLE_CSE_URL = os.getenv('GOOGLE_CSE_URL', 'https://www.googleapis.com/customsearch/v1')  # Override to point at a local stub
+GOOGLE_CSE_TIMEOUT = 15  # Seconds per search request
+
+# Shared Google Custom Search client state: a pooled session, a cap on
+# concurrent requests and a per-minute rate limit (see configure_google_search)
+search_session = requests.Session()
+google_search_slots = threading.BoundedSemaphore(2)
+google_rate_limiter = RateLimiter(90)
+
+
+def configure_google_search(max_requests, requests_per_minute):
+    """Size the shared Custom Search session and set its concurrency and rate limits."""
+    global search_session, google_search_slots, google_rate_limiter
+    max_requests = max(1, max_requests)
+    search_session = requests.Session()
+    search_session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=max_requests))
+    search_session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=max_requests))
+    google_search_slots = threading.BoundedSemaphore(max_requests)
+    google_rate_limiter = RateLimiter(requests_per_minute)
+
+
+def get_job_board_link(company_name, api_key, cse_id, careers_cache=None):
+    """Use Google's Custom Search API to search for a company's job board.
+
+    Returns the first result whose title mentions careers or jobs, or None.
+    Successful searches are stored in `careers_cache` (a CareersUrlCache),
+    including ones with no hit; failed ones are not.
+    """
+    if careers_cache:
+        found, careers_url = careers_cache.get(company_name)
+        if found:
+            return careers_url
+
+    params = {
+        'key': api_key,
+        'cx': cse_id,
+        'q': f"{company_name} careers site"
+    }
+
+    try:
+        with google_search_slots:
+            google_rate_limiter.wait()
+            response = search_session.get(GOOGLE_CSE_URL, params=params, timeout=GOOGLE_CSE_TIMEOUT)
+        response.raise_for_status()
+        search_results = response.json()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        # ValueError: the body was not JSON (e.g. an HTML error page from a proxy)
+        logging.error(f"Error fetching job board link for {company_name}: {e}")
+        return None
+
+    careers_url = None
+    for item in search_results.get('items', []):
+        title = (item.get('title') or '').lower()
+        if ("career" in title or "job" in title) and item.get('link'):
+            careers_url = item['link']
+            break
+    if careers_cache:
+        careers_cache.put(company_name, careers_url)
+    return careers_url
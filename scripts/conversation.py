@@ -0,0 +1,63 @@
+from collections import deque
+
+
+IMAGE_TOKENS = 765  # Vision cost of one screenshot (a 1224x968 frame is billed as 2x2 high-detail tiles)
+
+
+def estimate_tokens(text):
+    """Rough token count (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+def message_tokens(message):
+    """Estimate the prompt tokens one chat message costs."""
+    content = message['content']
+    if isinstance(content, str):
+        return estimate_tokens(content)
+    tokens = 0
+    for part in content:
+        if part['type'] == 'text':
+            tokens += estimate_tokens(part['text'])
+        else:
+            tokens += IMAGE_TOKENS
+    return tokens
+
+
+class Conversation:
+    """Message history of one navigation loop with a bounded prompt.
+
+    Only the last `max_observations` observations (screenshot or accessibility
+    tree messages) are kept in full. When one falls out of the window it is
+    replaced in place by its short summary, so the prompt sent on each call
+    stays about the same size however many iterations run. The running
+    estimate of the prompt is kept in `prompt_tokens`.
+    """
+
+    def __init__(self, system_prompt, max_observations):
+        self.max_observations = max(1, max_observations)
+        self.messages = []
+        self.prompt_tokens = 0
+        self._sizes = []
+        self._observations = deque()  # (message index, summary) of observations kept in full
+        self.add({'role': 'system', 'content': system_prompt})
+
+    def add(self, message):
+        """Append a message that is kept as is (model replies, feedback)."""
+        size = message_tokens(message)
+        self.messages.append(message)
+        self._sizes.append(size)
+        self.prompt_tokens += size
+
+    def add_observation(self, message, summary):
+        """Append an observation, summarizing the oldest one if the window is full."""
+        self.add(message)
+        self._observations.append((len(self.messages) - 1, summary))
+        if len(self._observations) > self.max_observations:
+            index, old_summary = self._observations.popleft()
+            self._replace(index, {'role': 'user', 'content': old_summary})
+
+    def _replace(self, index, message):
+        size = message_tokens(message)
+        self.prompt_tokens += size - self._sizes[index]
+        self._sizes[index] = size
+        self.messages[index] = message
@@ -0,0 +1,94 @@
+import re
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"  # C parser, several times faster on large pages
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+
+# Elements whose content is never visible text
+NON_TEXT_TAGS = {"head", "script", "style", "noscript", "template", "svg", "iframe", "object"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param",
+             "source", "track", "wbr"}
+HIDDEN_STYLE = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden", re.IGNORECASE)
+
+
+def make_soup(html):
+    """Parse a page with the fastest available BeautifulSoup backend."""
+    return BeautifulSoup(html, HTML_PARSER)
+
+
+def is_hidden(attrs):
+    """True if an element's attributes (a dict) hide it from view."""
+    return ("hidden" in attrs or attrs.get("aria-hidden") == "true"
+            or bool(HIDDEN_STYLE.search(attrs.get("style") or "")))
+
+
+def drop_hidden(soup):
+    """Remove non-text and hidden elements from a soup, in place."""
+    for element in soup.find_all(lambda tag: tag.name in NON_TEXT_TAGS or is_hidden(tag.attrs)):
+        element.decompose()
+
+
+class _EnoughText(Exception):
+    pass
+
+
+class VisibleTextParser(HTMLParser):
+    """Collect visible text while streaming through HTML, without building a tree.
+
+    Skips non-text and hidden elements, and stops as soon as `limit`
+    characters have been collected.
+    """
+
+    def __init__(self, limit=None):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.pieces = []
+        self.length = 0
+        self._skipping = []  # Open tags of the skipped subtree, innermost last
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            return
+        if tag == "body":
+            # Raw HTML may leave <head> unclosed
+            self._skipping.clear()
+        if self._skipping or tag in NON_TEXT_TAGS or is_hidden(dict(attrs)):
+            self._skipping.append(tag)
+
+    def handle_endtag(self, tag):
+        if tag in self._skipping:
+            # Also closes any unclosed tags opened inside it
+            while self._skipping.pop() != tag:
+                pass
+
+    def handle_data(self, data):
+        if self._skipping:
+            return
+        text = data.strip()
+        if text:
+            self.pieces.append(text)
+            self.length += len(text) + 1
+            if self.limit is not None and self.length > self.limit:
+                raise _EnoughText()
+
+
+def visible_text(html, limit=None):
+    """Visible text of a page, one string per line (like get_text("\\n", strip=True)).
+
+    With `limit`, only the first `limit` characters are returned and parsing
+    stops once they are found.
+    """
+    parser = VisibleTextParser(limit)
+    try:
+        parser.feed(html)
+        parser.close()
+    except _EnoughText:
+        pass
+    text = "\n".join(parser.pieces)
+    return text[:limit] if limit is not None else text
@@ -0,0 +1,142 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from html_parsing import visible_text
+from orchestrator import RateLimiter
+from page_settle import DEFAULT_SETTLE_TIMEOUT, wait_for_page_settle
+
+
+DETAILS_LENGTH = 100  # Characters of an application page kept as "Additional Details"
+MIN_PAGE_TEXT = 40  # Less text than this over HTTP means the page is rendered by script
+DETAIL_TIMEOUT = 10  # Seconds per HTTP request
+MAX_REQUESTS_PER_HOST = 2  # Concurrent requests to one domain
+HOST_REQUESTS_PER_MINUTE = 240  # Request starts per domain per minute
+MAX_BROWSER_FALLBACKS = 5  # Application pages per company loaded in a browser when HTTP is not enough
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/119.0 Safari/537.36")
+
+
+def interleave_by_host(links):
+    """Order links round-robin across domains so one busy domain does not hold every worker."""
+    by_host = {}
+    for link in links:
+        by_host.setdefault(urlparse(link).netloc.lower(), []).append(link)
+    queues = list(by_host.values())
+    return [queue[index] for index in range(max(map(len, queues), default=0))
+            for queue in queues if index < len(queue)]
+
+
+# The rendered text of the page; innerText already leaves out scripts, styles and hidden nodes
+VISIBLE_TEXT_JS = "return document.body ? document.body.innerText : '';"
+
+
+def page_details(html):
+    """The first DETAILS_LENGTH characters of a page's visible text."""
+    return visible_text(html, DETAILS_LENGTH)
+
+
+def browser_page_details(driver):
+    """The first DETAILS_LENGTH characters of the text rendered in a driver."""
+    lines = (line.strip() for line in (driver.execute_script(VISIBLE_TEXT_JS) or "").splitlines())
+    return "\n".join(line for line in lines if line)[:DETAILS_LENGTH]
+
+
+class JobDetailFetcher:
+    """Fetch the application page of every extracted job over plain HTTP.
+
+    One pooled session and thread pool serve every company, so at most
+    `max_workers` pages load at once, and no more than `per_host` at a time
+    (and `per_host_per_minute` a minute) from any one domain. Pages that
+    refuse plain HTTP clients or render their text by script are loaded in a
+    leased browser instead, a few per company.
+    """
+
+    def __init__(self, max_workers=8, per_host=MAX_REQUESTS_PER_HOST,
+                 per_host_per_minute=HOST_REQUESTS_PER_MINUTE, session=None):
+        self.per_host = per_host
+        self.per_host_per_minute = per_host_per_minute
+        if session is None:
+            session = requests.Session()
+            session.headers['User-Agent'] = USER_AGENT
+            session.mount('https://', HTTPAdapter(pool_connections=max_workers, pool_maxsize=per_host))
+            session.mount('http://', HTTPAdapter(pool_connections=max_workers, pool_maxsize=per_host))
+        self.session = session
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="job-details")
+        self._hosts = {}
+        self._hosts_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _host_limits(self, url):
+        host = urlparse(url).netloc.lower()
+        with self._hosts_lock:
+            if host not in self._hosts:
+                self._hosts[host] = (threading.BoundedSemaphore(self.per_host),
+                                     RateLimiter(self.per_host_per_minute))
+            return self._hosts[host]
+
+    def fetch(self, url):
+        """Return the details of one application page, or None if it needs a browser."""
+        slots, rate_limiter = self._host_limits(url)
+        try:
+            with slots:
+                rate_limiter.wait()
+                response = self.session.get(url, timeout=DETAIL_TIMEOUT)
+            if response.status_code in (401, 403, 429):
+                return None
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            return f"Error fetching additional details: {str(e)}"
+
+        if 'html' not in response.headers.get('Content-Type', 'text/html'):
+            return "N/A"
+        details = page_details(response.text)
+        return details if len(details) >= MIN_PAGE_TEXT else None
+
+    def enrich(self, jobs, pool=None, settle_timeout=DEFAULT_SETTLE_TIMEOUT):
+        """Set 'Additional Details' on every job with an application link, in place.
+
+        Each distinct link is fetched once, concurrently across domains. If `pool`
+        (a BrowserPool) is given, pages that need a browser are loaded in one
+        leased driver.
+        """
+        started = time.monotonic()
+        links = list(dict.fromkeys(
+            job.get('Application Link') for job in jobs
+            if isinstance(job.get('Application Link'), str) and urlparse(job['Application Link']).netloc
+        ))
+        futures = {link: self._executor.submit(self.fetch, link) for link in interleave_by_host(links)}
+        details = {link: future.result() for link, future in futures.items()}
+
+        needs_browser = [link for link, detail in details.items() if detail is None]
+        if needs_browser and pool is not None:
+            with pool.lease() as driver:
+                for link in needs_browser[:MAX_BROWSER_FALLBACKS]:
+                    try:
+                        driver.get(link)
+                        wait_for_page_settle(driver, "details", timeout=settle_timeout)
+                        details[link] = browser_page_details(driver)
+                    except Exception as e:
+                        details[link] = f"Error fetching additional details: {str(e)}"
+
+        for job in jobs:
+            link = job.get('Application Link')
+            if link in details:
+                job['Additional Details'] = details[link] or "N/A"
+        logging.info(f"Fetched details for {len(links)} application links in {time.monotonic() - started:.2f}s "
+                     f"({len(needs_browser)} needed a browser)")
+        return jobs
+
+    def close(self):
+        """Wait for queued fetches to finish and stop the fetch threads."""
+        self._executor.shutdown(wait=True)
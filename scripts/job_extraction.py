@@ -0,0 +1,286 @@
+import contextvars
+import json
+import logging
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+from ats_extractors import board_job, parse_board, title_matches_position
+from html_parsing import drop_hidden, make_soup
+from prompts import JOB_EXTRACTION_PROMPT, LISTING_SELECTION_PROMPT
+from usage_tracker import usage_scope
+
+
+MIN_LISTING_REPEATS = 3  # Same-shape siblings with links needed before a group counts as a listing
+MAX_BLOCK_CHARS = 500  # Text kept per listing block
+CHUNK_MAX_CHARS = 6000
+CHUNK_MAX_BLOCKS = 15  # Keeps each chunk's JSON answer well inside max_tokens
+MAX_CHUNKS = 8
+MAX_PARALLEL_CHUNKS = 4  # Also bounded globally by LimitedOpenAI
+FALLBACK_MAX_CHARS = 4000  # Single-shot budget when the page has no recognisable listing
+MAX_SELECTION_TITLES = 400  # Board titles sent to the model when none match the position by words
+BOILERPLATE_TAGS = ["nav", "footer"]  # Dropped with scripts, styles and hidden elements
+
+EXTRACTION_SYSTEM_PROMPT = "You are an assistant that extracts job postings from text and returns them as a JSON array."
+
+
+def element_shape(element):
+    """Signature used to spot repeated siblings: tag name and classes."""
+    return element.name, tuple(sorted(element.get("class", [])))
+
+
+def find_listing_blocks(soup, min_repeats=MIN_LISTING_REPEATS):
+    """Find the repeated same-shape sibling elements with links that make up job listings.
+
+    Groups with the most blocks are taken first; a group nested inside or
+    around blocks already taken is skipped. Around taken blocks, though, the
+    group's other members (e.g. departments with only one or two openings)
+    contribute their elements shaped like the taken ones. Blocks come back in
+    document order.
+    """
+    elements = soup.find_all(True)
+    order = {id(element): index for index, element in enumerate(elements)}
+
+    # Mark every element with a link inside it, walking up from each link
+    has_link = set()
+    for anchor in soup.find_all("a", href=True):
+        for element in [anchor, *anchor.parents]:
+            if id(element) in has_link:
+                break
+            has_link.add(id(element))
+
+    groups = []
+    for parent in elements:
+        by_shape = defaultdict(list)
+        for child in parent.find_all(True, recursive=False):
+            if id(child) in has_link:
+                by_shape[element_shape(child)].append(child)
+        groups.extend(blocks for blocks in by_shape.values() if len(blocks) >= min_repeats)
+
+    taken = set()
+    around_taken = set()
+    chosen = []
+
+    def take(block):
+        chosen.append(block)
+        taken.add(id(block))
+        around_taken.update(id(parent) for parent in block.parents)
+
+    def overlaps(block):
+        return id(block) in around_taken or any(id(element) in taken for element in [block, *block.parents])
+
+    for blocks in sorted(groups, key=len, reverse=True):
+        if not any(overlaps(block) for block in blocks):
+            for block in blocks:
+                take(block)
+            continue
+
+        taken_shapes = {element_shape(element) for block in blocks if id(block) in around_taken
+                        for element in block.find_all(True) if id(element) in taken}
+        for block in blocks:
+            if overlaps(block):
+                continue
+            for element in block.find_all(True):
+                if element_shape(element) in taken_shapes and id(element) in has_link and not overlaps(element):
+                    take(element)
+
+    return sorted(chosen, key=lambda block: order[id(block)])
+
+
+def describe_block(block, page_url):
+    """Text of one listing block followed by its absolute links."""
+    text = block.get_text(" ", strip=True)[:MAX_BLOCK_CHARS]
+    anchors = [block] if block.name == "a" else block.find_all("a", href=True)
+    links = []
+    for anchor in anchors:
+        link = urljoin(page_url, anchor["href"])
+        if link not in links:
+            links.append(link)
+    return f"{text}\nLinks: {' '.join(links)}"
+
+
+def chunk_blocks(block_texts, max_chars=CHUNK_MAX_CHARS, max_blocks=CHUNK_MAX_BLOCKS):
+    """Pack consecutive listing blocks into chunks for separate model calls."""
+    chunks = []
+    current = []
+    size = 0
+    for text in block_texts:
+        if current and (size + len(text) > max_chars or len(current) >= max_blocks):
+            chunks.append("\n\n".join(current))
+            current = []
+            size = 0
+        current.append(text)
+        size += len(text) + 2
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def parse_job_array(response_text):
+    """Parse the JSON array of jobs from a model response; an empty array is allowed."""
+    if re.fullmatch(r'\s*\[\s*\]\s*', response_text):
+        return []
+    json_match = re.search(r'\[\s*\{[\s\S]*?\}\s*\]', response_text)
+    if not json_match:
+        raise ValueError("No JSON array found in the assistant's response.")
+    jobs = json.loads(json_match.group(0))
+    if not isinstance(jobs, list):
+        raise ValueError("Extracted JSON is not a list.")
+    return jobs
+
+
+def request_jobs(api, position, content, links=None):
+    """Ask the model for the jobs in one piece of page content."""
+    prompt = f"""
+        {JOB_EXTRACTION_PROMPT}
+
+        Position to extract: {position}
+
+        Text Content:
+        {content}
+    """
+    if links is not None:
+        prompt += f"""
+        Available Links:
+        {links}
+    """
+    prompt += """
+        Please output only the JSON array of job postings. Do not include any explanations or additional text.
+    """
+
+    with usage_scope(phase="extract"):
+        response = api.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.2,
+            max_tokens=2000
+        )
+    return parse_job_array(response.choices[0].message.content)
+
+
+def job_key(job):
+    """Dedupe key: normalized application URL and title."""
+    parts = urlsplit(str(job.get("Application Link") or "").strip())
+    link = urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), parts.query, ""))
+    return link, str(job.get("Job Title") or "").strip().lower()
+
+
+def merge_jobs(job_lists):
+    """Concatenate job lists, keeping the first of any duplicates."""
+    seen = set()
+    merged = []
+    for jobs in job_lists:
+        for job in jobs:
+            if not isinstance(job, dict):
+                continue
+            key = job_key(job)
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(job)
+    return merged
+
+
+def request_listing_selection(api, position, titles):
+    """Ask the model which of a board's titles match the position; returns their indexes."""
+    numbered = "\n".join(f"{index}: {title}" for index, title in enumerate(titles))
+    with usage_scope(phase="extract"):
+        response = api.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "You are an assistant that matches job titles to a position."},
+                {"role": "user", "content": LISTING_SELECTION_PROMPT.format(position=position, titles=numbered)}
+            ],
+            temperature=0,
+            max_tokens=500
+        )
+    match = re.search(r'\[[\d\s,]*\]', response.choices[0].message.content)
+    if not match:
+        raise ValueError("No JSON array of numbers found in the assistant's response.")
+    return [index for index in json.loads(match.group(0)) if 0 <= index < len(titles)]
+
+
+def select_listings(api, position, listings):
+    """Keep the board listings relevant to the position.
+
+    Titles containing every word of the position are kept without a model
+    call. If none do (e.g. "Backend Developer" for "Software Engineer"), the
+    titles alone are sent to the model in one small request.
+    """
+    matching = [listing for listing in listings if title_matches_position(listing[0], position)]
+    if matching:
+        return matching
+    candidates = listings[:MAX_SELECTION_TITLES]
+    logging.info(f"No listing title contains '{position}', asking the model about {len(candidates)} titles")
+    return [candidates[index] for index in request_listing_selection(api, position, [title for title, _, _ in candidates])]
+
+
+def listing_jobs(api, listings, position, company_name=None):
+    """Jobs for the listings of a board (title, location, link) that match the position."""
+    selected = select_listings(api, position, listings)
+    logging.info(f"{len(selected)} of {len(listings)} listings match '{position}'")
+    return merge_jobs([[board_job(company_name, title, location, link) for title, location, link in selected]])
+
+
+def extract_board_jobs(api, html, page_url, position, company_name=None):
+    """Jobs of a known ATS board, parsed directly.
+
+    Returns None if the page is not a known board or nothing could be parsed;
+    otherwise the result is final, as reading the page again would not
+    change it.
+    """
+    listings = parse_board(html, page_url)
+    if listings is None:
+        return None
+    return listing_jobs(api, listings, position, company_name)
+
+
+def extract_jobs(api, html, page_url, position):
+    """Extract job postings from a page with the model.
+
+    Navigation, footers, scripts and hidden elements are dropped. If the page
+    has repeated listing blocks they are sent to the model in chunks, in
+    parallel, and the results merged and deduplicated; otherwise the visible
+    text is sent in one request, as before. Known ATS boards are handled by
+    extract_board_jobs instead.
+    """
+    soup = make_soup(html)
+    drop_hidden(soup)
+    for element in soup(BOILERPLATE_TAGS):
+        element.decompose()
+
+    blocks = find_listing_blocks(soup)
+    if not blocks:
+        logging.info("No repeated listing blocks found, extracting from the page text")
+        text = soup.get_text(separator="\n", strip=True)[:FALLBACK_MAX_CHARS]
+        links = list(dict.fromkeys(urljoin(page_url, anchor["href"]) for anchor in soup.find_all("a", href=True)))
+        return merge_jobs([request_jobs(api, position, text, links)])
+
+    chunks = chunk_blocks([describe_block(block, page_url) for block in blocks])
+    if len(chunks) > MAX_CHUNKS:
+        logging.warning(f"Extracting the first {MAX_CHUNKS} of {len(chunks)} listing chunks")
+        chunks = chunks[:MAX_CHUNKS]
+    logging.info(f"Extracting jobs from {len(blocks)} listing blocks in {len(chunks)} chunks")
+
+    # Copy the context into each worker so the calls are charged to this company
+    with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_CHUNKS, len(chunks)),
+                            thread_name_prefix="extract") as executor:
+        futures = [executor.submit(contextvars.copy_context().run, request_jobs, api, position, chunk)
+                   for chunk in chunks]
+
+    results = []
+    for index, future in enumerate(futures):
+        try:
+            results.append(future.result())
+        except Exception as e:
+            logging.error(f"Extraction chunk {index + 1}/{len(chunks)} failed: {e}")
+    if not results:
+        raise ValueError("Every extraction chunk failed.")
+
+    jobs = merge_jobs(results)
+    logging.info(f"Extracted {len(jobs)} jobs ({sum(len(result) for result in results)} before dedupe)")
+    return jobs
@@ -1,26 +1,44 @@
 import platform
 import argparse
+import asyncio
+import base64
+import sys
 import time
 import json
 import re
 import os
 import shutil
+import sqlite3
 import logging
-import boto3
+import threading
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import TimeoutException
 from openai import OpenAI
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 from dotenv import load_dotenv
-import requests
 from prompts import *
+from browser_pool import BrowserPool
+from conversation import Conversation
+from s3_uploader import ScreenshotUploader
+from job_details import JobDetailFetcher
+from job_extraction import extract_board_jobs, extract_jobs
+from ats_extractors import find_extractor
+from ats_feeds import configure_feed_session, fetch_feed_jobs
+from careers_cache import CareersUrlCache, normalize_company_name
+from careers_search import configure_google_search, get_job_board_link
+from usage_tracker import UsageTracker, usage_scope
+from orchestrator import LimitedOpenAI, iterate_in_thread, run_companies
+from page_settle import install_activity_tracker, wait_for_page_settle, wait_for_click_effect,\
+                        scroll_and_wait, log_settle_summary, DEFAULT_SETTLE_TIMEOUT
 import agentops
-import concurrent.futures
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing, nullcontext
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'utils'))
+from utils import resize_image_bytes, get_webarena_accessibility_tree, screenshots_unchanged
 agentops.init("4778bbb5-d133-48cb-a2c8-c98e93ce1dfc")
 
 # Load environment variables
@@ -31,12 +49,30 @@ openai_api_key = os.getenv('OPENAI_API_KEY')
 google_api_key = os.getenv('GOOGLE_API_KEY')
 google_cse_id = os.getenv('GOOGLE_CSE_ID')
 
+# On-disk careers URL cache in front of get_job_board_link, opened in main()
+careers_cache = None
+
+# Model token/latency accounting per company and phase, set up in main()
+usage_tracker = None
+
+# Run start and first page load, for the time-to-first-browser-action metric
+run_started_at = time.monotonic()
+first_browser_action_at = None
+first_browser_action_lock = threading.Lock()
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 # Constants
 REGION_NAME = 'us-east-1'  # Replace with your AWS region
 BUCKET_NAME = 'jobscraiper'  # Replace with your S3 bucket name
+MAX_ELEMENT_TEXT_LENGTH = 200  # Characters of element text shown to the model
+INLINE_IMAGE_SHORT_SIDE = 768  # Pixels on the shorter side of inline screenshots
+INLINE_IMAGE_QUALITY = 75  # JPEG quality of inline screenshots
+CHANGE_DETECTION_SIZE = (256, 256)  # Screenshots are compared at this resolution
+CHANGE_PIXEL_DELTA = 4  # Gray-level difference that counts as a changed pixel (above encoding noise)
+MAX_PLAN_ACTIONS = 4  # Actions run from a single model response before re-observing
+AX_TREE_LINE_ID = re.compile(r"^(\t*)\[([^\]]+)\]")  # Indentation and node id of an accessibility tree line
 
 
 def setup_logger(task_dir):
@@ -63,6 +99,21 @@ def setup_logger(task_dir):
     
     return logger
 
+def mark_first_browser_action():
+    """Log how long the run took to reach its first page load (only once)."""
+    global first_browser_action_at
+    with first_browser_action_lock:
+        if first_browser_action_at is not None:
+            return
+        first_browser_action_at = time.monotonic()
+    logging.info(f"Time to first browser action: {first_browser_action_at - run_started_at:.2f}s")
+
+def record_retry(phase):
+    """Count a repeated model call in the usage totals."""
+    if usage_tracker:
+        with usage_scope(phase=phase):
+            usage_tracker.record_retry()
+
 def report_progress(company_id, status, jobs=None):
     """Report progress to stdout in a structured format that can be parsed by the frontend."""
     update = {
@@ -74,32 +125,16 @@ def report_progress(company_id, status, jobs=None):
         update["jobs"] = jobs
     print(json.dumps(update), flush=True)
 
-def get_job_board_link(company_name):
-    """Use Google's Custom Search API to search for a company's job board."""
-    search_query = f"{company_name} careers site"
-    url = "https://www.googleapis.com/customsearch/v1"
-    
-    params = {
-        'key': google_api_key,
-        'cx': google_cse_id,
-        'q': search_query
-    }
-    
-    try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        
-        search_results = response.json()
-        for item in search_results.get('items', []):
-            if "career" in item['title'].lower() or "job" in item['title'].lower():
-                return item['link']
-        return None
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Error fetching job board link for {company_name}: {e}")
-        return None
+def resolve_careers_url(company):
+    """Point the company at its careers page, keeping its homepage if none is found."""
+    careers_url = get_job_board_link(company['web_name'], google_api_key, google_cse_id, careers_cache)
+    if careers_url:
+        company['web'] = careers_url
+    return company
 
-def search_companies(api, position, industry, location, whitelist, blacklist, company_size, num_results):
-    """Use OpenAI's ChatCompletion to generate a list of companies with detailed fields."""
+def build_company_search_prompt(position, industry, location, whitelist, blacklist, company_size, num_results,
+                                exclude=()):
+    """Fill COMPANY_SEARCH_PROMPT from the search criteria, excluding already found companies."""
     whitelist_companies = [company.strip() for company in whitelist.split(',') if company.strip()]
     blacklist_companies = [company.strip() for company in blacklist.split(',') if company.strip()]
     company_size_str = ', '.join(company_size)
@@ -113,23 +148,196 @@ def search_companies(api, position, industry, location, whitelist, blacklist, co
         blacklist=', '.join(blacklist_companies),
         num_results=num_results
     )
+    if exclude:
+        prompt += COMPANY_EXCLUSION_PROMPT.format(excluded=', '.join(exclude))
+    return prompt
+
+def company_search_messages(prompt):
+    """Chat messages for a company search prompt."""
+    return [
+        {"role": "system", "content": "You are a helpful assistant that provides precise lists of companies based on given criteria."},
+        {"role": "user", "content": prompt}
+    ]
+
+def company_keys(company):
+    """Normalized name and domain, used to spot the same company returned twice."""
+    keys = set()
+    name = normalize_company_name(company.get("Company/Organization"))
+    if name:
+        keys.add(("name", name))
+    url = company.get("Company URL") or ""
+    domain = urlparse(url if "//" in url else f"//{url}").netloc.lower()
+    if domain.startswith("www."):
+        domain = domain[4:]
+    if domain:
+        keys.add(("domain", domain))
+    return keys
+
+def add_new_companies(found, seen_keys, candidates, limit):
+    """Append up to `limit` candidates not already in `found`; return how many were added."""
+    added = 0
+    for company in candidates:
+        if added >= limit:
+            break
+        if not isinstance(company, dict) or not company.get("Company/Organization"):
+            continue
+        keys = company_keys(company)
+        if keys & seen_keys:
+            continue
+        seen_keys.update(keys)
+        found.append(company)
+        added += 1
+    return added
+
+def format_company(company, idx, position):
+    """Turn a company object from the model into the task dict used by the scraper."""
+    company_name = company.get("Company/Organization")
+    company_url = company.get("Company URL")
 
-    logging.info(f"Generated prompt requesting {num_results} companies.")
+    return {
+        "web_name": company_name,
+        "id": f"{company_name}--{idx}",
+        "ques": f"Scrape all job postings relating to {position} from {company_name}'s careers page, including position title, application link, and deadline.",
+        "web": company_url
+    }
 
-    max_retries = 3
+def company_summary(company):
+    """The company entry sent to the frontend in companies_list and final_result."""
+    return {
+        "id": company['id'],
+        "name": company['web_name'],
+        "web": company['web'],
+        "status": "pending"
+    }
+
+def iter_json_array_objects(chunks):
+    """Yield each top-level object of a JSON array as soon as its text is complete.
+
+    `chunks` is any iterable of text fragments, e.g. streamed model tokens.
+    Text around the array (such as code fences) is ignored.
+    """
+    buffer = ""
+    pos = 0
+    depth = 0
+    start = None
+    in_string = False
+    escaped = False
+
+    for chunk in chunks:
+        buffer += chunk
+        while pos < len(buffer):
+            char = buffer[pos]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == '\\':
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in '[{':
+                depth += 1
+                if depth == 2 and char == '{':
+                    start = pos
+            elif char in ']}':
+                depth -= 1
+                if depth == 1 and char == '}' and start is not None:
+                    try:
+                        yield json.loads(buffer[start:pos + 1])
+                    except json.JSONDecodeError as e:
+                        logging.warning(f"Skipping malformed object in streamed JSON: {e}")
+                    start = None
+            pos += 1
+
+        # Keep only the text of the object still being received
+        if start is None:
+            buffer, pos = "", 0
+        else:
+            buffer, pos, start = buffer[start:], pos - start, 0
+
+def stream_companies(api, position, industry, location, whitelist, blacklist, company_size, num_results):
+    """Stream the company list from the model, yielding each company as soon as it is parsed.
+
+    If the stream ends short, follow-up streams ask only for the missing
+    companies. Careers URLs are not resolved here (see resolve_careers_url);
+    each company's "web" is its homepage.
+    """
+    max_requests = 3
+    found = []
+    seen_keys = set()
+    start_time = time.monotonic()
+
+    for attempt in range(max_requests):
+        missing = num_results - len(found)
+        prompt = build_company_search_prompt(position, industry, location, whitelist, blacklist, company_size,
+                                             missing, exclude=[c["Company/Organization"] for c in found])
+        logging.info(f"Generated prompt requesting {missing} companies (streaming, request {attempt + 1}/{max_requests}).")
+
+        try:
+            with usage_scope(phase="company_search"):
+                response = api.chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=company_search_messages(prompt),
+                    max_tokens=2500,
+                    temperature=0.7,
+                    stream=True,
+                )
+            chunks = (chunk.choices[0].delta.content or "" for chunk in response if chunk.choices)
+
+            # Close the stream when leaving early, so its usage is recorded now
+            with closing(response):
+                for company in iter_json_array_objects(chunks):
+                    if add_new_companies(found, seen_keys, [company], num_results - len(found)):
+                        yield format_company(company, len(found), position)
+                    if len(found) >= num_results:
+                        break
+        except Exception as e:
+            logging.error(f"Error during streamed API call (Request {attempt + 1}/{max_requests}): {str(e)}")
+            if not found and attempt == max_requests - 1:
+                raise
+            record_retry("company_search")
+
+        if len(found) >= num_results:
+            break
+        logging.warning(f"Model streamed {len(found)} of {num_results} requested companies.")
+
+    logging.info(f"Company search: {len(found)} companies in {attempt + 1} requests, "
+                 f"{time.monotonic() - start_time:.1f}s")
+
+def search_companies(api, position, industry, location, whitelist, blacklist, company_size, num_results,
+                     resolve_urls=True):
+    """Use OpenAI's ChatCompletion to generate a list of companies with detailed fields.
+
+    With resolve_urls=False the careers URL lookups are left to the caller
+    (see resolve_careers_url) and each company's "web" is its homepage.
+    """
+    max_requests = 3
     retry_delay = 2
+    companies = []
+    seen_keys = set()
+    prompt_tokens = 0
+    completion_tokens = 0
+    start_time = time.monotonic()
+
+    for attempt in range(max_requests):
+        # After the first response only the missing companies are requested
+        missing = num_results - len(companies)
+        prompt = build_company_search_prompt(position, industry, location, whitelist, blacklist, company_size,
+                                             missing, exclude=[c["Company/Organization"] for c in companies])
+        logging.info(f"Generated prompt requesting {missing} companies.")
 
-    for attempt in range(max_retries):
         try:
-            response = api.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that provides precise lists of companies based on given criteria."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=2500,
-                temperature=0.7,
-            )
+            with usage_scope(phase="company_search"):
+                response = api.chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=company_search_messages(prompt),
+                    max_tokens=2500,
+                    temperature=0.7,
+                )
+            if response.usage:
+                prompt_tokens += response.usage.prompt_tokens
+                completion_tokens += response.usage.completion_tokens
 
             content = response.choices[0].message.content.strip()
             logging.info("Received response from OpenAI.")
@@ -139,47 +347,37 @@ def search_companies(api, position, industry, location, whitelist, blacklist, co
                 if content.strip().startswith('json'):
                     content = content.strip()[4:].strip()
 
-            companies = json.loads(content)
-            logging.info(f"Parsed company list successfully. Found {len(companies)} companies.")
+            candidates = json.loads(content)
+            added = add_new_companies(companies, seen_keys, candidates, missing)
+            logging.info(f"Parsed company list successfully. Received {len(candidates)} companies, {added} new.")
             
-            if len(companies) == num_results:
-                break
-            elif len(companies) > num_results:
-                companies = companies[:num_results]
-                logging.warning(f"Received more companies than requested. Trimmed to {num_results}.")
+            if len(companies) >= num_results:
                 break
-            else:
-                logging.warning(f"Received fewer companies than requested. Retrying. (Attempt {attempt + 1}/{max_retries})")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                    retry_delay *= 2
+            logging.warning(f"Have {len(companies)} of {num_results} companies. Requesting the missing "
+                            f"{num_results - len(companies)}. (Request {attempt + 1}/{max_requests})")
         except Exception as e:
-            logging.error(f"Error during API call (Attempt {attempt + 1}/{max_retries}): {str(e)}")
-            if attempt < max_retries - 1:
+            logging.error(f"Error during API call (Request {attempt + 1}/{max_requests}): {str(e)}")
+            if attempt < max_requests - 1:
+                record_retry("company_search")
                 time.sleep(retry_delay)
                 retry_delay *= 2
-            else:
+            elif not companies:
                 raise
 
     if len(companies) < num_results:
-        logging.error(f"Failed to retrieve {num_results} companies after {max_retries} attempts.")
+        logging.error(f"Failed to retrieve {num_results} companies after {max_requests} requests.")
 
-    formatted_companies = []
-    for idx, company in enumerate(companies, start=1):
-        company_name = company.get("Company/Organization")
-        company_url = company.get("Company URL")
-        
-        careers_url = get_job_board_link(company_name)
-        if not careers_url:
-            careers_url = company_url
-
-        formatted_company = {
-            "web_name": company_name,
-            "id": f"{company_name}--{idx}",
-            "ques": f"Scrape all job postings relating to {position} from {company_name}'s careers page, including position title, application link, and deadline.",
-            "web": careers_url
-        }
-        formatted_companies.append(formatted_company)
+    logging.info(f"Company search: {len(companies)} companies in {attempt + 1} requests, "
+                 f"{prompt_tokens} prompt + {completion_tokens} completion tokens, "
+                 f"{time.monotonic() - start_time:.1f}s")
+
+    formatted_companies = [format_company(company, idx, position)
+                           for idx, company in enumerate(companies, start=1)]
+
+    if resolve_urls and formatted_companies:
+        # Look up careers pages concurrently; the session and limits bound the load
+        with ThreadPoolExecutor(max_workers=len(formatted_companies)) as executor:
+            formatted_companies = list(executor.map(resolve_careers_url, formatted_companies))
 
     return formatted_companies
 
@@ -243,13 +441,26 @@ def get_web_element_rect(driver, fix_color=True):
                 return inViewport;
             });
 
-            // Clear existing markers
-            labels.forEach(label => label.remove());
+            // Describe elements in the page so Python needs no per-element round trips
+            const descriptors = items.map(element => {
+                const text = element.innerText || element.value || '';
+                const type = typeof element.type === 'string' ? element.type : element.getAttribute('type');
+                return {
+                    tag: element.tagName.toLowerCase(),
+                    type: type || '',
+                    aria: element.getAttribute('aria-label') || '',
+                    text: String(text).trim().slice(0, MAX_TEXT_LENGTH)
+                };
+            });
+
+            // Clear markers left by the previous observation so they do not stack up
+            document.querySelectorAll('[data-element-marker]').forEach(marker => marker.remove());
             labels = [];
 
             items.forEach((element, index) => {
                 const rect = element.getBoundingClientRect();
                 const marker = document.createElement('div');
+                marker.setAttribute('data-element-marker', '');
                 marker.style.position = 'fixed';
                 marker.style.left = rect.left + 'px';
                 marker.style.top = rect.top + 'px';
@@ -276,68 +487,121 @@ def get_web_element_rect(driver, fix_color=True):
                 labels.push(marker);
             });
 
-            return [labels, items];
+            return [labels, items, descriptors];
         }
         return markPage();
-    """
+    """.replace("MAX_TEXT_LENGTH", str(MAX_ELEMENT_TEXT_LENGTH))
     
-    rects, elements = driver.execute_script(js_script)
+    rects, elements, descriptors = driver.execute_script(js_script)
     web_elements_text = []
     
-    for idx, element in enumerate(elements):
-        try:
-            element_text = element.get_attribute('innerText') or element.get_attribute('value') or ''
-            element_tag = element.tag_name
-            element_type = element.get_attribute('type') or ''
-            element_aria = element.get_attribute('aria-label') or ''
+    for idx, desc in enumerate(descriptors):
+        # Create descriptive text that includes all relevant attributes
+        desc_parts = []
+        if desc['text']:
+            desc_parts.append(f"'{desc['text']}'")
+        if desc['aria']:
+            desc_parts.append(f"aria-label='{desc['aria']}'")
+        if desc['type']:
+            desc_parts.append(f"type='{desc['type']}'")
             
-            # Create descriptive text that includes all relevant attributes
-            desc_parts = []
-            if element_text.strip():
-                desc_parts.append(f"'{element_text.strip()}'")
-            if element_aria:
-                desc_parts.append(f"aria-label='{element_aria}'")
-            if element_type:
-                desc_parts.append(f"type='{element_type}'")
-                
-            element_desc = f"[{idx}]: <{element_tag}> {' '.join(desc_parts)}"
-            web_elements_text.append(element_desc)
-            
-        except Exception as e:
-            continue
+        element_desc = f"[{idx}]: <{desc['tag']}> {' '.join(desc_parts)}"
+        web_elements_text.append(element_desc)
             
     return rects, elements, "\n".join(web_elements_text)
 
 
-def upload_image_and_get_presigned_url(image_path, s3_client, expiration=300):
-    """Upload an image to S3 and return a pre-signed URL."""
-    try:
-        file_name = os.path.basename(image_path)
-        object_name = f"temp_images/{int(time.time())}_{file_name}"
-        s3_client.upload_file(image_path, BUCKET_NAME, object_name)
-        
-        url = s3_client.generate_presigned_url('get_object',
-                                               Params={'Bucket': BUCKET_NAME,
-                                                       'Key': object_name},
-                                               ExpiresIn=expiration)
-        print(f"Pre-signed URL: {url}")
-        return url
-    except Exception as e:
-        print(f"Error uploading image to S3: {e}")
-        return None
-    
-def format_msg(iteration, init_msg, url, web_eles_text, position):
-    """Format the message for the AI model."""
+def get_accessibility_elements(driver, args):
+    """Text-only counterpart of get_web_element_rect.
+
+    Returns the elements behind the lines of a token-budgeted accessibility
+    tree of the viewport, and the tree itself renumbered so line [i] is
+    element i.
+    """
+    tree_text, obs_nodes_info = get_webarena_accessibility_tree(driver, token_budget=args.ax_tree_token_budget)
+
+    lines = []
+    points = []
+    for line in tree_text.split("\n"):
+        match = AX_TREE_LINE_ID.match(line)
+        node_info = obs_nodes_info.get(match.group(2)) if match else None
+        if not node_info or not node_info["union_bound"]:
+            lines.append(line)
+            continue
+        x, y, width, height = node_info["union_bound"]
+        lines.append(f"{match.group(1)}[{len(points)}]{line[match.end():]}")
+        points.append([x + width / 2, y + height / 2])
+
+    # Resolve every node to the DOM element at its center in one round trip
+    web_eles = driver.execute_script("""
+        return arguments[0].map(([x, y]) => document.elementFromPoint(
+            Math.min(Math.max(x, 0), window.innerWidth - 1),
+            Math.min(Math.max(y, 0), window.innerHeight - 1)
+        ));
+    """, points) if points else []
+    return web_eles, "\n".join(lines)
+
+def get_interactive_elements(driver, args):
+    """Return the numbered elements and their description for the observation mode in use."""
+    if args.text_only:
+        return get_accessibility_elements(driver, args)
+    _, web_eles, web_eles_text = get_web_element_rect(driver, fix_color=args.fix_box_color)
+    return web_eles, web_eles_text
+
+def send_screenshot(png_bytes, uploader, task_dir, iteration, args):
+    """Return a future for the URL the model reads the labeled screenshot from, and the bytes sent."""
+    if args.image_transport == 'inline':
+        # Downscale in memory and embed the JPEG as a data URL, skipping S3
+        image_bytes = resize_image_bytes(png_bytes,
+                                         short_side=INLINE_IMAGE_SHORT_SIDE,
+                                         quality=INLINE_IMAGE_QUALITY)
+        url = f"data:image/jpeg;base64,{base64.b64encode(image_bytes).decode('ascii')}"
+        url_future = Future()
+        url_future.set_result(url)
+        return url_future, len(url)
+
+    img_path = os.path.join(task_dir, f'screenshot{iteration}.png')
+    with open(img_path, 'wb') as f:
+        f.write(png_bytes)
+    return uploader.submit(img_path), len(png_bytes)
+
+def observation_unchanged(previous, current):
+    """Compare two observations: accessibility tree texts, or PNG screenshots."""
+    if previous is None:
+        return False
+    if isinstance(current, str):
+        return previous == current
+    return screenshots_unchanged(previous, current, size=CHANGE_DETECTION_SIZE, pixel_delta=CHANGE_PIXEL_DELTA)
+
+def format_no_change_msg(action_key, text_only=False):
+    """Cheap text-only feedback sent instead of a new observation when an action changed nothing."""
+    observation = "accessibility tree" if text_only else "screenshot"
+    return {
+        "role": "user",
+        "content": f"Your last action ({action_key}) had no visible effect: the page is the same as in the "
+                   f"previous {observation}, and the element numbers are unchanged. Do not repeat it; "
+                   f"choose a different action in the required format."
+    }
+
+def format_msg(iteration, init_msg, url, web_eles_text, position, text_only=False):
+    """Format the message for the AI model; text-only messages carry no screenshot."""
     # Format elements text first
     if isinstance(web_eles_text, list):
         elements_text = "\n".join(web_eles_text)
     else:
         elements_text = web_eles_text
+
+    if text_only:
+        elements_header = "Accessibility tree of the visible page (use the numbers in brackets in your actions):"
+        observation = "accessibility tree"
+    else:
+        elements_header = "Available clickable elements (use these numbers in your actions):"
+        observation = "screenshot"
     
     message = f"""
     Task: Find {position} job postings on this careers page.
 
-    Available clickable elements (use these numbers in your actions):
+    {elements_header}
     {elements_text}
 
     Remember:
@@ -352,7 +616,10 @@ def format_msg(iteration, init_msg, url, web_eles_text, position):
     - Google
     - ExtractJobInfo
 
-    Analyze the screenshot and tell me what action to take."""
+    Analyze the {observation} and tell me what action to take."""
+
+    if text_only:
+        return {"role": "user", "content": message}
 
     return {
         "role": "user",
@@ -369,30 +636,25 @@ def format_msg(iteration, init_msg, url, web_eles_text, position):
             }
         ]
     }
-def clip_message_and_obs(messages, max_attached_imgs):
-    """Clip the message history to include only the last few images."""
-    image_count = 0
-    clipped_messages = []
-    
-    for msg in reversed(messages):
-        if isinstance(msg['content'], list):
-            for content in msg['content']:
-                if content['type'] == 'image_url':
-                    image_count += 1
-                    if image_count > max_attached_imgs:
-                        return list(reversed(clipped_messages))
-        clipped_messages.append(msg)
-    
-    return list(reversed(clipped_messages))
+def summarize_observation(iteration, driver, web_eles, text_only=False):
+    """Short text that replaces an observation once it leaves the attached window."""
+    observation = "accessibility tree" if text_only else "screenshot"
+    try:
+        page = driver.current_url
+    except Exception:
+        page = "unknown page"
+    return (f"Observation {iteration}: {page} with {len(web_eles)} numbered elements "
+            f"({observation} omitted to save space).")
 
 def call_gpt4v_api(args, api, messages):
     try:
-        response = api.chat.completions.create(
-            model=args.api_model,
-            messages=messages,
-            max_tokens=1000,
-            temperature=args.temperature
-        )
+        with usage_scope(phase="navigate"):
+            response = api.chat.completions.create(
+                model=args.api_model,
+                messages=messages,
+                max_tokens=1000,
+                temperature=args.temperature
+            )
         return False, response
     except Exception as e:
         logging.error(f"Error calling GPT-4 Vision API: {e}")
@@ -400,20 +662,33 @@ def call_gpt4v_api(args, api, messages):
 
 
 
-def extract_information(response_text):
-    """Extract action and info from AI response."""
+def extract_action_plan(response_text):
+    """Extract the ordered actions from an AI response, one per 'Action:' line.
+
+    Parsing stops at the first line that is not a valid action, so the plan
+    holds only the actions before it.
+    """
     logging.info(f"Parsing response: {response_text}")
+
+    action_lines = re.findall(r'Action:\s*(.+)', response_text)
+    if not action_lines:
+        logging.error("No 'Action:' found in response")
+        return []
+
+    plan = []
+    for action_line in action_lines[:MAX_PLAN_ACTIONS]:
+        action_key, info = parse_action_line(action_line.strip())
+        if not action_key:
+            break
+        plan.append((action_key, info))
+    return plan
+
+
+def parse_action_line(action_line):
+    """Parse one action line into (action_key, info)."""
+    logging.info(f"Found action line: {action_line}")
     
     try:
-        # Extract action line
-        action_match = re.search(r'Action:\s*(.+)', response_text)
-        if not action_match:
-            logging.error("No 'Action:' found in response")
-            return None, None
-        
-        action_line = action_match.group(1).strip()
-        logging.info(f"Found action line: {action_line}")
-        
         # Parse click action - format: Click [X]
         click_match = re.search(r'Click\s*\[(\d+)\]', action_line)
         if click_match:
@@ -461,7 +736,51 @@ def extract_information(response_text):
         return None, None
 
 
-def exec_action_click(info, web_elements, driver):
+def exec_action(action_key, info, web_eles, driver, args):
+    """Execute one navigation action; returns False if it was not carried out."""
+    try:
+        if action_key == 'click' and info and 'number' in info:
+            if 0 <= info['number'] < len(web_eles):
+                exec_action_click(info, web_eles, driver, args)
+            else:
+                logging.error(f"Invalid element number: {info['number']}")
+        elif action_key == 'type' and info:
+            exec_action_type(info, web_eles, driver, args)
+        elif action_key == 'scroll':
+            exec_action_scroll(info, web_eles, driver, args)
+        elif action_key == 'wait':
+            wait_for_page_settle(driver, "wait", timeout=args.settle_timeout,
+                                 fixed_sleep=5, min_wait=1)
+        elif action_key == 'goback':
+            driver.back()
+            wait_for_page_settle(driver, "goback", timeout=args.settle_timeout,
+                                 fixed_sleep=4, min_wait=0.3)
+        else:
+            logging.warning(f"Unknown action: {action_key}")
+            return False
+        return True
+    except Exception as e:
+        logging.error(f"Error executing action: {e}")
+        return False
+
+def plan_diverged(driver, plan_url, plan_windows, action_key, info, web_eles):
+    """Whether the page moved on from the observation a multi-action plan was made for."""
+    if action_key == 'extractjobinfo':
+        # Reads whatever page is current, e.g. the results of a search typed earlier in the plan
+        return False
+    if driver.current_url != plan_url or driver.window_handles != plan_windows:
+        return True
+    if action_key in ('click', 'type'):
+        if not (0 <= info['number'] < len(web_eles)):
+            return True
+        try:
+            return not web_eles[info['number']].is_displayed()
+        except Exception:
+            # Stale: the element was replaced since the observation
+            return True
+    return False
+
+def exec_action_click(info, web_elements, driver, args):
     """Execute click action with improved reliability."""
     max_attempts = 3
     wait_time = 2
@@ -478,30 +797,23 @@ def exec_action_click(info, web_elements, driver):
                 element.is_enabled()
             except:
                 # Refresh elements if stale
-                _, web_elements, _ = get_web_element_rect(driver)
+                web_elements, _ = get_interactive_elements(driver, args)
                 if 0 <= info['number'] < len(web_elements):
                     element = web_elements[info['number']]
                 else:
                     raise ValueError("Element no longer exists after refresh")
 
-            # Scroll element into view
-            driver.execute_script("""
-                arguments[0].scrollIntoView({
-                    behavior: 'smooth',
-                    block: 'center',
-                    inline: 'center'
-                });
-            """, element)
-
-            # Wait for scroll to complete
-            time.sleep(1)
+            # Scroll element into view and wait for the scroll to end
+            scroll_and_wait(driver, element=element, timeout=args.settle_timeout,
+                            action="click:scroll_into_view", fixed_sleep=1)
 
             # Check if element is clickable
             if not element.is_displayed() or not element.is_enabled():
                 raise ValueError("Element not interactive")
 
-            # Get current window handles before clicking
+            # Get current window handles and URL before clicking
             before_click_windows = driver.window_handles
+            before_click_url = driver.current_url
 
             # Try multiple click methods
             try:
@@ -513,21 +825,10 @@ def exec_action_click(info, web_elements, driver):
                     actions = ActionChains(driver)
                     actions.move_to_element(element).click().perform()
 
-            # Wait for potential page updates
-            time.sleep(wait_time)
-
-            # Get window handles after clicking
-            after_click_windows = driver.window_handles
-
-            # Check if a new window has opened
-            if len(after_click_windows) > len(before_click_windows):
-                # Switch to the new window
-                new_window = [window for window in after_click_windows if window not in before_click_windows][0]
-                driver.switch_to.window(new_window)
-                logging.info("Switched to new window")
-            else:
-                # Still on the same window
-                pass
+            # Wait for navigation, a new window, or the page going quiet;
+            # switches to the new window if one opened
+            wait_for_click_effect(driver, before_click_url, before_click_windows,
+                                  timeout=args.settle_timeout, fixed_sleep=wait_time + 2)
 
             return True
 
@@ -559,12 +860,8 @@ def exec_action_scroll(info, web_elements, driver, args):
                     return "EXTRACT_NOW"
                     
                 # Smooth scroll down
-                driver.execute_script(f"""
-                    window.scrollBy({{
-                        top: {scroll_amount},
-                        behavior: 'smooth'
-                    }});
-                """)
+                scroll_and_wait(driver, delta_y=scroll_amount, timeout=args.settle_timeout,
+                                fixed_sleep=2)
                 
             elif info['content'] == 'up':
                 # Check if we're near the top
@@ -572,15 +869,11 @@ def exec_action_scroll(info, web_elements, driver, args):
                     return None
                     
                 # Smooth scroll up
-                driver.execute_script(f"""
-                    window.scrollBy({{
-                        top: -{scroll_amount},
-                        behavior: 'smooth'
-                    }});
-                """)
+                scroll_and_wait(driver, delta_y=-scroll_amount, timeout=args.settle_timeout,
+                                fixed_sleep=2)
             
-            # Wait for scroll animation and dynamic content
-            time.sleep(2)
+            # Wait for dynamic content loaded by the scroll
+            wait_for_page_settle(driver, "scroll:content", timeout=args.settle_timeout, fixed_sleep=2)
             
             # Check if scroll actually happened
             new_scroll = driver.execute_script("return window.pageYOffset")
@@ -593,116 +886,112 @@ def exec_action_scroll(info, web_elements, driver, args):
         logging.error(f"Scroll action failed: {e}")
         return None
 
-def exec_action_type(info, web_eles, driver):
+def exec_action_type(info, web_eles, driver, args):
     try:
         if 'number' in info and 'content' in info and 0 <= info['number'] < len(web_eles):
             web_ele = web_eles[info['number']]
-            driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center', inline: 'center'});", web_ele)
-            time.sleep(1)
+            scroll_and_wait(driver, element=web_ele, timeout=args.settle_timeout,
+                            action="type:scroll_into_view", fixed_sleep=1)
             web_ele.clear()
             web_ele.send_keys(info['content'])
-            time.sleep(0.5)
+            # Let autocomplete and input handlers react before submitting
+            wait_for_page_settle(driver, "type:input", timeout=args.settle_timeout,
+                                 fixed_sleep=0.5, min_wait=0.1)
             # Press 'Enter' after typing
+            before_url = driver.current_url
+            before_windows = driver.window_handles
             web_ele.send_keys(Keys.ENTER)
-            time.sleep(1)
+            wait_for_click_effect(driver, before_url, before_windows, timeout=args.settle_timeout,
+                                  action="type:submit", fixed_sleep=3)
         else:
             logging.error(f"Invalid info for type action: {info}")
     except Exception as e:
         logging.error(f"Type action failed: {e}")
 
 
-def extract_and_store_job_info(driver, task_dir, api, company_id, position):
-    for attempt in range(1, 4):
-        try:
-            logging.info(f"Starting job info extraction (Attempt {attempt}/3)")
-            report_progress(company_id, status="extracting_job_info")
-
-            html = driver.page_source
-            soup = BeautifulSoup(html, 'html.parser')
-            full_text = soup.get_text(separator='\n', strip=True)
-
-            current_url = driver.current_url
-            base_url = "{0.scheme}://{0.netloc}".format(urlparse(current_url))
-            links = [urljoin(base_url, a_tag['href']) for a_tag in soup.find_all('a', href=True)]
-
-            max_length = 4000
-            if len(full_text) > max_length:
-                full_text = full_text[:max_length]
-
-            prompt = f"""
-                {JOB_EXTRACTION_PROMPT}
-
-                Position to extract: {position}
-
-                Text Content:
-                {full_text}
-
-                Available Links:
-                {links}
+def save_job_results(task_dir, jobs):
+    """Write a company's jobs to job_results.json in its task directory."""
+    os.makedirs(task_dir, exist_ok=True)
+    temp_file_path = os.path.join(task_dir, 'job_results_temp.json')
+    final_file_path = os.path.join(task_dir, 'job_results.json')
+    with open(temp_file_path, 'w', encoding='utf-8') as f:
+        json.dump(jobs, f, indent=2)
+    os.replace(temp_file_path, final_file_path)
+
+
+# The page body without scripts, styles and elements that are not rendered, so
+# multi-megabyte single-page-app sources are trimmed in the browser before parsing
+VISIBLE_HTML_JS = """
+    const skipTags = new Set(['SCRIPT', 'STYLE', 'NOSCRIPT', 'TEMPLATE', 'SVG', 'IFRAME', 'OBJECT', 'LINK', 'META']);
+    const dropped = [];
+    for (const element of document.body.querySelectorAll('*')) {
+        if (skipTags.has(element.tagName.toUpperCase()) ||
+                (element.getClientRects().length === 0 && getComputedStyle(element).display !== 'contents')) {
+            dropped.push(element);
+        }
+    }
+    dropped.forEach(element => element.setAttribute('data-scraper-drop', ''));
+    const copy = document.body.cloneNode(true);
+    dropped.forEach(element => element.removeAttribute('data-scraper-drop'));
+    copy.querySelectorAll('[data-scraper-drop]').forEach(element => element.remove());
+    return copy.outerHTML;
+"""
+
+def get_visible_page_html(driver):
+    """HTML of the rendered page body, falling back to the full page source."""
+    try:
+        html = driver.execute_script(VISIBLE_HTML_JS)
+        if html:
+            return html
+    except Exception as e:
+        logging.warning(f"Could not read the visible page HTML, using the page source: {e}")
+    return driver.page_source
 
-                Please output only the JSON array of job postings. Do not include any explanations or additional text.
-            """
 
-            response = api.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are an assistant that extracts job postings from text and returns them as a JSON array."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.2,
-                max_tokens=2000
-            )
+def extract_and_store_job_info(driver, task_dir, api, company_id, position, company_name=None):
+    """Extract the jobs on the current page, save them and report them.
 
-            assistant_response = response.choices[0].message.content
-            
-            json_match = re.search(r'\[\s*\{[\s\S]*?\}\s*\]', assistant_response)
-            if not json_match:
-                raise ValueError("No JSON array found in the assistant's response.")
+    Returns the jobs; an empty list only for a known job board with nothing
+    matching the position, which reading again would not change. Returns
+    None if extraction failed.
+    """
+    report_progress(company_id, status="extracting_job_info")
+    # The page is read once; only the model extraction is retried
+    html = get_visible_page_html(driver)
+    page_url = driver.current_url
+    for attempt in range(1, 4):
+        try:
+            logging.info(f"Starting job info extraction (Attempt {attempt}/3)")
 
-            json_content = json_match.group(0)
-            extracted_info = json.loads(json_content)
-            if not isinstance(extracted_info, list) or len(extracted_info) == 0:
-                raise ValueError("Extracted JSON is empty or not a list.")
+            extracted_info = extract_board_jobs(api, html, page_url, position, company_name)
+            if extracted_info is None:
+                extracted_info = extract_jobs(api, html, page_url, position)
+                if len(extracted_info) == 0:
+                    raise ValueError("Extracted JSON is empty or not a list.")
+            elif not extracted_info:
+                logging.info(f"No '{position}' jobs on the job board at {page_url}")
+                return []
 
+            # Application pages are fetched later, outside the browser (see JobDetailFetcher)
             for job in extracted_info:
-
                 app_link = job.get("Application Link")
-                if app_link and is_valid_url(app_link):
-                    try:
-                        driver.get(app_link)
-                        driver.implicitly_wait(5)
-                        app_page_html = driver.page_source
-                        app_page_soup = BeautifulSoup(app_page_html, 'html.parser')
-                        job['Additional Details'] = app_page_soup.get_text(separator='\n', strip=True)[:100]
-                    except Exception as e:
-                        job['Additional Details'] = f"Error fetching additional details: {str(e)}"
-                else:
+                if not (app_link and is_valid_url(app_link)):
                     job['Application Link'] = "N/A"
 
-            os.makedirs(task_dir, exist_ok=True)
-            if extracted_info:
-                temp_file_path = os.path.join(task_dir, 'job_results_temp.json')
-                final_file_path = os.path.join(task_dir, 'job_results.json')
-                with open(temp_file_path, 'w', encoding='utf-8') as f:
-                    json.dump(extracted_info, f, indent=2)
-                os.replace(temp_file_path, final_file_path)
-                
-                report_progress(company_id, "completed", extracted_info)
-                return extracted_info
-            else:
-                report_progress(company_id, "error", {"message": "No jobs found"})
-                return []
+            save_job_results(task_dir, extracted_info)
+            report_progress(company_id, "completed", extracted_info)
+            return extracted_info
 
         except Exception as e:
             logging.error(f"Error during extraction attempt {attempt}: {e}")
             if attempt < 3:
+                record_retry("extract")
                 report_progress(company_id, "retrying")
                 time.sleep(2)
             else:
                 report_progress(company_id, "error", {"message": str(e)})
-                return []
 
-    return []
+    return None
 
 
 
@@ -715,69 +1004,156 @@ def is_valid_url(url):
         return False
 
 
-def navigate_and_scrape(driver, api, company, position, task_dir, args):
+def navigate_and_scrape(driver, api, uploader, company, position, task_dir, args):
     logging.info(f"Navigating and scraping for company: {company['web_name']}")
     report_progress(company['id'], "navigating")
 
+    install_activity_tracker(driver)
+    mark_first_browser_action()
     driver.get(company['web'])
-    time.sleep(3)  # Give more time for initial page load
+    wait_for_page_settle(driver, "navigate", timeout=args.settle_timeout, fixed_sleep=3)
 
-    messages = [{
-        'role': 'system', 
-        'content': SYSTEM_PROMPT
-    }]
+    # Keeps the last --max_attached_imgs observations in full and summarizes older ones
+    conversation = Conversation(SYSTEM_PROMPT_TEXT_ONLY if args.text_only else SYSTEM_PROMPT,
+                                max_observations=args.max_attached_imgs)
     
     init_msg = f"Task: Find {position} job postings on this careers page. Navigate the page and use extractjobinfo when you find the job listings."
+    image_bytes_sent = 0
+    image_seconds = 0.0
+    image_count = 0
+    # Change detection: the last observation, the action taken on it, and what it saved
+    previous_observation = None
+    last_action = None
+    observations_skipped = 0
+    calls_avoided = 0
+    # Known ATS board pages already parsed directly
+    board_urls_tried = set()
 
     for iteration in range(args.max_iter):
         logging.info(f'Iteration: {iteration}')
 
+        if usage_tracker and usage_tracker.over_budget(company['id']):
+            logging.warning(f"Token budget of {args.company_token_budget} reached for {company['web_name']}, stopping")
+            break
+
+        current_url = driver.current_url
+        if current_url not in board_urls_tried and find_extractor(current_url):
+            # A known ATS board: parse it directly instead of navigating with the model
+            board_urls_tried.add(current_url)
+            logging.info(f"Known job board at {current_url}, extracting without the model")
+            jobs = extract_and_store_job_info(driver, task_dir, api, company['id'], position, company['web_name'])
+            if jobs is not None:
+                return jobs
+
         try:
             # Get interactive elements
-            rects, web_eles, web_eles_text = get_web_element_rect(driver, fix_color=args.fix_box_color)
+            web_eles, web_eles_text = get_interactive_elements(driver, args)
             if not web_eles:
                 logging.warning("No interactive elements found on page")
                 break
 
-            # Take screenshot
-            img_path = os.path.join(task_dir, f'screenshot{iteration}.png')
-            driver.save_screenshot(img_path)
-            
-            # Upload to S3
-            s3_client = boto3.client('s3', region_name=REGION_NAME)
-            url = upload_image_and_get_presigned_url(img_path, s3_client, expiration=300)
-            
-            # Format message for AI
-            curr_msg = format_msg(
-                iteration=iteration,
-                init_msg=init_msg,
-                url=url,
-                web_eles_text=web_eles_text,
-                position=position
-            )
-            messages.append(curr_msg)
+            url_future = None
+            if args.text_only:
+                observation = web_eles_text
+            else:
+                image_start = time.monotonic()
+                png_bytes = driver.get_screenshot_as_png()
+                observation = png_bytes
+                # Start sending right away; with S3 transport the upload runs in the
+                # background during change detection and while the message is built
+                url_future, bytes_sent = send_screenshot(png_bytes, uploader, task_dir, iteration, args)
+            unchanged = last_action is not None and observation_unchanged(previous_observation, observation)
+            previous_observation = observation
+            unchanged_action, last_action = last_action, None
+
+            if unchanged:
+                if url_future is not None:
+                    # The screenshot is not sent; drop the upload if it has not started
+                    url_future.cancel()
+                action_key, info = unchanged_action
+                observations_skipped += 1
+                if action_key == 'scroll' and info.get('content') == 'down':
+                    # Scrolling down no longer moves the page, so the rest of the
+                    # listing is in view: extract without asking the model
+                    logging.info(f"Page unchanged after scrolling down for {company['web_name']}, extracting")
+                    jobs = extract_and_store_job_info(driver, task_dir, api, company['id'], position, company['web_name'])
+                    if jobs is not None:
+                        calls_avoided += 1
+                        logging.info(
+                            f"Change detection for {company['web_name']}: {calls_avoided} model calls avoided, "
+                            f"{observations_skipped} observations skipped"
+                        )
+                        return jobs
+                else:
+                    logging.info(
+                        f"Page unchanged after {action_key} for {company['web_name']}, sending no-change "
+                        f"feedback instead of a new observation ({calls_avoided} model calls avoided, "
+                        f"{observations_skipped} observations skipped)"
+                    )
+                conversation.add(format_no_change_msg(action_key, text_only=args.text_only))
+            elif args.text_only:
+                # The accessibility tree is the whole observation: no screenshot,
+                # upload or image tokens
+                conversation.add_observation(format_msg(
+                    iteration=iteration,
+                    init_msg=init_msg,
+                    url=None,
+                    web_eles_text=web_eles_text,
+                    position=position,
+                    text_only=True
+                ), summarize_observation(iteration, driver, web_eles, text_only=True))
+            else:
+                summary = summarize_observation(iteration, driver, web_eles)
+
+                # Format message for AI; only now wait for the screenshot URL
+                curr_msg = format_msg(
+                    iteration=iteration,
+                    init_msg=init_msg,
+                    url=url_future.result(),
+                    web_eles_text=web_eles_text,
+                    position=position
+                )
+                conversation.add_observation(curr_msg, summary)
+
+                # Report the cost of this screenshot and the running average for the company
+                image_elapsed = time.monotonic() - image_start
+                image_bytes_sent += bytes_sent
+                image_seconds += image_elapsed
+                image_count += 1
+                logging.info(
+                    f"Screenshot [{args.image_transport}] for {company['web_name']}: {bytes_sent} bytes, "
+                    f"{image_elapsed:.2f}s (total {image_bytes_sent} bytes, "
+                    f"{image_seconds / image_count:.2f}s per iteration)"
+                )
 
             # Get AI response
             logging.info('Calling OpenAI API...')
-            gpt_call_error, openai_response = call_gpt4v_api(args, api, messages)
+            gpt_call_error, openai_response = call_gpt4v_api(args, api, conversation.messages)
             
             if gpt_call_error:
                 logging.error("API call failed")
                 break
 
+            usage = getattr(openai_response, 'usage', None)
+            logging.info(
+                f"Prompt for {company['web_name']}: ~{conversation.prompt_tokens} tokens estimated"
+                + (f", {usage.prompt_tokens} billed" if usage else "")
+                + f" over {len(conversation.messages)} messages"
+            )
+
             response_text = openai_response.choices[0].message.content
             logging.info(f"AI Response: {response_text}")
-            messages.append({'role': 'assistant', 'content': response_text})
+            conversation.add({'role': 'assistant', 'content': response_text})
 
             # Extract and execute action
             if "Action:" not in response_text:
                 logging.error("No action found in response")
                 continue
 
-            action_key, info = extract_information(response_text)
-            logging.info(f"Action: {action_key}, Info: {info}")
+            plan = extract_action_plan(response_text)
+            logging.info(f"Action plan: {plan}")
 
-            if not action_key:
+            if not plan:
                 # Add correction message
                 correction_msg = {
                     "role": "assistant",
@@ -790,39 +1166,30 @@ def navigate_and_scrape(driver, api, company, position, task_dir, args):
 
             Please try again with the correct format."""
                 }
-                messages.append(correction_msg)
-                continue
-
-            if action_key == 'extractjobinfo':
-                jobs = extract_and_store_job_info(driver, task_dir, api, company['id'], position)
-                if jobs:
-                    return jobs
+                conversation.add(correction_msg)
+                record_retry("navigate")
                 continue
 
-            # Execute navigation action
-            try:
-                if action_key == 'click' and info and 'number' in info:
-                    if 0 <= info['number'] < len(web_eles):
-                        exec_action_click(info, web_eles, driver)
-                    else:
-                        logging.error(f"Invalid element number: {info['number']}")
-                elif action_key == 'type' and info:
-                    exec_action_type(info, web_eles, driver)
-                elif action_key == 'scroll':
-                    exec_action_scroll(info, web_eles, driver, args)
-                elif action_key == 'wait':
-                    time.sleep(3)
-                elif action_key == 'goback':
-                    driver.back()
-                    time.sleep(2)
-                else:
-                    logging.warning(f"Unknown action: {action_key}")
-                    continue
-
-                time.sleep(2)  # Wait after each action
-            except Exception as e:
-                logging.error(f"Error executing action: {e}")
-                continue
+            # Run the plan in order; later steps only while the page is still the
+            # one the plan was made for, otherwise re-observe
+            plan_url = driver.current_url
+            plan_windows = driver.window_handles
+            for step, (action_key, info) in enumerate(plan):
+                if step > 0 and plan_diverged(driver, plan_url, plan_windows, action_key, info, web_eles):
+                    logging.info(f"Page changed after step {step} of {len(plan)}, re-observing instead of {action_key}")
+                    break
+
+                if action_key == 'extractjobinfo':
+                    jobs = extract_and_store_job_info(driver, task_dir, api, company['id'], position, company['web_name'])
+                    if jobs is not None:
+                        return jobs
+                    break
+
+                if not exec_action(action_key, info, web_eles, driver, args):
+                    break
+                last_action = (action_key, info or {})
+                if step > 0:
+                    logging.info(f"Executed step {step + 1} of {len(plan)} without a new observation")
 
         except Exception as e:
             logging.error(f'Error during iteration {iteration}: {e}')
@@ -848,7 +1215,14 @@ def driver_config(args):
     )
     return options
 
-def process_company(company, api, args, result_dir):
+def create_driver(args):
+    """Launch a Chrome driver configured from the command line arguments."""
+    options = driver_config(args)
+    driver = webdriver.Chrome(options=options)
+    driver.set_window_size(args.window_width, args.window_height)
+    return driver
+
+def process_company(company, pool, uploader, detail_fetcher, api, args, result_dir):
     company_id = company['id']
     task_dir = os.path.join(result_dir, f"task_{company_id}")
     os.makedirs(task_dir, exist_ok=True)
@@ -861,12 +1235,21 @@ def process_company(company, api, args, result_dir):
         "status": "searching"
     }), flush=True)
     
-    options = driver_config(args)
-    driver = webdriver.Chrome(options=options)
-    driver.set_window_size(args.window_width, args.window_height)
-    
     try:
-        job_results = navigate_and_scrape(driver, api, company, args.position, task_dir, args)
+        # Boards with a public job feed are read over HTTP, without a browser
+        job_results = None
+        if not args.skip_ats_feeds:
+            with usage_scope(company_id=company_id):
+                job_results = fetch_feed_jobs(api, company['web'], args.position, company['web_name'])
+            if job_results:
+                save_job_results(task_dir, job_results)
+        if job_results is None:
+            with usage_scope(company_id=company_id), pool.lease() as driver:
+                job_results = navigate_and_scrape(driver, api, uploader, company, args.position, task_dir, args)
+        if job_results and detail_fetcher:
+            report_progress(company_id, "fetching_job_details")
+            detail_fetcher.enrich(job_results, pool=pool, settle_timeout=args.settle_timeout)
+            save_job_results(task_dir, job_results)
         if job_results and len(job_results) > 0:
             report_progress(company_id, "completed", job_results)
             return company_id, job_results
@@ -897,14 +1280,53 @@ def process_company(company, api, args, result_dir):
         }]
         report_progress(company_id, "error", error_result)
         return company_id, error_result
-    finally:
-        driver.quit()
+
+async def announce_companies(company_stream, raw_companies):
+    """Send a companies_list delta for each streamed company and pass it on."""
+    async for company in company_stream:
+        raw_companies.append(company)
+        print(json.dumps({
+            "type": "companies_list",
+            "delta": True,
+            "companies": [company_summary(company)]
+        }), flush=True)
+        yield company
+
+async def scrape_companies(raw_companies, api, args, result_dir):
+    """Scrape every company with pooled browsers and return jobs keyed by company id.
+
+    `raw_companies` is a list, or an async iterable of companies still arriving.
+    """
+    jobs = {}
+    if hasattr(raw_companies, '__aiter__'):
+        max_browsers = max(1, args.max_browsers)
+    else:
+        max_browsers = max(1, min(args.max_browsers, len(raw_companies)))
+    with BrowserPool(lambda: create_driver(args), size=max_browsers,
+                     max_tasks=args.browser_recycle_after) as pool, \
+            (ScreenshotUploader(BUCKET_NAME, REGION_NAME, max_workers=args.max_s3_uploads)
+             if args.image_transport == 's3' and not args.text_only else nullcontext()) as uploader, \
+            (JobDetailFetcher(max_workers=args.max_detail_requests)
+             if not args.skip_job_details else nullcontext()) as detail_fetcher:
+
+        def process(company):
+            return process_company(company, pool, uploader, detail_fetcher, api, args, result_dir)
+
+        # Collect results as they complete; each company starts scraping as
+        # soon as its own careers URL is resolved
+        async for company_id, job_results in run_companies(raw_companies, process, max_browsers,
+                                                           resolve=resolve_careers_url,
+                                                           max_resolvers=args.max_google_requests):
+            if job_results:
+                jobs[company_id] = job_results
+
+    return jobs
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--output_dir", type=str, default='results')
     parser.add_argument("--download_dir", type=str, default="downloads")
-    parser.add_argument("--text_only", action='store_true')
+    parser.add_argument("--text_only", action='store_true', help='Observe pages through their accessibility tree instead of screenshots')
     parser.add_argument('--position', type=str, required=True, help='Job position to search for')
     parser.add_argument('--location', type=str, required=True, help='Location to search in')
     parser.add_argument('--industry', type=str, required=True, help='Industry to search in')
@@ -915,7 +1337,7 @@ def main():
     parser.add_argument('--ignore_searched', type=str, default='0', help='Whether to ignore previously searched positions (1 or 0)')
     parser.add_argument('--max_iter', type=int, default=10)
     parser.add_argument('--api_key', type=str, default=openai_api_key)
-    parser.add_argument('--max_attached_imgs', type=int, default=3)
+    parser.add_argument('--max_attached_imgs', type=int, default=3, help='Observations kept in full in the prompt; older ones are summarized')
     parser.add_argument('--temperature', type=float, default=0.2)
     parser.add_argument('--fix_box_color', action='store_true', default=True)
     parser.add_argument('--api_model', type=str, default='gpt-4o-mini')
@@ -923,6 +1345,22 @@ def main():
     parser.add_argument("--headless", action='store_true', help='Run browser in headless mode')
     parser.add_argument("--window_width", type=int, default=1224)
     parser.add_argument("--window_height", type=int, default=968)
+    parser.add_argument('--stream_companies', action='store_true', help='Start scraping each company as soon as the model streams it')
+    parser.add_argument('--max_browsers', type=int, default=4, help='Number of warm browsers kept in the pool')
+    parser.add_argument('--max_openai_requests', type=int, default=4, help='Maximum concurrent OpenAI requests')
+    parser.add_argument('--company_token_budget', type=int, default=0, help='Stop navigating a company once it has used this many model tokens (0 for no limit)')
+    parser.add_argument('--max_google_requests', type=int, default=2, help='Maximum concurrent Google Custom Search requests')
+    parser.add_argument('--google_requests_per_minute', type=int, default=90, help='Custom Search rate limit, kept under the API quota')
+    parser.add_argument('--careers_cache', type=str, default=os.path.join(os.path.expanduser('~'), '.cache', 'jobscraiper', 'careers_urls.sqlite3'), help='SQLite file caching careers URLs ("" to disable)')
+    parser.add_argument('--careers_cache_ttl_days', type=float, default=30, help='Days before a cached careers URL is searched again')
+    parser.add_argument('--max_s3_uploads', type=int, default=4, help='Maximum concurrent S3 screenshot uploads')
+    parser.add_argument('--image_transport', choices=['s3', 'inline'], default='s3', help='Send screenshots as S3 pre-signed URLs or inline data URLs')
+    parser.add_argument('--settle_timeout', type=float, default=DEFAULT_SETTLE_TIMEOUT, help='Maximum seconds to wait for a page to settle after an action')
+    parser.add_argument('--ax_tree_token_budget', type=int, default=3000, help='Approximate token cap on the accessibility tree sent in text-only mode')
+    parser.add_argument('--skip_ats_feeds', action='store_true', help='Always use the browser, even for job boards with a public JSON feed')
+    parser.add_argument('--skip_job_details', action='store_true', help='Do not fetch each application page for "Additional Details"')
+    parser.add_argument('--max_detail_requests', type=int, default=8, help='Maximum concurrent application page requests')
+    parser.add_argument('--browser_recycle_after', type=int, default=10, help='Restart a pooled browser after this many companies')
     
     # Add API key arguments
     parser.add_argument('--openai_api_key', type=str, required=True, help='OpenAI API key')
@@ -935,65 +1373,71 @@ def main():
     args.ignore_searched = args.ignore_searched == '1'
 
     # Use provided API keys
-    api = OpenAI(api_key=args.openai_api_key)
+    global usage_tracker
+    usage_tracker = UsageTracker(company_token_budget=args.company_token_budget)
+    api = LimitedOpenAI(OpenAI(api_key=args.openai_api_key), args.max_openai_requests, tracker=usage_tracker)
     
-    # Store Google keys for use in functions
-    global google_api_key, google_cse_id
+    # Store Google keys and search limits for use in functions
+    global google_api_key, google_cse_id, careers_cache
     google_api_key = args.google_api_key
     google_cse_id = args.google_cse_id
+    configure_google_search(args.max_google_requests, args.google_requests_per_minute)
+    configure_feed_session(args.max_browsers)
+    if args.careers_cache:
+        try:
+            careers_cache = CareersUrlCache(args.careers_cache, ttl_days=args.careers_cache_ttl_days)
+        except (OSError, sqlite3.Error) as e:
+            logging.warning(f"Careers URL cache disabled, could not open {args.careers_cache}: {e}")
 
-    try:
-        # Search for companies
-        raw_companies = search_companies(api, args.position, args.industry, args.location, 
-                                      args.whitelist, args.blacklist, args.company_size, args.num_results)
-
-        # Format and send initial companies list
-        companies = [{
-            "id": company['id'],
-            "name": company['web_name'],
-            "web": company['web'],
-            "status": "pending"
-        } for company in raw_companies]
-
-        print(json.dumps({
-            "type": "companies_list",
-            "companies": companies
-        }), flush=True)
+    global run_started_at
+    run_started_at = time.monotonic()
 
+    try:
         # Set up result directory
         current_time = time.strftime("%Y%m%d_%H_%M_%S", time.localtime())
         result_dir = os.path.join(args.output_dir, current_time)
         os.makedirs(result_dir, exist_ok=True)
 
-        jobs = {}
-        
-        # Process companies in parallel
-        max_workers = min(4, len(raw_companies))  # Limit max parallel processes
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all companies for processing
-            future_to_company = {
-                executor.submit(
-                    process_company, 
-                    company, 
-                    api, 
-                    args, 
-                    result_dir
-                ): company for company in raw_companies
-            }
+        if args.stream_companies:
+            # Announce and start scraping each company as the model streams it
+            raw_companies = []
+            company_stream = announce_companies(
+                iterate_in_thread(stream_companies(api, args.position, args.industry, args.location,
+                                                   args.whitelist, args.blacklist, args.company_size,
+                                                   args.num_results)),
+                raw_companies
+            )
+            jobs = asyncio.run(scrape_companies(company_stream, api, args, result_dir))
+        else:
+            # Search for companies
+            raw_companies = search_companies(api, args.position, args.industry, args.location, 
+                                          args.whitelist, args.blacklist, args.company_size, args.num_results,
+                                          resolve_urls=False)
+
+            # Format and send initial companies list
+            print(json.dumps({
+                "type": "companies_list",
+                "companies": [company_summary(company) for company in raw_companies]
+            }), flush=True)
+
+            # Process companies concurrently, bounded per resource
+            jobs = asyncio.run(scrape_companies(raw_companies, api, args, result_dir))
 
-            # Collect results as they complete
-            for future in concurrent.futures.as_completed(future_to_company):
-                company_id, job_results = future.result()
-                if job_results:
-                    jobs[company_id] = job_results
+        # Careers URLs were resolved while scraping
+        companies = [company_summary(company) for company in raw_companies]
 
         # Print final result
         final_result = {
             "type": "final_result",
             "companies": companies,
-            "jobs": jobs
+            "jobs": jobs,
+            "usage": usage_tracker.summary()
         }
         print(json.dumps(final_result))
+        log_settle_summary()
+        usage_tracker.log_summary()
+        if careers_cache:
+            careers_cache.log_stats()
 
     except Exception as e:
         logging.error(f"Error in main process: {str(e)}")
@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class LimitedCompletions:
+    """`chat.completions` proxy that holds a semaphore slot for each request.
+
+    If given a UsageTracker, records tokens, latency and failures of every call.
+    """
+
+    def __init__(self, completions, semaphore, tracker=None):
+        self._completions = completions
+        self._semaphore = semaphore
+        self._tracker = tracker
+
+    def create(self, **kwargs):
+        if kwargs.get("stream"):
+            # The generator body runs later, possibly in another context
+            return self._stream(kwargs, self._tracker.scope() if self._tracker else None)
+        with self._semaphore:
+            start = time.monotonic()
+            try:
+                response = self._completions.create(**kwargs)
+            except Exception:
+                self._record(0, 0, start, error=True)
+                raise
+            usage = getattr(response, "usage", None)
+            if usage:
+                self._record(usage.prompt_tokens, usage.completion_tokens, start)
+            else:
+                self._record(0, 0, start)
+            return response
+
+    def _stream(self, kwargs, scope):
+        # Hold the slot until the stream has been consumed or closed
+        with self._semaphore:
+            start = time.monotonic()
+            content_chunks = 0
+            error = False
+            stream = None
+            try:
+                stream = self._completions.create(**kwargs)
+                for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        content_chunks += 1
+                    yield chunk
+            except Exception:
+                error = True
+                raise
+            finally:
+                # Also runs when the caller stops reading early and closes the
+                # generator. Streams carry no usage with this client version:
+                # estimate the prompt and count one token per content chunk
+                if stream is not None:
+                    _close_stream(stream)
+                self._record(_estimate_prompt_tokens(kwargs), content_chunks, start, error=error, scope=scope)
+
+    def _record(self, prompt_tokens, completion_tokens, start, error=False, scope=None):
+        if self._tracker:
+            self._tracker.record(prompt_tokens, completion_tokens, time.monotonic() - start,
+                                 error=error, scope=scope)
+
+
+def _close_stream(stream):
+    """Release the connection of a stream that may not have been read to the end."""
+    close = getattr(stream, "close", None) or getattr(getattr(stream, "response", None), "close", None)
+    if close:
+        close()
+
+
+def _estimate_prompt_tokens(kwargs):
+    characters = sum(len(message["content"]) for message in kwargs.get("messages", [])
+                     if isinstance(message["content"], str))
+    return characters // 4
+
+
+class LimitedChat:
+    def __init__(self, chat, semaphore, tracker=None):
+        self.completions = LimitedCompletions(chat.completions, semaphore, tracker)
+
+
+class LimitedOpenAI:
+    """OpenAI client wrapper capping concurrent chat completions across all workers.
+
+    Everything except `chat.completions.create` is passed through untouched.
+    """
+
+    def __init__(self, api, max_requests, tracker=None):
+        self._api = api
+        self.chat = LimitedChat(api.chat, threading.BoundedSemaphore(max(1, max_requests)), tracker)
+
+    def __getattr__(self, name):
+        return getattr(self._api, name)
+
+
+class RateLimiter:
+    """Space out request starts so at most `per_minute` begin in any minute."""
+
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        with self._lock:
+            slot = max(time.monotonic(), self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+async def iterate_in_thread(iterable):
+    """Consume a blocking iterable in a background thread, yielding items as they arrive."""
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    finished = object()
+
+    def pump():
+        try:
+            for item in iterable:
+                loop.call_soon_threadsafe(queue.put_nowait, (item, None))
+            loop.call_soon_threadsafe(queue.put_nowait, (finished, None))
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, (finished, e))
+
+    threading.Thread(target=pump, name="stream-reader", daemon=True).start()
+    while True:
+        item, error = await queue.get()
+        if item is finished:
+            if error:
+                raise error
+            return
+        yield item
+
+
+async def run_companies(companies, process, max_browsers, resolve=None, max_resolvers=0):
+    """Run `process(company)` in worker threads, at most `max_browsers` at a time.
+
+    Blocking browser work runs through `asyncio.to_thread`; model, search and
+    upload calls inside it are bounded by their own limits, so the number of
+    browsers is not tied to how many of those calls may be in flight.
+    If given, `resolve(company)` runs first for every company concurrently
+    (e.g. to look up its careers URL), and each company is handed to a
+    browser as soon as its own lookup finishes. If the lookup fails, the
+    company is processed as it was given.
+    `companies` may be an async iterable, in which case each company starts
+    as soon as it arrives.
+    Yields each result as soon as its company finishes.
+    """
+    max_browsers = max(1, max_browsers)
+    max_resolvers = max(1, max_resolvers) if resolve else 0
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=max_browsers + max_resolvers,
+                                                 thread_name_prefix="company"))
+    browsers = asyncio.Semaphore(max_browsers)
+    resolvers = asyncio.Semaphore(max_resolvers) if resolve else None
+
+    async def run_one(company):
+        if resolve:
+            async with resolvers:
+                try:
+                    company = await asyncio.to_thread(resolve, company)
+                except Exception as e:
+                    logging.error(f"Could not resolve {company.get('web_name', company)}, processing it unresolved: {e}")
+        async with browsers:
+            return await asyncio.to_thread(process, company)
+
+    if hasattr(companies, "__aiter__"):
+        tasks = []
+        async for company in companies:
+            tasks.append(asyncio.create_task(run_one(company)))
+    else:
+        tasks = [asyncio.create_task(run_one(company)) for company in companies]
+
+    for next_done in asyncio.as_completed(tasks):
+        yield await next_done
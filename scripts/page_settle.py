@@ -0,0 +1,247 @@
+import logging
+import threading
+import time
+import weakref
+
+
+# Records when each in-flight fetch/XHR request started and the last DOM
+# mutation so Python can tell when the page has gone quiet. Safe to inject
+# repeatedly.
+ACTIVITY_TRACKER_JS = """
+(function() {
+    if (window.__pageActivity) { return; }
+    const activity = window.__pageActivity = {requests: new Map(), nextRequest: 0, lastChange: Date.now()};
+    const touch = () => { activity.lastChange = Date.now(); };
+    const started = () => {
+        const id = activity.nextRequest++;
+        activity.requests.set(id, Date.now());
+        touch();
+        return id;
+    };
+    const ended = (id) => {
+        activity.requests.delete(id);
+        touch();
+    };
+
+    if (window.fetch) {
+        const originalFetch = window.fetch;
+        window.fetch = function() {
+            const id = started();
+            return originalFetch.apply(this, arguments).finally(() => ended(id));
+        };
+    }
+
+    const originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        const id = started();
+        this.addEventListener('loadend', () => ended(id), {once: true});
+        return originalSend.apply(this, arguments);
+    };
+
+    const observe = () => {
+        new MutationObserver(touch).observe(document.documentElement, {
+            childList: true, subtree: true, attributes: true, characterData: true
+        });
+    };
+    if (document.documentElement) { observe(); }
+    else { document.addEventListener('DOMContentLoaded', observe, {once: true}); }
+})();
+"""
+
+# Requests in flight for longer than arguments[0] ms (long polls, streams)
+# are not counted as pending
+PAGE_STATE_JS = """
+const activity = window.__pageActivity;
+const now = Date.now();
+let pending = 0;
+if (activity) {
+    activity.requests.forEach((start) => { if (now - start < arguments[0]) { pending += 1; } });
+}
+return {
+    readyState: document.readyState,
+    pending: pending,
+    quietMs: activity ? now - activity.lastChange : null,
+    url: window.location.href
+};
+"""
+
+# Scrolls (the window, or arguments[0] into view) and resolves once the scroll
+# has ended: on the scrollend event, or when the position stops changing.
+SCROLL_AND_WAIT_JS = """
+const element = arguments[0];
+const deltaY = arguments[1];
+const timeoutMs = arguments[2];
+const done = arguments[arguments.length - 1];
+let finished = false;
+let lastY = null;
+let stablePolls = 0;
+let poll = null;
+
+const finish = () => {
+    if (finished) { return; }
+    finished = true;
+    clearInterval(poll);
+    done(window.pageYOffset);
+};
+window.addEventListener('scrollend', finish, {once: true, capture: true});
+poll = setInterval(() => {
+    const y = window.pageYOffset + (element ? element.getBoundingClientRect().top : 0);
+    stablePolls = (y === lastY) ? stablePolls + 1 : 0;
+    lastY = y;
+    if (stablePolls >= 2) { finish(); }
+}, 50);
+setTimeout(finish, timeoutMs);
+
+if (element) {
+    element.scrollIntoView({behavior: 'smooth', block: 'center', inline: 'center'});
+} else {
+    window.scrollBy({top: deltaY, behavior: 'smooth'});
+}
+"""
+
+DEFAULT_SETTLE_TIMEOUT = 5  # Ceiling in seconds for any single wait, near the fixed sleeps it replaces
+QUIET_MS = 500  # No network or DOM activity for this long counts as settled
+STALE_REQUEST_MS = 3000  # Requests in flight longer than this (long polls, chat widgets) are ignored
+BUSY_PAGE_GRACE = 2  # Seconds after which a loaded page settles even if its DOM keeps changing (carousels)
+POLL_INTERVAL = 0.1
+ACTION_GRACE = 0.3  # Give page scripts time to react to an input before trusting quiet
+
+_timings_lock = threading.Lock()
+_timings = {}
+_tracked_drivers = weakref.WeakSet()  # Drivers whose new documents already get the tracker
+
+
+def install_activity_tracker(driver):
+    """Inject the activity tracker into the current and all future documents.
+
+    The new-document script is registered once per driver, so pooled drivers
+    do not pile up registrations across leases.
+    """
+    with _timings_lock:
+        registered = driver in _tracked_drivers
+        _tracked_drivers.add(driver)
+    if not registered:
+        try:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": ACTIVITY_TRACKER_JS})
+        except Exception as e:
+            logging.debug(f"Could not register activity tracker for new documents: {e}")
+    _inject_tracker(driver)
+
+
+def _inject_tracker(driver):
+    try:
+        driver.execute_script(ACTIVITY_TRACKER_JS)
+    except Exception as e:
+        logging.debug(f"Could not inject activity tracker: {e}")
+
+
+def _page_state(driver):
+    try:
+        return driver.execute_script(PAGE_STATE_JS, STALE_REQUEST_MS)
+    except Exception:
+        # Mid-navigation the document can disappear under the script
+        return None
+
+
+def _is_settled(state, waited):
+    """True once the page is loaded with no fresh requests, and its DOM is quiet or has had BUSY_PAGE_GRACE."""
+    if not state or state["readyState"] != "complete" or state["pending"] > 0:
+        return False
+    if waited >= BUSY_PAGE_GRACE:
+        return True
+    return state["quietMs"] is not None and state["quietMs"] >= QUIET_MS
+
+
+def _wait_until_settled(driver, start, deadline, not_before=0):
+    while time.monotonic() < deadline:
+        state = _page_state(driver)
+        now = time.monotonic()
+        if state and state["quietMs"] is None and state["readyState"] != "loading":
+            # New document without the tracker (e.g. a freshly opened window)
+            _inject_tracker(driver)
+        elif _is_settled(state, now - start) and now >= not_before:
+            return
+        time.sleep(POLL_INTERVAL)
+
+
+def wait_for_page_settle(driver, action, timeout=DEFAULT_SETTLE_TIMEOUT, fixed_sleep=None, min_wait=0):
+    """Wait until the document is loaded and network/DOM activity has gone quiet.
+
+    Returns the seconds spent waiting; never waits longer than `timeout`.
+    """
+    start = time.monotonic()
+    _wait_until_settled(driver, start, start + timeout, not_before=start + min_wait)
+    return record_settle(action, time.monotonic() - start, timeout, fixed_sleep)
+
+
+def wait_for_click_effect(driver, before_url, before_handles, timeout=DEFAULT_SETTLE_TIMEOUT, action="click",
+                          fixed_sleep=None):
+    """Wait for a click (or Enter key) to navigate, open a window, or otherwise let the page settle.
+
+    Returns the handle of a newly opened window, or None.
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+    new_window = None
+    while time.monotonic() < deadline:
+        handles = driver.window_handles
+        opened = [handle for handle in handles if handle not in before_handles]
+        if opened:
+            new_window = opened[0]
+            break
+        state = _page_state(driver)
+        if state and state["url"] != before_url:
+            break
+        waited = time.monotonic() - start
+        if _is_settled(state, waited) and waited >= ACTION_GRACE:
+            break
+        time.sleep(POLL_INTERVAL)
+
+    if new_window:
+        driver.switch_to.window(new_window)
+        logging.info("Switched to new window")
+
+    _wait_until_settled(driver, start, deadline, not_before=start + ACTION_GRACE)
+    record_settle(action, time.monotonic() - start, timeout, fixed_sleep)
+    return new_window
+
+
+def scroll_and_wait(driver, element=None, delta_y=0, timeout=DEFAULT_SETTLE_TIMEOUT, action="scroll", fixed_sleep=None):
+    """Scroll the window by `delta_y`, or `element` into view, and wait for the scroll to end."""
+    start = time.monotonic()
+    try:
+        driver.execute_async_script(SCROLL_AND_WAIT_JS, element, delta_y, int(timeout * 1000))
+    except Exception as e:
+        logging.debug(f"Scroll wait fell back to timeout: {e}")
+    return record_settle(action, time.monotonic() - start, timeout, fixed_sleep)
+
+
+def record_settle(action, elapsed, timeout, fixed_sleep=None):
+    """Log and accumulate how long an action took to settle."""
+    with _timings_lock:
+        entry = _timings.setdefault(action, {"count": 0, "settle": 0.0, "fixed": 0.0})
+        entry["count"] += 1
+        entry["settle"] += elapsed
+        entry["fixed"] += fixed_sleep or 0.0
+
+    message = f"Settle [{action}]: {elapsed:.2f}s"
+    if fixed_sleep:
+        message += f" (fixed sleep was {fixed_sleep:.1f}s)"
+    if elapsed >= timeout:
+        message += f" - hit {timeout:.1f}s ceiling"
+    logging.info(message)
+    return elapsed
+
+
+def log_settle_summary():
+    """Log per-action settle totals for the whole run."""
+    with _timings_lock:
+        timings = {action: dict(entry) for action, entry in _timings.items()}
+    total_settle = sum(entry["settle"] for entry in timings.values())
+    total_fixed = sum(entry["fixed"] for entry in timings.values())
+    for action, entry in sorted(timings.items()):
+        logging.info(
+            f"Settle summary [{action}]: {entry['count']} waits, {entry['settle']:.1f}s total"
+            f" vs {entry['fixed']:.1f}s of fixed sleeps"
+        )
+    logging.info(f"Settle summary: {total_settle:.1f}s spent waiting, {total_fixed - total_settle:.1f}s saved")
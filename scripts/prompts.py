@@ -37,6 +37,7 @@ Action Format:
 **Format:**
 Thought: {Your brief thoughts based on the Observation}
 Action: {One Action in the specified format}
+Action: {Optional follow-up Actions, one per line, for steps that need no new Observation, e.g. Click the search button after Type. They run in order and stop if the page changes.}
 
 The User will provide:
 Observation: {A labeled screenshot Given by User}
@@ -56,6 +57,12 @@ Thought: The screenshot illustrates a search box where a keyword can be entered
 Action: Type [10]; [Example position]  
 Action: Click [12]"""
 
+# Same instructions for text-only runs, where the page is described by its accessibility tree
+SYSTEM_PROMPT_TEXT_ONLY = SYSTEM_PROMPT.replace(
+    "Observation: {A labeled screenshot Given by User}",
+    "Observation: {The accessibility tree of the visible page Given by User; the number in brackets at the start of each line is the Numerical_Label}"
+).replace("The screenshot", "The accessibility tree")
+
 
 # Prompt for company search
 COMPANY_SEARCH_PROMPT = """Generate a list of {num_results} companies in the {industry} industry located in {location} that are hiring for {position} positions.
@@ -71,6 +78,10 @@ Only output the JSON array. Do not include any additional text or code block for
 Ensure the JSON is properly formatted with double quotes and no trailing commas.
 It is crucial that you provide exactly {num_results} companies, no more and no less."""
 
+# Appended to COMPANY_SEARCH_PROMPT when topping up a short company list
+COMPANY_EXCLUSION_PROMPT = """
+These companies have already been found. Do not include any of them: {excluded}."""
+
 # Prompt for navigating job search pages
 JOB_SEARCH_PROMPT = """Navigate this job search or careers page to find {position} positions.
 
@@ -120,4 +131,11 @@ Return ONLY a JSON array of job objects. Format:
 
 Do not include any text before or after the JSON array.
 Only include jobs that match the position criteria.
-If a field is not found, use "N/A" for strings and [] for arrays."""
\ No newline at end of file
+If a field is not found, use "N/A" for strings and [] for arrays."""
+# Prompt for picking the relevant listings of a job board by title
+LISTING_SELECTION_PROMPT = """These are the job titles listed on a company's job board, one per line with its number.
+Which of them are {position} positions, or closely related ones a {position} candidate would apply to?
+
+{titles}
+
+Return ONLY a JSON array of the matching numbers, e.g. [0, 4, 7], or [] if none match."""
@@ -0,0 +1,63 @@
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from botocore.config import Config
+
+
+class ScreenshotUploader:
+    """Upload screenshots to S3 in the background through one shared client.
+
+    boto3 clients are thread-safe, so a single client (with a connection pool
+    sized to the number of workers) serves every company in the process.
+    `submit()` returns a future resolving to the pre-signed URL, or None if
+    the upload failed. Pass `endpoint_url` (or set S3_ENDPOINT_URL) to target
+    a local S3 stand-in such as MinIO or moto's server mode.
+    """
+
+    def __init__(self, bucket_name, region_name, max_workers=4, expiration=300,
+                 endpoint_url=None, client=None):
+        self.bucket_name = bucket_name
+        self.expiration = expiration
+        if client is None:
+            client = boto3.client(
+                's3',
+                region_name=region_name,
+                endpoint_url=endpoint_url or os.getenv('S3_ENDPOINT_URL'),
+                config=Config(max_pool_connections=max(10, max_workers * 2))
+            )
+        self.client = client
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="s3-upload")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def submit(self, image_path):
+        """Queue an upload and return a future for its pre-signed URL."""
+        return self._executor.submit(self.upload, image_path)
+
+    def upload(self, image_path):
+        """Upload an image to S3 and return a pre-signed URL."""
+        try:
+            file_name = os.path.basename(image_path)
+            object_name = f"temp_images/{uuid.uuid4().hex}_{file_name}"
+            self.client.upload_file(image_path, self.bucket_name, object_name)
+
+            url = self.client.generate_presigned_url('get_object',
+                                                     Params={'Bucket': self.bucket_name,
+                                                             'Key': object_name},
+                                                     ExpiresIn=self.expiration)
+            logging.info(f"Pre-signed URL: {url}")
+            return url
+        except Exception as e:
+            logging.error(f"Error uploading image to S3: {e}")
+            return None
+
+    def close(self):
+        """Wait for queued uploads to finish and stop the upload threads."""
+        self._executor.shutdown(wait=True)
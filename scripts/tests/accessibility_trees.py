@@ -0,0 +1,150 @@
+"""Synthetic accessibility trees and a stub CDP browser for the tree tests and benchmarks."""
+import json
+import random
+
+
+VIEWPORT = {
+    "win_top_bound": 0.0,
+    "win_left_bound": 0.0,
+    "win_width": 1224,
+    "win_height": 968,
+    "win_right_bound": 1224.0,
+    "win_lower_bound": 968.0,
+    "device_pixel_ratio": 1.0,
+}
+
+ROLES = ["generic", "link", "StaticText", "StaticText", "listitem", "heading", "list", "img", "button", "paragraph"]
+NAMES = ["", "  ", "Apply", "Senior Engineer", "Engineer", "Remote", "it's", "a\nb", "StaticText", "Jobs"]
+PROPERTIES = ["focusable", "url", "level", "expanded", "readonly"]
+
+
+def random_tree(size, seed, malformed=False):
+    """A random AX tree of `size` nodes, root first, and layout rects keyed by backendDOMNodeId.
+
+    Nodes are shuffled after the root and mix wide lists with deep chains;
+    many lie outside the 1224x968 viewport, have an empty box or none at all.
+    With `malformed`, some nodes lack a role, name or backendDOMNodeId, carry
+    broken properties, or list child ids that are not in the tree, as the
+    parser has to tolerate.
+    """
+    rng = random.Random(seed)
+    nodes = [{"nodeId": "1", "role": {"value": "RootWebArea"}, "name": {"value": "Careers"},
+              "childIds": [], "backendDOMNodeId": 1, "properties": []}]
+    rects = {1: [0.0, 0.0, 1224.0, 5000.0]}
+    for index in range(1, size):
+        parent = nodes[rng.randrange(index)] if rng.random() < 0.3 else nodes[max(0, index - rng.randint(1, 3))]
+        node_id = str(index + 1)
+        parent["childIds"].append(node_id)
+        node = {
+            "nodeId": node_id,
+            "parentId": parent["nodeId"],
+            "role": {"value": rng.choice(ROLES)},
+            "name": {"value": rng.choice(NAMES) if rng.random() < 0.7 else f"Job {rng.randrange(size)}"},
+            "childIds": [],
+            "properties": [{"name": rng.choice(PROPERTIES), "value": {"value": rng.choice([True, 2, "x\ny"])}}
+                           for _ in range(rng.choice([0, 0, 1, 2]))],
+            "backendDOMNodeId": index + 1,
+        }
+        if rng.random() < 0.85:
+            rects[index + 1] = [rng.uniform(-200, 1300), rng.uniform(-500, 1500),
+                                rng.choice([0.0, rng.uniform(1, 400)]), rng.uniform(0, 100)]
+        if malformed:
+            if rng.random() < 0.05:
+                del node[rng.choice(["role", "name"])]
+            if rng.random() < 0.1:
+                del node["backendDOMNodeId"]
+            if rng.random() < 0.1:
+                node["properties"].append({"name": "broken"})
+            if rng.random() < 0.05:
+                parent["childIds"].append("missing")
+        nodes.append(node)
+
+    rest = nodes[1:]
+    rng.shuffle(rest)
+    return [nodes[0], *rest], rects
+
+
+def job_list_tree(items, visible=20, breadth_first=False):
+    """A careers page: one list of `items` listings (link and text), the first `visible` on screen.
+
+    Nodes come in document order, or level by level with `breadth_first`;
+    CDP does not promise either.
+    """
+    nodes = [{"nodeId": "1", "role": {"value": "RootWebArea"}, "name": {"value": "Careers"},
+              "childIds": ["2"], "backendDOMNodeId": 1, "properties": []},
+             {"nodeId": "2", "parentId": "1", "role": {"value": "list"}, "name": {"value": ""},
+              "childIds": [], "backendDOMNodeId": 2, "properties": []}]
+    rects = {1: [0.0, 0.0, 1224.0, 968.0], 2: [0.0, 0.0, 1224.0, 40.0 * items]}
+    for item in range(items):
+        top = 40.0 * item if item < visible else 968.0 + 40.0 * item
+        item_id, link_id, text_id = 3 + 3 * item, 4 + 3 * item, 5 + 3 * item
+        nodes[1]["childIds"].append(str(item_id))
+        nodes += [
+            {"nodeId": str(item_id), "parentId": "2", "role": {"value": "listitem"}, "name": {"value": ""},
+             "childIds": [str(link_id)], "backendDOMNodeId": item_id, "properties": []},
+            {"nodeId": str(link_id), "parentId": str(item_id), "role": {"value": "link"},
+             "name": {"value": f"Software Engineer {item}"}, "childIds": [str(text_id)],
+             "backendDOMNodeId": link_id, "properties": []},
+            {"nodeId": str(text_id), "parentId": str(link_id), "role": {"value": "StaticText"},
+             "name": {"value": f"Software Engineer {item}"}, "childIds": [],
+             "backendDOMNodeId": text_id, "properties": []},
+        ]
+        rects[item_id] = [0.0, top, 600.0, 30.0]
+        rects[link_id] = [10.0, top + 5, 300.0, 20.0]
+        rects[text_id] = [10.0, top + 5, 280.0, 20.0]
+    if breadth_first:
+        nodes = nodes[:2] + nodes[2::3] + nodes[3::3] + nodes[4::3]
+    return nodes, rects
+
+
+def copy_tree(nodes):
+    """A fresh copy of a tree, as every CDP response is."""
+    return json.loads(json.dumps(nodes))
+
+
+def with_bounds(nodes, rects):
+    """A copy of the tree with union_bound set as fetch_page_accessibility_tree sets it."""
+    nodes = copy_tree(nodes)
+    for node in nodes:
+        if "backendDOMNodeId" not in node:
+            node["union_bound"] = None
+        elif node.get("role", {}).get("value") == "RootWebArea":
+            node["union_bound"] = [0.0, 0.0, 10.0, 10.0]
+        else:
+            node["union_bound"] = rects.get(node["backendDOMNodeId"])
+    return nodes
+
+
+def snapshot_info(rects, config=VIEWPORT):
+    """BrowserInfo whose snapshot lays out every rect as one box at scroll 0."""
+    backend_node_ids = sorted(rects)
+    return {
+        "config": dict(config),
+        "DOMTree": {"documents": [{
+            "nodes": {"backendNodeId": backend_node_ids},
+            "layout": {"nodeIndex": list(range(len(backend_node_ids))),
+                       "bounds": [rects[backend_node_id] for backend_node_id in backend_node_ids]},
+        }]},
+    }
+
+
+class StubCDPBrowser:
+    """Serves an AX tree, and per-node client rects the way Chrome answers DOM.resolveNode."""
+
+    def __init__(self, nodes, rects):
+        self.nodes = nodes
+        self.rects = rects
+        self.round_trips = 0
+
+    def execute_cdp_cmd(self, command, params):
+        self.round_trips += 1
+        if command == "Accessibility.getFullAXTree":
+            return {"nodes": copy_tree(self.nodes)}
+        if command == "DOM.resolveNode":
+            if params["backendNodeId"] not in self.rects:
+                raise RuntimeError("No node with given id found")
+            return {"object": {"objectId": params["backendNodeId"]}}
+        if command == "Runtime.callFunctionOn":
+            x, y, width, height = self.rects[params["objectId"]]
+            return {"result": {"type": "object", "value": {"x": x, "y": y, "width": width, "height": height}}}
+        raise ValueError(f"Unexpected CDP command {command}")
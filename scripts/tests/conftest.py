@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The scripts run as flat modules from scripts/ and scripts/utils/
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(SCRIPTS_DIR, "utils"))
+sys.path.insert(0, SCRIPTS_DIR)
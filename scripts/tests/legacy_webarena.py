@@ -0,0 +1,246 @@
+"""Frozen copies of the accessibility tree functions as they were before they
+were rewritten for speed. The tests check the current code against them."""
+
+import re
+from typing import Any
+
+from utils_webarena import (
+    IGNORED_ACTREE_PROPERTIES,
+    IN_VIEWPORT_RATIO_THRESHOLD,
+    AccessibilityTree,
+    AccessibilityTreeNode,
+    BrowserConfig,
+    BrowserInfo,
+    get_bounding_client_rect,
+    get_element_in_viewport_ratio,
+)
+
+
+def legacy_fetch_page_accessibility_tree(
+    info: BrowserInfo,
+    browser,
+    # client: CDPSession,
+    current_viewport_only: bool,
+) -> AccessibilityTree:
+    accessibility_tree: AccessibilityTree = browser.execute_cdp_cmd(
+        "Accessibility.getFullAXTree", {}
+    )["nodes"]
+
+    # a few nodes are repeated in the accessibility tree
+    seen_ids = set()
+    _accessibility_tree = []
+    for node in accessibility_tree:
+        if node["nodeId"] not in seen_ids:
+            _accessibility_tree.append(node)
+            seen_ids.add(node["nodeId"])
+    accessibility_tree = _accessibility_tree
+
+    nodeid_to_cursor = {}
+    for cursor, node in enumerate(accessibility_tree):
+        nodeid_to_cursor[node["nodeId"]] = cursor
+        # usually because the node is not visible etc
+        if "backendDOMNodeId" not in node:
+            node["union_bound"] = None
+            continue
+        backend_node_id = str(node["backendDOMNodeId"])
+        if node["role"]["value"] == "RootWebArea":
+            # always inside the viewport
+            node["union_bound"] = [0.0, 0.0, 10.0, 10.0]
+        else:
+            response = get_bounding_client_rect(
+                browser, backend_node_id
+            )
+            if response.get("result", {}).get("subtype", "") == "error":
+                node["union_bound"] = None
+            else:
+                x = response["result"]["value"]["x"]
+                y = response["result"]["value"]["y"]
+                width = response["result"]["value"]["width"]
+                height = response["result"]["value"]["height"]
+                node["union_bound"] = [x, y, width, height]
+
+    # filter nodes that are not in the current viewport
+    if current_viewport_only:
+        accessibility_tree = legacy_prune_nodes_outside_viewport(
+            accessibility_tree, nodeid_to_cursor, info["config"]
+        )
+
+    return accessibility_tree
+
+
+def legacy_prune_nodes_outside_viewport(
+    accessibility_tree: AccessibilityTree,
+    nodeid_to_cursor: dict[str, int],
+    config: BrowserConfig,
+) -> AccessibilityTree:
+    """The viewport filter of the old fetch_page_accessibility_tree, splicing one node at a time."""
+
+    def remove_node_in_graph(node: AccessibilityTreeNode) -> None:
+        # update the node information in the accessibility tree
+        nodeid = node["nodeId"]
+        node_cursor = nodeid_to_cursor[nodeid]
+        parent_nodeid = node["parentId"]
+        children_nodeids = node["childIds"]
+        parent_cursor = nodeid_to_cursor[parent_nodeid]
+        # update the children of the parent node
+        assert (
+            accessibility_tree[parent_cursor].get("parentId", "Root")
+            is not None
+        )
+        # remove the nodeid from parent's childIds
+        index = accessibility_tree[parent_cursor]["childIds"].index(
+            nodeid
+        )
+        accessibility_tree[parent_cursor]["childIds"].pop(index)
+        # Insert children_nodeids in the same location
+        for child_nodeid in children_nodeids:
+            accessibility_tree[parent_cursor]["childIds"].insert(
+                index, child_nodeid
+            )
+            index += 1
+        # update children node's parent
+        for child_nodeid in children_nodeids:
+            child_cursor = nodeid_to_cursor[child_nodeid]
+            accessibility_tree[child_cursor][
+                "parentId"
+            ] = parent_nodeid
+        # mark as removed
+        accessibility_tree[node_cursor]["parentId"] = "[REMOVED]"
+
+    for node in accessibility_tree:
+        if not node["union_bound"]:
+            remove_node_in_graph(node)
+            continue
+
+        [x, y, width, height] = node["union_bound"]
+
+        # invisible node
+        if width == 0 or height == 0:
+            remove_node_in_graph(node)
+            continue
+
+        in_viewport_ratio = get_element_in_viewport_ratio(
+            elem_left_bound=float(x),
+            elem_top_bound=float(y),
+            width=float(width),
+            height=float(height),
+            config=config,
+        )
+
+        if in_viewport_ratio < IN_VIEWPORT_RATIO_THRESHOLD:
+            remove_node_in_graph(node)
+
+    return [
+        node
+        for node in accessibility_tree
+        if node.get("parentId", "Root") != "[REMOVED]"
+    ]
+
+
+def legacy_parse_accessibility_tree(
+    accessibility_tree: AccessibilityTree,
+) -> tuple[str, dict[str, Any]]:
+    """Parse the accessibility tree into a string text"""
+    node_id_to_idx = {}
+    for idx, node in enumerate(accessibility_tree):
+        node_id_to_idx[node["nodeId"]] = idx
+
+    obs_nodes_info = {}
+
+    def dfs(idx: int, obs_node_id: str, depth: int) -> str:
+        tree_str = ""
+        node = accessibility_tree[idx]
+        indent = "\t" * depth
+        valid_node = True
+        try:
+            role = node["role"]["value"]
+            name = node["name"]["value"]
+            node_str = f"[{obs_node_id}] {role} {repr(name)}"
+            properties = []
+            for property in node.get("properties", []):
+                try:
+                    if property["name"] in IGNORED_ACTREE_PROPERTIES:
+                        continue
+                    properties.append(
+                        f'{property["name"]}: {property["value"]["value"]}'
+                    )
+                except KeyError:
+                    pass
+
+            if properties:
+                node_str += " " + " ".join(properties)
+
+            # check valid
+            if not node_str.strip():
+                valid_node = False
+
+            # empty generic node
+            if not name.strip():
+                if not properties:
+                    if role in [
+                        "generic",
+                        "img",
+                        "list",
+                        "strong",
+                        "paragraph",
+                        "banner",
+                        "navigation",
+                        "Section",
+                        "LabelText",
+                        "Legend",
+                        "listitem",
+                    ]:
+                        valid_node = False
+                elif role in ["listitem"]:
+                    valid_node = False
+
+            if valid_node:
+                tree_str += f"{indent}{node_str}"
+                obs_nodes_info[obs_node_id] = {
+                    "backend_id": node["backendDOMNodeId"],
+                    "union_bound": node["union_bound"],
+                    "text": node_str,
+                }
+
+        except:
+            valid_node = False
+
+        for _, child_node_id in enumerate(node["childIds"]):
+            if child_node_id not in node_id_to_idx:
+                continue
+            # mark this to save some tokens
+            child_depth = depth + 1 if valid_node else depth
+            child_str = dfs(
+                node_id_to_idx[child_node_id], child_node_id, child_depth
+            )
+            if child_str.strip():
+                if tree_str.strip():
+                    tree_str += "\n"
+                tree_str += child_str
+
+        return tree_str
+
+    tree_str = dfs(0, accessibility_tree[0]["nodeId"], 0)
+    return tree_str, obs_nodes_info
+
+
+def legacy_clean_accesibility_tree(tree_str: str) -> str:
+    """further clean accesibility tree"""
+    clean_lines: list[str] = []
+    for line in tree_str.split("\n"):
+        if "statictext" in line.lower():
+            prev_lines = clean_lines[-3:]
+            pattern = r"\[\d+\] StaticText '([^']+)'"
+
+            match = re.search(pattern, line)
+            if match:
+                static_text = match.group(1)
+                if all(
+                    static_text not in prev_line
+                    for prev_line in prev_lines
+                ):
+                    clean_lines.append(line)
+        else:
+            clean_lines.append(line)
+
+    return "\n".join(clean_lines)
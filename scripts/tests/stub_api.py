@@ -0,0 +1,18 @@
+"""A stand-in for the OpenAI client used by the extraction code."""
+import types
+
+
+class StubAPI:
+    """Answers every chat completion with `answer` (or raises it) and records the prompts."""
+
+    def __init__(self, answer="[]"):
+        self.answer = answer
+        self.prompts = []
+        self.chat = self.completions = self
+
+    def create(self, **kwargs):
+        self.prompts.append(kwargs["messages"][-1]["content"])
+        if isinstance(self.answer, Exception):
+            raise self.answer
+        message = types.SimpleNamespace(content=self.answer)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
@@ -0,0 +1,130 @@
+import itertools
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+from accessibility_trees import (VIEWPORT, StubCDPBrowser, job_list_tree, random_tree, snapshot_info,
+                                 with_bounds)
+from legacy_webarena import (legacy_clean_accesibility_tree, legacy_fetch_page_accessibility_tree,
+                             legacy_parse_accessibility_tree, legacy_prune_nodes_outside_viewport)
+from utils_webarena import (clean_accesibility_tree, fetch_page_accessibility_tree, iter_accessibility_tree_lines,
+                            iter_clean_accessibility_tree_lines, parse_accessibility_tree,
+                            prune_nodes_outside_viewport)
+
+
+RANDOM_TREES = 2000
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "accessibility_trees"
+
+
+def tree_sizes():
+    rng = random.Random(0)
+    return [(seed, rng.choice([1, 5, 30, 100, 300])) for seed in range(RANDOM_TREES)]
+
+
+@pytest.mark.parametrize("current_viewport_only", [False, True])
+def test_snapshot_bounds_match_per_node_client_rects(current_viewport_only):
+    # One layout box per node: the snapshot bounds are exactly the client rects
+    for seed, size in tree_sizes():
+        nodes, rects = random_tree(size, seed)
+        info = snapshot_info(rects)
+
+        expected = legacy_fetch_page_accessibility_tree(info, StubCDPBrowser(nodes, rects), current_viewport_only)
+        browser = StubCDPBrowser(nodes, {})
+        actual = fetch_page_accessibility_tree(info, browser, current_viewport_only)
+
+        assert actual == expected, f"seed {seed}"
+        assert browser.round_trips == 1
+
+
+def pruned(prune, nodes, rects):
+    tree = with_bounds(nodes, rects)
+    nodeid_to_cursor = {node["nodeId"]: cursor for cursor, node in enumerate(tree)}
+    return prune(tree, nodeid_to_cursor, VIEWPORT)
+
+
+def test_viewport_pruning_matches_the_old_splicing():
+    for seed, size in tree_sizes():
+        nodes, rects = random_tree(size, seed)
+
+        expected = pruned(legacy_prune_nodes_outside_viewport, nodes, rects)
+
+        assert pruned(prune_nodes_outside_viewport, nodes, rects) == expected, f"seed {seed}"
+
+
+@pytest.mark.parametrize("breadth_first", [False, True])
+def test_viewport_pruning_of_a_long_list(breadth_first):
+    nodes, rects = job_list_tree(3000, breadth_first=breadth_first)
+
+    tree = pruned(prune_nodes_outside_viewport, nodes, rects)
+
+    assert tree == pruned(legacy_prune_nodes_outside_viewport, nodes, rects)
+    assert len(tree) == 2 + 3 * 20
+    assert tree[1]["childIds"] == [str(3 + 3 * item) for item in range(20)]
+
+
+@pytest.mark.parametrize("name", ["job_board", "random_malformed", "deep_chain"])
+def test_parse_matches_golden_output(name):
+    # The .txt and .nodes.json files were written by the old recursive parser
+    tree = json.loads((FIXTURES_DIR / f"{name}.json").read_text())
+    expected_text = (FIXTURES_DIR / f"{name}.txt").read_text()
+    expected_nodes = json.loads((FIXTURES_DIR / f"{name}.nodes.json").read_text())
+
+    text, obs_nodes_info = parse_accessibility_tree(tree)
+
+    assert text == expected_text
+    assert json.loads(json.dumps(obs_nodes_info)) == expected_nodes
+
+
+def test_parse_matches_the_old_parser():
+    for seed, size in tree_sizes():
+        nodes, rects = random_tree(size, seed, malformed=True)
+        tree = with_bounds(nodes, rects)
+
+        assert parse_accessibility_tree(tree) == legacy_parse_accessibility_tree(tree), f"seed {seed}"
+
+
+def test_parse_deep_tree_without_recursion():
+    depth = sys.getrecursionlimit() * 5
+    tree = [{"nodeId": str(index), "role": {"value": "link"}, "name": {"value": f"Level {index}"},
+             "childIds": [str(index + 1)] if index < depth - 1 else [], "backendDOMNodeId": index,
+             "union_bound": None} for index in range(depth)]
+
+    text, obs_nodes_info = parse_accessibility_tree(tree)
+
+    lines = text.split("\n")
+    assert len(lines) == len(obs_nodes_info) == depth
+    assert lines[-1] == "\t" * (depth - 1) + f"[{depth - 1}] link 'Level {depth - 1}'"
+
+
+def test_lines_can_be_read_lazily():
+    tree = json.loads((FIXTURES_DIR / "random_malformed.json").read_text())
+
+    first = list(itertools.islice(iter_accessibility_tree_lines(tree), 10))
+
+    assert (FIXTURES_DIR / "random_malformed.txt").read_text().startswith("\n".join(first) + "\n")
+
+
+@pytest.mark.parametrize("name", ["job_board", "random_malformed", "deep_chain"])
+def test_clean_matches_golden_output(name):
+    # The .clean.txt files were written by the old clean_accesibility_tree
+    tree = json.loads((FIXTURES_DIR / f"{name}.json").read_text())
+    text = (FIXTURES_DIR / f"{name}.txt").read_text()
+    expected = (FIXTURES_DIR / f"{name}.clean.txt").read_text()
+
+    assert clean_accesibility_tree(text) == expected
+    assert "\n".join(iter_clean_accessibility_tree_lines(iter_accessibility_tree_lines(tree))) == expected
+
+
+def test_clean_matches_the_old_cleaner():
+    for seed, size in tree_sizes():
+        nodes, rects = random_tree(size, seed, malformed=True)
+        tree = with_bounds(nodes, rects)
+        text, _ = legacy_parse_accessibility_tree(tree)
+        expected = legacy_clean_accesibility_tree(text)
+
+        assert clean_accesibility_tree(text) == expected, f"seed {seed}"
+        fused = iter_clean_accessibility_tree_lines(iter_accessibility_tree_lines(tree))
+        assert "\n".join(fused) == expected, f"seed {seed}"
@@ -0,0 +1,121 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import ats_feeds
+from ats_feeds import fetch_feed_jobs
+from stub_api import StubAPI
+
+
+# Recorded feed responses, named after the request path (and offset, for paged feeds)
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "feeds"
+
+
+class RecordedFeedHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        self.server.requests.append(self.path)
+        name = "_".join(segment for segment in url.path.split("/") if segment)
+        offset = parse_qs(url.query).get("offset")
+        path = FIXTURES_DIR / f"{name}{'_' + offset[0] if offset else ''}.json"
+        if not path.exists():
+            self.send_error(404)
+            return
+        body = path.read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def feed_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RecordedFeedHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def requests_made(feed_server, monkeypatch):
+    """Point every feed at the stub server; returns the request paths it receives."""
+    base = f"http://127.0.0.1:{feed_server.server_address[1]}"
+    for feed in ("greenhouse", "lever", "ashby", "smartrecruiters"):
+        monkeypatch.setattr(ats_feeds, f"{feed.upper()}_API_URL", f"{base}/{feed}")
+    monkeypatch.setattr(ats_feeds, "SMARTRECRUITERS_PAGE_SIZE", 4)
+    ats_feeds.configure_feed_session(2)
+    feed_server.requests.clear()
+    return feed_server.requests
+
+
+@pytest.mark.parametrize("page_url, links", [
+    ("https://boards.greenhouse.io/acme",
+     ["https://boards.greenhouse.io/acme/jobs/4012340", "https://boards.greenhouse.io/acme/jobs/4012341"]),
+    ("https://boards.greenhouse.io/embed/job_board?for=acme",
+     ["https://boards.greenhouse.io/acme/jobs/4012340", "https://boards.greenhouse.io/acme/jobs/4012341"]),
+    ("https://jobs.lever.co/acme/a1b2c3d4-0000-4000-8000-000000000003",
+     ["https://jobs.lever.co/acme/a1b2c3d4-0000-4000-8000-000000000000",
+      "https://jobs.lever.co/acme/a1b2c3d4-0000-4000-8000-000000000001"]),
+    ("https://jobs.ashbyhq.com/acme",
+     ["https://jobs.ashbyhq.com/acme/9f8e7d6c-5b4a-4321-8fed-cba987654320",
+      "https://jobs.ashbyhq.com/acme/9f8e7d6c-5b4a-4321-8fed-cba987654321"]),
+    ("https://careers.smartrecruiters.com/Acme",
+     ["https://jobs.smartrecruiters.com/Acme/744000000", "https://jobs.smartrecruiters.com/Acme/744000001"]),
+])
+def test_feed_jobs_matching_by_words(requests_made, page_url, links):
+    api = StubAPI()
+
+    jobs = fetch_feed_jobs(api, page_url, "Software Engineer", "Acme")
+
+    assert [job["Application Link"] for job in jobs] == links
+    assert [job["Job Title"] for job in jobs] == ["Senior Software Engineer, Payments", "Software Engineer II, Platform"]
+    assert jobs[0]["Company Name"] == "Acme"
+    assert jobs[1]["Location"].startswith("San Francisco")
+    assert api.prompts == []
+
+
+def test_paged_feed_is_read_to_the_end(requests_made):
+    jobs = fetch_feed_jobs(StubAPI(), "https://careers.smartrecruiters.com/Acme", "Account Executive", "Acme")
+
+    assert [job["Location"] for job in jobs] == ["London, gb"]
+    assert [urlparse(path).query for path in requests_made] == ["limit=4&offset=0", "limit=4&offset=4"]
+
+
+def test_unlisted_postings_are_skipped(requests_made):
+    jobs = fetch_feed_jobs(StubAPI(), "https://jobs.ashbyhq.com/acme", "Internal Transfer", "Acme")
+
+    assert jobs == []
+
+
+def test_feed_without_word_match_takes_one_model_selection(requests_made):
+    api = StubAPI("[1, 3]")
+
+    jobs = fetch_feed_jobs(api, "https://jobs.lever.co/acme", "Backend Engineer", "Acme")
+
+    assert [job["Job Title"] for job in jobs] == ["Software Engineer II, Platform", "Backend Developer"]
+    assert len(api.prompts) == 1
+
+
+@pytest.mark.parametrize("page_url", [
+    "https://boards.greenhouse.io/missing",  # Stale board name: the feed answers 404
+    "https://www.acme.com/careers",  # Not a board with a feed
+    "https://boards.greenhouse.io/",  # No board name
+])
+def test_browser_fallback_when_the_feed_is_unusable(requests_made, page_url):
+    assert fetch_feed_jobs(StubAPI(), page_url, "Software Engineer") is None
+
+
+def test_browser_fallback_when_the_model_selection_fails(requests_made):
+    api = StubAPI(RuntimeError("rate limited"))
+
+    assert fetch_feed_jobs(api, "https://jobs.lever.co/acme", "Backend Engineer", "Acme") is None
@@ -0,0 +1,83 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from ats_extractors import parse_board, title_matches_position
+from job_extraction import extract_board_jobs
+from stub_api import StubAPI
+
+
+# Saved board pages, one per ATS markup; refresh them when a board's markup changes
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "boards"
+BOARDS = sorted(path.stem for path in FIXTURES_DIR.glob("*.html"))
+
+
+def board(name):
+    expected = json.loads((FIXTURES_DIR / f"{name}.json").read_text())
+    return (FIXTURES_DIR / f"{name}.html").read_text(), expected["page_url"], expected["listings"]
+
+
+@pytest.mark.parametrize("name", BOARDS)
+def test_saved_boards_parse(name):
+    html, page_url, expected = board(name)
+
+    listings = parse_board(html, page_url)
+
+    assert listings == (None if expected is None else [tuple(listing) for listing in expected])
+
+
+def test_known_board_with_unknown_markup_falls_back():
+    html, _, _ = board("plain_careers")
+
+    assert parse_board(html, "https://boards.greenhouse.io/acme") is None
+
+
+@pytest.mark.parametrize("title, position, matches", [
+    ("Senior Software Engineer, Payments", "Software Engineer", True),
+    ("Software Engineer II", "Software Engineering", True),
+    ("Front-End Developer", "Frontend Developer", True),
+    ("Sr. Product Manager", "Senior Product Manager", True),
+    ("Staff Data Scientists", "data scientist", True),
+    ("Data Engineer", "Data Scientist", False),
+    ("Retail Associate", "AI Engineer", False),
+])
+def test_title_matching(title, position, matches):
+    assert title_matches_position(title, position) == matches
+
+
+def test_board_jobs_matching_by_words_need_no_model():
+    html, page_url, _ = board("lever")
+    api = StubAPI()
+
+    jobs = extract_board_jobs(api, html, page_url, "Software Engineer", "Acme")
+
+    assert [job["Job Title"] for job in jobs] == ["Senior Software Engineer, Payments", "Software Engineer II, Platform"]
+    assert jobs[0]["Location"] == "Remote, US"
+    assert jobs[0]["Company Name"] == "Acme"
+    assert api.prompts == []
+
+
+def test_board_jobs_fall_back_to_one_model_selection():
+    html, page_url, _ = board("workday")
+    api = StubAPI("The matching titles are [1, 3]")
+
+    jobs = extract_board_jobs(api, html, page_url, "Backend Developer", "Acme")
+
+    assert [job["Job Title"] for job in jobs] == ["Software Engineer II, Platform", "Frontend Engineer"]
+    assert len(api.prompts) == 1
+    assert "5: Engineering Manager, Infrastructure" in api.prompts[0]
+
+
+def test_board_without_matching_jobs_is_final():
+    html, page_url, _ = board("ashby")
+
+    assert extract_board_jobs(StubAPI("[]"), html, page_url, "Nurse", "Acme") == []
+
+
+def test_unknown_page_is_left_to_the_model():
+    html, page_url, _ = board("plain_careers")
+    api = StubAPI()
+
+    assert extract_board_jobs(api, html, page_url, "Software Engineer") is None
+    assert api.prompts == []
@@ -0,0 +1,110 @@
+from browser_pool import MAX_HISTORY_ENTRIES, BrowserPool
+
+
+class Window:
+    def __init__(self, *urls, frames=()):
+        self.history = list(urls)
+        self.frames = list(frames)
+
+
+class StubDriver:
+    """Enough of a Chrome driver for the pool: windows with session history and frames."""
+
+    def __init__(self):
+        self.windows = {"main": Window("about:blank")}
+        self.current = "main"
+        self.cleared = set()
+        self.quit_called = False
+
+    @property
+    def window_handles(self):
+        return list(self.windows)
+
+    @property
+    def current_url(self):
+        return self.windows[self.current].history[-1]
+
+    @property
+    def switch_to(self):
+        return self
+
+    def window(self, handle):
+        self.current = handle
+
+    def close(self):
+        del self.windows[self.current]
+
+    def get(self, url):
+        self.windows[self.current].history.append(url)
+
+    def execute_script(self, script):
+        return 1
+
+    def execute_cdp_cmd(self, command, params):
+        window = self.windows[self.current]
+        if command == "Page.getNavigationHistory":
+            return {"currentIndex": len(window.history) - 1,
+                    "entries": [{"url": url} for url in window.history]}
+        if command == "Page.getFrameTree":
+            return {"frameTree": {"frame": {"url": self.current_url},
+                                  "childFrames": [{"frame": {"url": url}} for url in window.frames]}}
+        if command == "Storage.clearDataForOrigin":
+            self.cleared.add(params["origin"])
+        if command == "Page.resetNavigationHistory":
+            del window.history[:-1]
+        return {}
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_reset_clears_every_origin_the_task_visited():
+    drivers = []
+    pool = BrowserPool(lambda: drivers.append(StubDriver()) or drivers[-1], size=1)
+
+    with pool.lease() as driver:
+        driver.get("https://acme.com/")
+        driver.get("https://acme.wd5.myworkdayjobs.com/careers")
+        driver.get("https://jobs.lever.co/acme")
+        driver.windows["popup"] = Window("https://apply.example.com/form",
+                                         frames=["https://widgets.example.net/embed"])
+
+    assert drivers[0].cleared == {
+        "https://acme.com", "https://acme.wd5.myworkdayjobs.com", "https://jobs.lever.co",
+        "https://apply.example.com", "https://widgets.example.net",
+    }
+    assert drivers[0].window_handles == ["main"]
+    assert drivers[0].current_url == "about:blank"
+
+    with pool.lease() as driver:
+        assert driver is drivers[0]
+
+
+def test_full_history_recycles_the_driver():
+    drivers = []
+    pool = BrowserPool(lambda: drivers.append(StubDriver()) or drivers[-1], size=1)
+
+    with pool.lease() as driver:
+        for page in range(MAX_HISTORY_ENTRIES):
+            driver.get(f"https://site{page}.example.com/")
+
+    assert drivers[0].quit_called
+    with pool.lease() as driver:
+        assert driver is drivers[1]
+
+
+def test_history_is_cleared_between_leases():
+    drivers = []
+    pool = BrowserPool(lambda: drivers.append(StubDriver()) or drivers[-1], size=1, max_tasks=10)
+
+    for lease in range(4):
+        with pool.lease() as driver:
+            for page in range(15):
+                driver.get(f"https://site{lease}-{page}.example.com/")
+
+    assert len(drivers) == 1
+    assert not drivers[0].quit_called
+    assert drivers[0].windows["main"].history == ["about:blank"]
@@ -0,0 +1,59 @@
+import sqlite3
+
+import pytest
+
+from careers_cache import CareersUrlCache
+
+
+def test_round_trip(tmp_path):
+    cache = CareersUrlCache(str(tmp_path / "cache" / "careers.sqlite3"))
+    cache.put("The Acme Corp.", "https://acme.com/careers")
+    cache.put("Nothing Inc", None)
+
+    assert cache.get("acme") == (True, "https://acme.com/careers")
+    assert cache.get("Nothing") == (True, None)
+    assert cache.get("Unknown") == (False, None)
+    cache.close()
+
+
+def test_unwritable_location_raises_on_open(tmp_path):
+    # main disables the cache on these errors instead of crashing the run
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    with pytest.raises((OSError, sqlite3.Error)):
+        CareersUrlCache(str(blocker / "careers.sqlite3"))
+
+
+def test_locked_database_skips_the_store(tmp_path):
+    path = str(tmp_path / "careers.sqlite3")
+    cache = CareersUrlCache(path, timeout=0.1)
+    cache.put("Acme", "https://acme.com/careers")
+
+    # Another run writing for longer than the timeout
+    other = sqlite3.connect(path, timeout=0.1, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        cache.put("Globex", "https://globex.com/jobs")
+        assert cache.errors == 1
+        # Reads still go through while another process writes
+        assert cache.get("Acme") == (True, "https://acme.com/careers")
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
+
+    assert cache.get("Globex") == (False, None)
+    cache.put("Globex", "https://globex.com/jobs")
+    assert cache.get("Globex") == (True, "https://globex.com/jobs")
+    cache.close()
+
+
+def test_failed_lookup_is_a_miss(tmp_path):
+    path = str(tmp_path / "careers.sqlite3")
+    cache = CareersUrlCache(path)
+    cache.put("Acme", "https://acme.com/careers")
+    with sqlite3.connect(path) as other:
+        other.execute("DROP TABLE careers_urls")
+
+    assert cache.get("Acme") == (False, None)
+    assert (cache.misses, cache.errors) == (1, 1)
+    cache.close()
@@ -0,0 +1,113 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import careers_search
+from careers_cache import CareersUrlCache
+from careers_search import configure_google_search, get_job_board_link
+
+
+# Search answers by company name: a JSON body, or an HTTP status
+RESULTS = {
+    "Acme": {"items": [
+        {"title": "Acme - About us", "link": "https://acme.com/about"},
+        {"title": "Careers at Acme", "link": "https://acme.com/careers"},
+        {"title": "Acme Jobs", "link": "https://jobs.lever.co/acme"},
+    ]},
+    "Globex": {"items": [{"title": "Globex Corporation", "link": "https://globex.com/"}]},
+    "Initech": 500,
+    "Hooli": "<html><body>Service unavailable</body></html>",
+}
+
+
+class CustomSearchHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        company = query["q"][0].removesuffix(" careers site")
+        server = self.server
+        with server.lock:
+            server.requests.append(company)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        time.sleep(server.delay)
+        with server.lock:
+            server.in_flight -= 1
+
+        answer = RESULTS.get(company, {})
+        if isinstance(answer, int):
+            self.send_error(answer)
+            return
+        body = (answer if isinstance(answer, str) else json.dumps(answer)).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def search_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CustomSearchHandler)
+    server.lock = threading.Lock()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def server(search_server, monkeypatch):
+    """Point the search client at the stub server, with generous limits."""
+    monkeypatch.setattr(careers_search, "GOOGLE_CSE_URL", f"http://127.0.0.1:{search_server.server_address[1]}/")
+    configure_google_search(4, 6000)
+    search_server.requests = []
+    search_server.in_flight = search_server.max_in_flight = 0
+    search_server.delay = 0
+    return search_server
+
+
+@pytest.fixture
+def cache(tmp_path):
+    careers_cache = CareersUrlCache(str(tmp_path / "careers.sqlite3"))
+    yield careers_cache
+    careers_cache.close()
+
+
+def test_first_careers_result_is_picked_and_cached(server, cache):
+    assert get_job_board_link("Acme", "key", "cse", cache) == "https://acme.com/careers"
+    assert get_job_board_link("Acme", "key", "cse", cache) == "https://acme.com/careers"
+
+    assert server.requests == ["Acme"]
+
+
+def test_no_careers_result_is_none(server, cache):
+    assert get_job_board_link("Globex", "key", "cse", cache) is None
+    assert cache.get("Globex") == (True, None)
+
+
+@pytest.mark.parametrize("company", ["Initech", "Hooli"], ids=["http error", "not json"])
+def test_failed_search_is_none_and_not_cached(server, cache, company):
+    assert get_job_board_link(company, "key", "cse", cache) is None
+    assert cache.get(company) == (False, None)
+
+
+def test_concurrency_and_rate_limits_hold(server):
+    configure_google_search(2, 600)  # One request start every 0.1s
+    server.delay = 0.15
+    started = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        links = list(executor.map(lambda company: get_job_board_link(company, "key", "cse"), ["Acme"] * 6))
+
+    assert links == ["https://acme.com/careers"] * 6
+    assert server.max_in_flight <= 2
+    assert time.monotonic() - started >= 0.5
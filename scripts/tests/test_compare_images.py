@@ -0,0 +1,75 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from utils import compare_images, screenshots_unchanged
+
+
+def png(array):
+    buffer = io.BytesIO()
+    Image.fromarray(array).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def search_page(typed="", checked=False, count=342, noise=False):
+    """A 1224x968 PNG of a search form above a job list."""
+    image = Image.new("RGB", (1224, 968), "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((24, 90, 524, 126), outline=(160, 160, 160))
+    draw.text((34, 102), typed or "Search jobs", fill=(30, 30, 30) if typed else (170, 170, 170))
+    draw.rectangle((24, 150, 38, 164), outline=(100, 100, 100))
+    if checked:
+        draw.line((27, 157, 30, 161, 36, 152), fill=(20, 90, 200), width=2)
+    draw.text((46, 151), "Remote", fill=(30, 30, 30))
+    draw.text((24, 190), f"Showing 1-20 of {count} jobs", fill=(90, 90, 90))
+    for row in range(18):
+        draw.text((24, 230 + row * 40), f"Software Engineer {row + 1} - Remote", fill=(30, 30, 30))
+    array = np.asarray(image)
+    if noise:
+        array = np.clip(array + np.random.default_rng(0).integers(-2, 3, array.shape), 0, 255).astype(np.uint8)
+    return png(array)
+
+
+def test_differences_do_not_wrap_around():
+    dark = np.full((968, 1224), 10, dtype=np.uint8)
+    light = np.full((968, 1224), 250, dtype=np.uint8)
+
+    result = compare_images(dark, light)
+
+    # uint8 subtraction would give 16 per pixel for 10 - 250
+    assert result["total_difference"] == 240 * 968 * 1224
+    assert result["changed_fraction"] == 1.0
+
+
+def test_identical_encoded_frames_short_circuit():
+    frame = png(np.random.default_rng(0).integers(0, 256, (968, 1224, 3), dtype=np.uint8))
+
+    assert compare_images(frame, bytes(frame))["identical"]
+
+
+def test_changed_regions_are_the_changed_tiles():
+    before = np.full((968, 1224, 3), 255, dtype=np.uint8)
+    after = before.copy()
+    after[100:200, 700:900] = 0  # one box in the top right quarter
+
+    result = compare_images(png(before), png(after), grid=(2, 2))
+
+    assert result["changed_regions"] == [(612, 0, 1224, 484)]
+    assert compare_images(png(before), png(after), size=(64, 64), grid=(2, 2))["changed_regions"] == \
+        [(612, 0, 1224, 484)]
+
+
+@pytest.mark.parametrize("after", [
+    search_page(typed="Software Engineer"),
+    search_page(checked=True),
+    search_page(count=57),
+], ids=["typed text", "ticked checkbox", "results count"])
+def test_small_edits_are_changes(after):
+    assert not screenshots_unchanged(search_page(), after)
+
+
+def test_encoding_noise_is_no_change():
+    assert screenshots_unchanged(search_page(), search_page())
+    assert screenshots_unchanged(search_page(), search_page(noise=True))
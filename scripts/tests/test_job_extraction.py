@@ -0,0 +1,111 @@
+import json
+
+from html_parsing import make_soup
+from job_extraction import CHUNK_MAX_BLOCKS, chunk_blocks, extract_jobs, find_listing_blocks, merge_jobs
+from stub_api import StubAPI
+
+
+PAGE_URL = "https://www.acme.com/careers"
+
+
+def job_items(count, start=0, tag="li", cls="job"):
+    return "".join(f"<{tag} class='{cls}'><a href='/jobs/{index}'>Software Engineer {index}</a> Remote</{tag}>"
+                   for index in range(start, start + count))
+
+
+def block_links(html):
+    return [block.find("a")["href"] for block in find_listing_blocks(make_soup(html))]
+
+
+def test_repeated_items_with_links_are_listings():
+    html = f"<ul>{job_items(4)}<li class='job'>No opening here</li></ul><ul><li><a href='/a'>About</a></li></ul>"
+
+    assert block_links(html) == [f"/jobs/{index}" for index in range(4)]
+
+
+def test_fewer_than_three_items_are_not_a_listing():
+    assert block_links(f"<ul>{job_items(2)}</ul>") == []
+
+
+def test_nested_groups_take_the_innermost_listing():
+    # Three departments of five jobs each: the jobs are the listings, not the departments
+    departments = "".join(f"<section class='dept'><h2>Team {team}</h2><div>{job_items(5, team * 5, 'div')}</div></section>"
+                          for team in range(3))
+
+    assert block_links(f"<main>{departments}</main>") == [f"/jobs/{index}" for index in range(15)]
+
+
+def test_small_departments_beside_a_listing_are_kept():
+    # Four engineering openings repeat; the single data and sales openings only match their shape
+    sizes = [4, 1, 1]
+    departments = "".join(f"<section class='dept'><h3>Team {team}</h3>{job_items(size, sum(sizes[:team]), 'div')}</section>"
+                          for team, size in enumerate(sizes))
+
+    assert block_links(f"<main>{departments}</main>") == [f"/jobs/{index}" for index in range(6)]
+
+
+def test_groups_split_across_parents_are_all_kept():
+    html = f"<section><ul>{job_items(4)}</ul></section><section><ul>{job_items(3, 4)}</ul></section>"
+
+    assert block_links(html) == [f"/jobs/{index}" for index in range(7)]
+
+
+def test_hidden_menus_and_navigation_are_not_sent():
+    menu = "".join(f"<li class='item'><a href='/menu/{index}'>Menu {index}</a></li>" for index in range(8))
+    html = (f"<html><body><nav><ul>{menu}</ul></nav><div class='mobile-menu' hidden><ul>{menu}</ul></div>"
+            f"<div style='display: none'><ul>{menu}</ul></div><main><ul>{job_items(4)}</ul></main></body></html>")
+    api = StubAPI()
+
+    assert extract_jobs(api, html, PAGE_URL, "Software Engineer") == []
+    assert len(api.prompts) == 1
+    assert "https://www.acme.com/jobs/3" in api.prompts[0]
+    assert "/menu/" not in api.prompts[0]
+
+
+def test_page_without_listings_is_sent_as_text_once():
+    html = "<main><h1>Careers</h1><p>We are hiring a <a href='/jobs/1'>Software Engineer</a>.</p></main>"
+    api = StubAPI()
+
+    extract_jobs(api, html, PAGE_URL, "Software Engineer")
+
+    assert len(api.prompts) == 1
+    assert "Available Links" in api.prompts[0]
+    assert "'https://www.acme.com/jobs/1'" in api.prompts[0]
+
+
+def test_listings_are_chunked_and_the_answers_merged():
+    job = {"Job Title": "Software Engineer 0", "Application Link": "https://www.acme.com/jobs/0"}
+    api = StubAPI(json.dumps([job]))
+
+    jobs = extract_jobs(api, f"<ul>{job_items(2 * CHUNK_MAX_BLOCKS + 3)}</ul>", PAGE_URL, "Software Engineer")
+
+    # Every chunk answers with the same job, which is kept once
+    assert jobs == [job]
+    assert len(api.prompts) == 3
+    assert all("Available Links" not in prompt for prompt in api.prompts)
+
+
+def test_chunks_keep_block_order_and_limits():
+    texts = [f"block {index}" for index in range(7)]
+
+    assert chunk_blocks(texts, max_blocks=3) == ["block 0\n\nblock 1\n\nblock 2", "block 3\n\nblock 4\n\nblock 5",
+                                                 "block 6"]
+    assert chunk_blocks(["x" * 40, "y" * 40, "z"], max_chars=50) == ["x" * 40, "y" * 40 + "\n\nz"]
+
+
+def test_merge_keeps_the_first_of_each_job():
+    first = {"Job Title": "Software Engineer", "Application Link": "https://Jobs.Acme.com/jobs/1/", "Location": "Remote"}
+    jobs = merge_jobs([
+        [first, "not a job"],
+        [
+            {"Job Title": " software engineer ", "Application Link": "https://jobs.acme.com/jobs/1#apply"},
+            {"Job Title": "Senior Software Engineer", "Application Link": "https://jobs.acme.com/jobs/1"},
+            {"Job Title": "Software Engineer", "Application Link": "https://jobs.acme.com/jobs/1?team=2"},
+        ],
+    ])
+
+    assert jobs == [
+        first,
+        {"Job Title": "Senior Software Engineer", "Application Link": "https://jobs.acme.com/jobs/1"},
+        {"Job Title": "Software Engineer", "Application Link": "https://jobs.acme.com/jobs/1?team=2"},
+    ]
@@ -0,0 +1,82 @@
+import pytest
+
+from utils_webarena import fetch_browser_info, get_backend_node_bounds
+
+
+class SnapshotBrowser:
+    """Just enough of a Selenium driver for fetch_browser_info."""
+
+    def __init__(self, layout_bounds, window_width, scroll=(0, 0)):
+        self.layout_bounds = layout_bounds
+        self.window_width = window_width
+        self.scroll = scroll
+
+    def execute_cdp_cmd(self, command, params):
+        assert command == "DOMSnapshot.captureSnapshot"
+        return {"documents": [{
+            "nodes": {"backendNodeId": [10 + index for index in range(len(self.layout_bounds))]},
+            "layout": {"nodeIndex": list(range(len(self.layout_bounds))),
+                       "bounds": [list(bound) for bound in self.layout_bounds]},
+        }]}
+
+    def get_window_size(self):
+        return {"width": self.window_width, "height": 968}
+
+    def execute_script(self, script):
+        return {
+            "return window.pageYOffset;": self.scroll[1],
+            "return window.pageXOffset;": self.scroll[0],
+            "return window.screen.width;": 1224,
+            "return window.screen.height;": 968,
+            "return window.devicePixelRatio;": 1.0,
+        }[script]
+
+
+@pytest.mark.parametrize("window_width", [1200, 1224, 1500])
+def test_bounds_are_client_rects_whatever_the_calibration(window_width):
+    # Layout width 1200 against a wider outer window gives a calibration factor != 1
+    layout = [(0, 0, 1200, 5000), (40, 1800, 300, 20), (500, 2400, 120, 40)]
+    browser = SnapshotBrowser(layout, window_width, scroll=(0, 1500))
+
+    bounds = get_backend_node_bounds(fetch_browser_info(browser))
+
+    assert bounds[11] == [40, 300, 300, 20]
+    assert bounds[12] == [500, 900, 120, 40]
+
+
+def test_boxes_of_one_node_are_united():
+    browser = SnapshotBrowser([(0, 0, 1200, 900), (10, 100, 50, 10), (5, 120, 30, 10)], 1224, scroll=(0, 50))
+    info = fetch_browser_info(browser)
+    info["DOMTree"]["documents"][0]["nodes"]["backendNodeId"] = [1, 2, 2]
+
+    assert get_backend_node_bounds(info)[2] == [5, 50, 55, 30]
+
+
+def test_bounds_match_get_bounding_client_rect_in_chrome():
+    webdriver = pytest.importorskip("selenium.webdriver")
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--window-size=1224,968")
+    try:
+        driver = webdriver.Chrome(options=options)
+    except Exception as e:
+        pytest.skip(f"Chrome is not available: {e}")
+
+    try:
+        driver.get("data:text/html,<body style='margin:0'><div style='height:3000px'></div>"
+                   "<a id='target' href='#' style='margin-left:37px'>Apply now</a>"
+                   "<div style='height:3000px'></div></body>")
+        driver.execute_script("document.getElementById('target').scrollIntoView(); window.scrollBy(0, -200);")
+
+        bounds = get_backend_node_bounds(fetch_browser_info(driver))
+        document = driver.execute_cdp_cmd("DOM.getDocument", {})
+        node_id = driver.execute_cdp_cmd("DOM.querySelector",
+                                         {"nodeId": document["root"]["nodeId"], "selector": "#target"})["nodeId"]
+        backend_node_id = driver.execute_cdp_cmd("DOM.describeNode", {"nodeId": node_id})["node"]["backendNodeId"]
+        rect = driver.execute_script("return document.getElementById('target').getBoundingClientRect().toJSON();")
+
+        assert driver.execute_script("return window.pageYOffset;") > 0
+        assert bounds[backend_node_id] == pytest.approx([rect["x"], rect["y"], rect["width"], rect["height"]], abs=1)
+    finally:
+        driver.quit()
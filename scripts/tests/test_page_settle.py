@@ -0,0 +1,53 @@
+import page_settle
+from page_settle import BUSY_PAGE_GRACE, install_activity_tracker, wait_for_click_effect, wait_for_page_settle
+
+
+class BusyPage:
+    """A loaded page whose DOM never goes quiet, as with a carousel or an animation."""
+
+    def __init__(self, pending=0):
+        self.pending = pending
+        self.registrations = 0
+        self.window_handles = ["main"]
+
+    def execute_script(self, script, *args):
+        if script == page_settle.PAGE_STATE_JS:
+            return {"readyState": "complete", "pending": self.pending, "quietMs": 0, "url": "https://acme.com/"}
+
+    def execute_cdp_cmd(self, command, params):
+        if command == "Page.addScriptToEvaluateOnNewDocument":
+            self.registrations += 1
+        return {}
+
+
+def timings():
+    with page_settle._timings_lock:
+        return {action: dict(entry) for action, entry in page_settle._timings.items()}
+
+
+def test_busy_page_settles_after_the_grace_period():
+    elapsed = wait_for_page_settle(BusyPage(), "navigate", timeout=BUSY_PAGE_GRACE + 3)
+
+    assert BUSY_PAGE_GRACE <= elapsed < BUSY_PAGE_GRACE + 1
+
+
+def test_fresh_requests_hold_the_wait_until_the_ceiling():
+    assert wait_for_page_settle(BusyPage(pending=1), "navigate", timeout=BUSY_PAGE_GRACE + 0.5) >= BUSY_PAGE_GRACE + 0.5
+
+
+def test_tracker_is_registered_once_per_driver():
+    driver = BusyPage()
+
+    for _ in range(3):
+        install_activity_tracker(driver)
+
+    assert driver.registrations == 1
+
+
+def test_submit_waits_are_recorded_under_their_action():
+    before = timings().get("click", {}).get("count", 0)
+
+    wait_for_click_effect(BusyPage(), "https://acme.com/", ["main"], timeout=3, action="type:submit", fixed_sleep=3)
+
+    assert timings()["type:submit"]["fixed"] >= 3
+    assert timings().get("click", {}).get("count", 0) == before
@@ -0,0 +1,28 @@
+import asyncio
+import sqlite3
+
+from orchestrator import run_companies
+
+
+def collect(companies, process, max_browsers, **kwargs):
+    async def run():
+        return [result async for result in run_companies(companies, process, max_browsers, **kwargs)]
+    return sorted(asyncio.run(run()))
+
+
+def test_failed_lookup_keeps_the_homepage_and_the_run_going():
+    companies = [{"id": index, "web_name": f"Co{index}", "web": f"https://co{index}.com"} for index in range(4)]
+
+    def resolve(company):
+        if company["id"] == 1:
+            raise KeyError("title")
+        if company["id"] == 2:
+            raise sqlite3.OperationalError("database is locked")
+        company["web"] += "/careers"
+        return company
+
+    results = collect(companies, lambda company: (company["id"], company["web"]), 2,
+                      resolve=resolve, max_resolvers=2)
+
+    assert results == [(0, "https://co0.com/careers"), (1, "https://co1.com"),
+                       (2, "https://co2.com"), (3, "https://co3.com/careers")]
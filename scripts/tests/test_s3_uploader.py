@@ -0,0 +1,63 @@
+import threading
+from urllib.parse import urlparse
+
+from s3_uploader import ScreenshotUploader
+
+
+class StubS3Client:
+    """The two S3 calls the uploader makes; uploads can be held back or made to fail."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.release = threading.Event()
+        self.release.set()
+        self.uploads = []
+
+    def upload_file(self, path, bucket, key):
+        self.release.wait()
+        if self.fail:
+            raise OSError("connection reset")
+        with open(path, "rb") as f:
+            self.uploads.append((bucket, key, f.read()))
+
+    def generate_presigned_url(self, method, Params, ExpiresIn):
+        return f"https://{Params['Bucket']}.s3.amazonaws.com/{Params['Key']}?X-Amz-Expires={ExpiresIn}"
+
+
+def screenshot(tmp_path, name="screenshot1.png"):
+    path = tmp_path / name
+    path.write_bytes(b"\x89PNG fake")
+    return str(path)
+
+
+def test_submit_resolves_to_a_presigned_url_with_a_unique_key(tmp_path):
+    client = StubS3Client()
+    path = screenshot(tmp_path)
+
+    with ScreenshotUploader("jobscraiper", "us-east-1", expiration=120, client=client) as uploader:
+        urls = [uploader.submit(path).result() for _ in range(2)]
+
+    keys = [urlparse(url).path.lstrip("/") for url in urls]
+    assert all(key.startswith("temp_images/") and key.endswith("_screenshot1.png") for key in keys)
+    assert keys[0] != keys[1]
+    assert all(url.endswith("X-Amz-Expires=120") for url in urls)
+    assert [(bucket, key) for bucket, key, _ in client.uploads] == [("jobscraiper", key) for key in keys]
+    assert client.uploads[0][2] == b"\x89PNG fake"
+
+
+def test_failed_upload_resolves_to_none(tmp_path):
+    with ScreenshotUploader("jobscraiper", "us-east-1", client=StubS3Client(fail=True)) as uploader:
+        assert uploader.submit(screenshot(tmp_path)).result() is None
+
+
+def test_close_waits_for_queued_uploads(tmp_path):
+    client = StubS3Client()
+    client.release.clear()
+    uploader = ScreenshotUploader("jobscraiper", "us-east-1", max_workers=1, client=client)
+    futures = [uploader.submit(screenshot(tmp_path, f"screenshot{index}.png")) for index in range(3)]
+
+    threading.Timer(0.2, client.release.set).start()
+    uploader.close()
+
+    assert all(future.done() for future in futures)
+    assert len(client.uploads) == 3
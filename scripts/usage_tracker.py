@@ -0,0 +1,109 @@
+import contextvars
+import logging
+import threading
+from contextlib import contextmanager
+
+
+# (company id, phase) that model calls made in the current context are charged to.
+# asyncio.to_thread copies it into worker threads.
+_scope = contextvars.ContextVar("usage_scope", default=(None, "other"))
+
+
+@contextmanager
+def usage_scope(company_id=None, phase=None):
+    """Charge model calls made inside the block to a company and/or phase.
+
+    Whatever is not given is inherited from the enclosing scope.
+    """
+    current_company, current_phase = _scope.get()
+    token = _scope.set((current_company if company_id is None else company_id, phase or current_phase))
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+def _new_entry():
+    return {"calls": 0, "errors": 0, "retries": 0, "prompt_tokens": 0,
+            "completion_tokens": 0, "total_tokens": 0, "seconds": 0.0}
+
+
+class UsageTracker:
+    """Thread-safe totals of model usage, overall, per phase and per company.
+
+    Fed by LimitedOpenAI for every chat completion. With
+    `company_token_budget` set, `over_budget()` tells a company's agent loop
+    to stop once the company has used that many tokens.
+    """
+
+    def __init__(self, company_token_budget=0):
+        self.company_token_budget = company_token_budget
+        self._lock = threading.Lock()
+        self._total = _new_entry()
+        self._by_phase = {}
+        self._by_company = {}
+
+    @staticmethod
+    def scope():
+        """The (company id, phase) calls are currently charged to."""
+        return _scope.get()
+
+    def _entries(self, scope=None):
+        company_id, phase = scope or _scope.get()
+        entries = [self._total, self._by_phase.setdefault(phase, _new_entry())]
+        if company_id is not None:
+            entries.append(self._by_company.setdefault(company_id, _new_entry()))
+        return entries
+
+    def record(self, prompt_tokens, completion_tokens, seconds, error=False, scope=None):
+        """Record one model call in `scope`, by default the current one."""
+        with self._lock:
+            for entry in self._entries(scope):
+                entry["calls"] += 1
+                entry["errors"] += int(error)
+                entry["prompt_tokens"] += prompt_tokens
+                entry["completion_tokens"] += completion_tokens
+                entry["total_tokens"] += prompt_tokens + completion_tokens
+                entry["seconds"] += seconds
+
+    def record_retry(self):
+        """Record that a caller is repeating a failed or unusable call."""
+        with self._lock:
+            for entry in self._entries():
+                entry["retries"] += 1
+
+    def over_budget(self, company_id=None):
+        """Return True if the company (by default the current one) has used up its token budget."""
+        if not self.company_token_budget:
+            return False
+        if company_id is None:
+            company_id, _ = _scope.get()
+        with self._lock:
+            entry = self._by_company.get(company_id)
+            return bool(entry) and entry["total_tokens"] >= self.company_token_budget
+
+    def summary(self):
+        """Totals as a JSON-serializable dict."""
+        def rounded(entry):
+            return dict(entry, seconds=round(entry["seconds"], 2))
+
+        with self._lock:
+            return {
+                "total": rounded(self._total),
+                "by_phase": {phase: rounded(entry) for phase, entry in self._by_phase.items()},
+                "by_company": {str(company_id): rounded(entry) for company_id, entry in self._by_company.items()},
+            }
+
+    def log_summary(self):
+        summary = self.summary()
+        for phase, entry in sorted(summary["by_phase"].items()):
+            logging.info(
+                f"Model usage [{phase}]: {entry['calls']} calls ({entry['errors']} failed, {entry['retries']} retries), "
+                f"{entry['prompt_tokens']} prompt + {entry['completion_tokens']} completion tokens, {entry['seconds']:.1f}s"
+            )
+        by_company = sorted(summary["by_company"].items(), key=lambda item: item[1]["total_tokens"], reverse=True)
+        for company_id, entry in by_company:
+            logging.info(f"Model usage [company {company_id}]: {entry['total_tokens']} tokens, "
+                         f"{entry['calls']} calls, {entry['seconds']:.1f}s")
+        total = summary["total"]
+        logging.info(f"Model usage: {total['total_tokens']} tokens over {total['calls']} calls, {total['seconds']:.1f}s")
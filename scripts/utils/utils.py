@@ -1,4 +1,6 @@
 import base64
+import hashlib
+import io
 import re
 import os
 import json
@@ -7,7 +9,7 @@ import logging
 import numpy as np
 from PIL import Image
 from utils_webarena import fetch_browser_info, fetch_page_accessibility_tree,\
-                    parse_accessibility_tree, clean_accesibility_tree
+                    iter_accessibility_tree_lines, iter_clean_accessibility_tree_lines, budget_accessibility_tree
 from datetime import datetime
 import boto3
 
@@ -59,6 +61,40 @@ def compress_and_resize_image(image_path, output_size=(256, 256), quality=30):
     img.save(compressed_image_path, "JPEG", quality=quality)
     
     return compressed_image_path
+
+
+def resize_image_bytes(image_bytes, short_side=512, quality=75):
+    """
+    Downscale and JPEG-compress an image entirely in memory.
+
+    Same sizing rule as resize_image (shorter side scaled to `short_side`,
+    aspect ratio kept) and the same RGB/JPEG conversion as
+    compress_and_resize_image, but without reading or writing files.
+
+    Args:
+        image_bytes (bytes): Encoded input image, e.g. a PNG screenshot.
+        short_side (int): Target length of the shorter side.
+        quality (int): JPEG quality for the compressed image.
+
+    Returns:
+        bytes: The JPEG-encoded image.
+    """
+    image = Image.open(io.BytesIO(image_bytes))
+    width, height = image.size
+
+    if min(width, height) > short_side:
+        if width < height:
+            new_size = (short_side, int(height * (short_side / width)))
+        else:
+            new_size = (int(width * (short_side / height)), short_side)
+        image = image.resize(new_size, Image.LANCZOS)
+
+    buffer = io.BytesIO()
+    image.convert("RGB").save(buffer, "JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+
 def clip_message_and_obs(msg, max_img_num):
     """
     Clips the message history to include a maximum number of images.
@@ -73,13 +109,13 @@ def clip_message_and_obs(msg, max_img_num):
     for idx in range(len(msg)):
         curr_msg = msg[len(msg) - 1 - idx]
         if curr_msg['role'] != 'user':
-            clipped_msg = [curr_msg] + clipped_msg
+            clipped_msg.append(curr_msg)
         else:
             # Since we no longer include base64 images in 'content',
             # we can include the messages as is
             if img_num < max_img_num:
                 img_num += 1
-                clipped_msg = [curr_msg] + clipped_msg
+                clipped_msg.append(curr_msg)
             else:
                 # Omit the screenshot details to save tokens
                 msg_no_pdf = curr_msg['content'].split("Observation:")[0].strip() + " Observation: Screenshot omitted to save space."
@@ -87,8 +123,8 @@ def clip_message_and_obs(msg, max_img_num):
                     'role': curr_msg['role'],
                     'content': msg_no_pdf
                 }
-                clipped_msg = [curr_msg_clip] + clipped_msg
-    return clipped_msg
+                clipped_msg.append(curr_msg_clip)
+    return clipped_msg[::-1]
 def print_message(json_object, save_dir=None):
     """
     Prints and saves the message history.
@@ -307,20 +343,20 @@ def clip_message(msg, max_img_num):
     for idx in range(len(msg)):
         curr_msg = msg[len(msg) - 1 - idx]
         if curr_msg['role'] != 'user':
-            clipped_msg = [curr_msg] + clipped_msg
+            clipped_msg.append(curr_msg)
         else:
             if type(curr_msg['content']) == str:
-                clipped_msg = [curr_msg] + clipped_msg
+                clipped_msg.append(curr_msg)
             elif img_num < max_img_num:
                 img_num += 1
-                clipped_msg = [curr_msg] + clipped_msg
+                clipped_msg.append(curr_msg)
             else:
                 curr_msg_clip = {
                     'role': curr_msg['role'],
                     'content': curr_msg['content'][0]["text"]
                 }
-                clipped_msg = [curr_msg_clip] + clipped_msg
-    return clipped_msg
+                clipped_msg.append(curr_msg_clip)
+    return clipped_msg[::-1]
 
 
 def clip_message_and_obs(msg, max_img_num):
@@ -329,13 +365,13 @@ def clip_message_and_obs(msg, max_img_num):
     for idx in range(len(msg)):
         curr_msg = msg[len(msg) - 1 - idx]
         if curr_msg['role'] != 'user':
-            clipped_msg = [curr_msg] + clipped_msg
+            clipped_msg.append(curr_msg)
         else:
             if type(curr_msg['content']) == str:
-                clipped_msg = [curr_msg] + clipped_msg
+                clipped_msg.append(curr_msg)
             elif img_num < max_img_num:
                 img_num += 1
-                clipped_msg = [curr_msg] + clipped_msg
+                clipped_msg.append(curr_msg)
             else:
                 msg_no_pdf = curr_msg['content'][0]["text"].split("Observation:")[0].strip() + "Observation: A screenshot and some texts. (Omitted in context.)"
                 msg_pdf = curr_msg['content'][0]["text"].split("Observation:")[0].strip() + "Observation: A screenshot, a PDF file and some texts. (Omitted in context.)"
@@ -343,8 +379,8 @@ def clip_message_and_obs(msg, max_img_num):
                     'role': curr_msg['role'],
                     'content': msg_no_pdf if "You downloaded a PDF file" not in curr_msg['content'][0]["text"] else msg_pdf
                 }
-                clipped_msg = [curr_msg_clip] + clipped_msg
-    return clipped_msg
+                clipped_msg.append(curr_msg_clip)
+    return clipped_msg[::-1]
 
 
 def clip_message_and_obs_text_only(msg, max_tree_num):
@@ -353,11 +389,11 @@ def clip_message_and_obs_text_only(msg, max_tree_num):
     for idx in range(len(msg)):
         curr_msg = msg[len(msg) - 1 - idx]
         if curr_msg['role'] != 'user':
-            clipped_msg = [curr_msg] + clipped_msg
+            clipped_msg.append(curr_msg)
         else:
             if tree_num < max_tree_num:
                 tree_num += 1
-                clipped_msg = [curr_msg] + clipped_msg
+                clipped_msg.append(curr_msg)
             else:
                 msg_no_pdf = curr_msg['content'].split("Observation:")[0].strip() + "Observation: An accessibility tree. (Omitted in context.)"
                 msg_pdf = curr_msg['content'].split("Observation:")[0].strip() + "Observation: An accessibility tree and a PDF file. (Omitted in context.)"
@@ -365,8 +401,8 @@ def clip_message_and_obs_text_only(msg, max_tree_num):
                     'role': curr_msg['role'],
                     'content': msg_no_pdf if "You downloaded a PDF file" not in curr_msg['content'] else msg_pdf
                 }
-                clipped_msg = [curr_msg_clip] + clipped_msg
-    return clipped_msg
+                clipped_msg.append(curr_msg_clip)
+    return clipped_msg[::-1]
 
 
 def print_message(json_object, save_dir=None):
@@ -398,11 +434,27 @@ def print_message(json_object, save_dir=None):
     # return remove_b64code_obj
 
 
-def get_webarena_accessibility_tree(browser, save_file=None):
+def get_webarena_accessibility_tree(browser, save_file=None, token_budget=None):
+    """
+    Fetch the accessibility tree of the visible viewport as text.
+
+    Args:
+        browser (WebDriver): Selenium WebDriver instance.
+        save_file (str): Optional path prefix to dump the tree (.txt) and node info (.json) to.
+        token_budget (int): Optional cap on the size of the returned tree, in estimated tokens.
+
+    Returns:
+        tuple: (tree text, dict of node id -> node info).
+    """
     browser_info = fetch_browser_info(browser)
     accessibility_tree = fetch_page_accessibility_tree(browser_info, browser, current_viewport_only=True)
-    content, obs_nodes_info = parse_accessibility_tree(accessibility_tree)
-    content = clean_accesibility_tree(content)
+    # Parse, clean and budget in one pass over the lines
+    obs_nodes_info = {}
+    lines = iter_clean_accessibility_tree_lines(iter_accessibility_tree_lines(accessibility_tree, obs_nodes_info))
+    if token_budget:
+        content = budget_accessibility_tree(lines, token_budget)
+    else:
+        content = "\n".join(lines)
     if save_file:
         with open(save_file + '.json', 'w', encoding='utf-8') as fw:
             json.dump(obs_nodes_info, fw, indent=2)
@@ -413,18 +465,132 @@ def get_webarena_accessibility_tree(browser, save_file=None):
     return content, obs_nodes_info
 
 
-def compare_images(img1_path, img2_path):
-    img1 = Image.open(img1_path)
-    img2 = Image.open(img2_path)
+def image_digest(image_bytes):
+    """
+    Hash encoded image bytes, so identical frames can be recognised without decoding.
 
-    img1_array = np.asarray(img1)
-    img2_array = np.asarray(img2)
+    Args:
+        image_bytes (bytes): Encoded image, e.g. a PNG screenshot.
 
-    difference = np.abs(img1_array - img2_array)
+    Returns:
+        bytes: A 16-byte BLAKE2b digest.
+    """
+    return hashlib.blake2b(image_bytes, digest_size=16).digest()
+
+
+def load_gray_array(image, size=None):
+    """
+    Decode an image into a grayscale array that is safe to subtract.
+
+    Args:
+        image: Encoded bytes (PNG/JPEG), a file path, a PIL image or a numpy array.
+        size (tuple): Optional (width, height) to downsample to; each output pixel
+            averages a block of input pixels.
+
+    Returns:
+        tuple: (int16 array of shape (height, width), original (width, height)).
+    """
+    if isinstance(image, (bytes, bytearray)):
+        image = Image.open(io.BytesIO(image))
+    elif isinstance(image, str):
+        image = Image.open(image)
+    elif isinstance(image, np.ndarray):
+        image = Image.fromarray(image.astype(np.uint8, copy=False))
+
+    original_size = image.size
+    image = image.convert("L")
+    if size and image.size != tuple(size):
+        image = image.resize(size, Image.BOX)
+    return np.asarray(image, dtype=np.int16), original_size
+
+
+def compare_images(img1, img2, size=None, grid=(4, 4), pixel_delta=16):
+    """
+    Compare two images and report which regions of the frame changed.
 
-    total_difference = np.sum(difference)
+    Encoded inputs (bytes or file paths) with the same hash are reported as
+    identical without being decoded. Otherwise both are converted to grayscale,
+    optionally downsampled to `size`, and differenced as int16 so uint8 values
+    cannot wrap around.
 
-    return total_difference
+    Args:
+        img1: Encoded bytes, a file path, a PIL image or a numpy array.
+        img2: Same kinds as img1.
+        size (tuple): Optional (width, height) both images are downsampled to first.
+        grid (tuple): (columns, rows) of tiles the frame is split into for reporting.
+        pixel_delta (int): Gray-level difference above which a pixel counts as changed.
+
+    Returns:
+        dict: identical (bool), total_difference (int, sum of absolute differences),
+            changed_fraction (float, share of changed pixels) and changed_regions
+            (list of (left, top, right, bottom) boxes, in pixels of img1, of the
+            tiles that changed).
+    """
+    unchanged = {"identical": True, "total_difference": 0, "changed_fraction": 0.0, "changed_regions": []}
+
+    encoded = []
+    for img in (img1, img2):
+        if isinstance(img, str):
+            with open(img, 'rb') as f:
+                img = f.read()
+        encoded.append(img)
+    img1, img2 = encoded
+    if isinstance(img1, (bytes, bytearray)) and isinstance(img2, (bytes, bytearray)):
+        if image_digest(img1) == image_digest(img2):
+            return unchanged
+
+    array1, original_size = load_gray_array(img1, size)
+    array2, original_size2 = load_gray_array(img2, size)
+    width, height = original_size
+    if original_size != original_size2 or array1.shape != array2.shape:
+        return {"identical": False, "total_difference": None, "changed_fraction": 1.0,
+                "changed_regions": [(0, 0, width, height)]}
+
+    difference = np.abs(array1 - array2)
+    changed = difference > pixel_delta
+    changed_count = int(np.count_nonzero(changed))
+    if changed_count == 0 and not difference.any():
+        return unchanged
+
+    # Count changed pixels per tile with one reduction along each axis
+    columns = min(grid[0], changed.shape[1])
+    rows = min(grid[1], changed.shape[0])
+    rows_at = np.linspace(0, changed.shape[0], rows + 1).astype(int)
+    cols_at = np.linspace(0, changed.shape[1], columns + 1).astype(int)
+    tile_counts = np.add.reduceat(np.add.reduceat(changed, rows_at[:-1], axis=0), cols_at[:-1], axis=1)
+
+    scale_x = width / changed.shape[1]
+    scale_y = height / changed.shape[0]
+    changed_regions = [
+        (round(cols_at[col] * scale_x), round(rows_at[row] * scale_y),
+         round(cols_at[col + 1] * scale_x), round(rows_at[row + 1] * scale_y))
+        for row, col in zip(*np.nonzero(tile_counts))
+    ]
+
+    return {
+        "identical": False,
+        "total_difference": int(difference.sum()),
+        "changed_fraction": changed_count / changed.size,
+        "changed_regions": changed_regions,
+    }
+
+
+def screenshots_unchanged(img1, img2, size=(256, 256), pixel_delta=4):
+    """
+    True if two screenshots show the same page.
+
+    Only frames with the same encoded bytes, or with no tile changed at
+    `size`, count as unchanged. Small edits such as typed text, a ticked
+    checkbox or a new results count change only a few hundred pixels, so no
+    share of changed pixels is tolerated.
+
+    Args:
+        img1: Same kinds as for compare_images.
+        img2: Same kinds as for compare_images.
+        size (tuple): (width, height) both frames are downsampled to.
+        pixel_delta (int): Gray-level difference above which a pixel counts as changed.
+    """
+    return not compare_images(img1, img2, size=size, pixel_delta=pixel_delta)["changed_regions"]
 
 
 def get_pdf_retrieval_ans_from_assistant(api, pdf_path, task):
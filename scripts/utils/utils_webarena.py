@@ -1,4 +1,4 @@
-from typing import Any, TypedDict
+from typing import Any, Iterable, Iterator, TypedDict
 import re
 
 
@@ -31,6 +31,8 @@ class BrowserConfig(TypedDict):
 class BrowserInfo(TypedDict):
     DOMTree: dict[str, Any]
     config: BrowserConfig
+    # layout bounds of the main document as captured, before calibration
+    raw_bounds: list[list[float]]
 
 IGNORED_ACTREE_PROPERTIES = (
     "focusable",
@@ -63,10 +65,10 @@ def fetch_browser_info(
     )
 
     # calibrate the bounds, in some cases, the bounds are scaled somehow
-    bounds = tree["documents"][0]["layout"]["bounds"]
-    b = bounds[0]
+    raw_bounds = tree["documents"][0]["layout"]["bounds"]
+    b = raw_bounds[0]
     n = b[2] / browser.get_window_size()["width"]
-    bounds = [[x / n for x in bound] for bound in bounds]
+    bounds = [[x / n for x in bound] for bound in raw_bounds]
     tree["documents"][0]["layout"]["bounds"] = bounds
 
     # extract browser info
@@ -95,7 +97,7 @@ def fetch_browser_info(
     }
 
     # assert len(tree['documents']) == 1, "More than one document in the DOM tree"
-    info: BrowserInfo = {"DOMTree": tree, "config": config}
+    info: BrowserInfo = {"DOMTree": tree, "config": config, "raw_bounds": raw_bounds}
 
     return info
 
@@ -169,6 +171,107 @@ def get_bounding_client_rect(
         return {"result": {"subtype": "error"}}
 
 
+def get_backend_node_bounds(info: BrowserInfo) -> dict[int, list[float]]:
+    """Map backendNodeId to its viewport-relative [x, y, width, height].
+
+    Built from the layout of the DOMSnapshot already captured in
+    fetch_browser_info, so no per-node CDP round trips are needed. Snapshot
+    bounds are document coordinates in CSS pixels; subtracting the scroll
+    offset gives the same rect getBoundingClientRect would return. The main
+    document's bounds are read as captured, since the calibrated ones are
+    scaled and would no longer line up with the scroll offset. A node with
+    several layout boxes gets their union; nodes without layout are absent.
+    """
+    config = info["config"]
+    scroll_x = config["win_left_bound"]
+    scroll_y = config["win_top_bound"]
+
+    node_bounds: dict[int, list[float]] = {}
+    for index, document in enumerate(info["DOMTree"]["documents"]):
+        backend_node_ids = document["nodes"]["backendNodeId"]
+        layout = document["layout"]
+        bounds = info.get("raw_bounds", layout["bounds"]) if index == 0 else layout["bounds"]
+        for node_index, bound in zip(layout["nodeIndex"], bounds):
+            backend_node_id = backend_node_ids[node_index]
+            x, y, width, height = bound[0] - scroll_x, bound[1] - scroll_y, bound[2], bound[3]
+            if backend_node_id in node_bounds:
+                px, py, pwidth, pheight = node_bounds[backend_node_id]
+                left, top = min(x, px), min(y, py)
+                right = max(x + width, px + pwidth)
+                bottom = max(y + height, py + pheight)
+                node_bounds[backend_node_id] = [left, top, right - left, bottom - top]
+            else:
+                node_bounds[backend_node_id] = [x, y, width, height]
+    return node_bounds
+
+
+def is_node_in_viewport(node: AccessibilityTreeNode, config: BrowserConfig) -> bool:
+    if not node["union_bound"]:
+        return False
+
+    [x, y, width, height] = node["union_bound"]
+
+    # invisible node
+    if width == 0 or height == 0:
+        return False
+
+    in_viewport_ratio = get_element_in_viewport_ratio(
+        elem_left_bound=float(x),
+        elem_top_bound=float(y),
+        width=float(width),
+        height=float(height),
+        config=config,
+    )
+    return in_viewport_ratio >= IN_VIEWPORT_RATIO_THRESHOLD
+
+
+def prune_nodes_outside_viewport(
+    accessibility_tree: AccessibilityTree,
+    nodeid_to_cursor: dict[str, int],
+    config: BrowserConfig,
+) -> AccessibilityTree:
+    """Drop nodes outside the viewport, splicing their children into their place.
+
+    Each kept node's childIds becomes its kept descendants reached through
+    removed nodes, in document order, and those descendants are re-parented
+    to it. Every removed node is walked exactly once, from its nearest kept
+    ancestor, so the whole pass is linear in the size of the tree.
+    """
+    removed = [
+        not is_node_in_viewport(node, config) for node in accessibility_tree
+    ]
+    # index-based children; ids of nodes missing from the tree are kept as is
+    child_cursors = [
+        [nodeid_to_cursor.get(child_id, child_id) for child_id in node["childIds"]]
+        for node in accessibility_tree
+    ]
+
+    for cursor, node in enumerate(accessibility_tree):
+        if removed[cursor]:
+            node["parentId"] = "[REMOVED]"
+            continue
+        nodeid = node["nodeId"]
+        new_child_ids = []
+        stack = child_cursors[cursor][::-1]
+        while stack:
+            child = stack.pop()
+            if not isinstance(child, int):
+                new_child_ids.append(child)
+            elif removed[child]:
+                stack.extend(child_cursors[child][::-1])
+            else:
+                child_node = accessibility_tree[child]
+                child_node["parentId"] = nodeid
+                new_child_ids.append(child_node["nodeId"])
+        node["childIds"] = new_child_ids
+
+    return [
+        node
+        for cursor, node in enumerate(accessibility_tree)
+        if not removed[cursor]
+    ]
+
+
 def fetch_page_accessibility_tree(
     info: BrowserInfo,
     browser,
@@ -188,6 +291,9 @@ def fetch_page_accessibility_tree(
             seen_ids.add(node["nodeId"])
     accessibility_tree = _accessibility_tree
 
+    # bounds for every node in one pass over the snapshot layout
+    node_bounds = get_backend_node_bounds(info)
+
     nodeid_to_cursor = {}
     for cursor, node in enumerate(accessibility_tree):
         nodeid_to_cursor[node["nodeId"]] = cursor
@@ -195,103 +301,45 @@ def fetch_page_accessibility_tree(
         if "backendDOMNodeId" not in node:
             node["union_bound"] = None
             continue
-        backend_node_id = str(node["backendDOMNodeId"])
         if node["role"]["value"] == "RootWebArea":
             # always inside the viewport
             node["union_bound"] = [0.0, 0.0, 10.0, 10.0]
         else:
-            response = get_bounding_client_rect(
-                browser, backend_node_id
-            )
-            if response.get("result", {}).get("subtype", "") == "error":
-                node["union_bound"] = None
-            else:
-                x = response["result"]["value"]["x"]
-                y = response["result"]["value"]["y"]
-                width = response["result"]["value"]["width"]
-                height = response["result"]["value"]["height"]
-                node["union_bound"] = [x, y, width, height]
+            # nodes without a layout box are not rendered
+            node["union_bound"] = node_bounds.get(int(node["backendDOMNodeId"]))
 
     # filter nodes that are not in the current viewport
     if current_viewport_only:
-
-        def remove_node_in_graph(node: AccessibilityTreeNode) -> None:
-            # update the node information in the accessibility tree
-            nodeid = node["nodeId"]
-            node_cursor = nodeid_to_cursor[nodeid]
-            parent_nodeid = node["parentId"]
-            children_nodeids = node["childIds"]
-            parent_cursor = nodeid_to_cursor[parent_nodeid]
-            # update the children of the parent node
-            assert (
-                accessibility_tree[parent_cursor].get("parentId", "Root")
-                is not None
-            )
-            # remove the nodeid from parent's childIds
-            index = accessibility_tree[parent_cursor]["childIds"].index(
-                nodeid
-            )
-            accessibility_tree[parent_cursor]["childIds"].pop(index)
-            # Insert children_nodeids in the same location
-            for child_nodeid in children_nodeids:
-                accessibility_tree[parent_cursor]["childIds"].insert(
-                    index, child_nodeid
-                )
-                index += 1
-            # update children node's parent
-            for child_nodeid in children_nodeids:
-                child_cursor = nodeid_to_cursor[child_nodeid]
-                accessibility_tree[child_cursor][
-                    "parentId"
-                ] = parent_nodeid
-            # mark as removed
-            accessibility_tree[node_cursor]["parentId"] = "[REMOVED]"
-
-        config = info["config"]
-        for node in accessibility_tree:
-            if not node["union_bound"]:
-                remove_node_in_graph(node)
-                continue
-
-            [x, y, width, height] = node["union_bound"]
-
-            # invisible node
-            if width == 0 or height == 0:
-                remove_node_in_graph(node)
-                continue
-
-            in_viewport_ratio = get_element_in_viewport_ratio(
-                elem_left_bound=float(x),
-                elem_top_bound=float(y),
-                width=float(width),
-                height=float(height),
-                config=config,
-            )
-
-            if in_viewport_ratio < IN_VIEWPORT_RATIO_THRESHOLD:
-                remove_node_in_graph(node)
-
-        accessibility_tree = [
-            node
-            for node in accessibility_tree
-            if node.get("parentId", "Root") != "[REMOVED]"
-        ]
+        accessibility_tree = prune_nodes_outside_viewport(
+            accessibility_tree, nodeid_to_cursor, info["config"]
+        )
 
     return accessibility_tree
 
 
-def parse_accessibility_tree(
+def iter_accessibility_tree_lines(
     accessibility_tree: AccessibilityTree,
-) -> tuple[str, dict[str, Any]]:
-    """Parse the accessibility tree into a string text"""
+    obs_nodes_info: dict[str, Any] | None = None,
+) -> Iterator[str]:
+    """Yield the lines of the parsed accessibility tree in document order.
+
+    Iterative, so deep trees do not hit the recursion limit, and lazy, so
+    callers can stop early (e.g. at a token budget). If `obs_nodes_info` is
+    given it is filled in for every yielded node.
+    """
+    if not accessibility_tree:
+        return
+
     node_id_to_idx = {}
     for idx, node in enumerate(accessibility_tree):
         node_id_to_idx[node["nodeId"]] = idx
 
-    obs_nodes_info = {}
+    if obs_nodes_info is None:
+        obs_nodes_info = {}
 
-    def dfs(idx: int, obs_node_id: str, depth: int) -> str:
-        tree_str = ""
+    stack = [(0, accessibility_tree[0]["nodeId"], 0)]
+    while stack:
+        idx, obs_node_id, depth = stack.pop()
         node = accessibility_tree[idx]
         indent = "\t" * depth
         valid_node = True
@@ -338,52 +386,137 @@ def parse_accessibility_tree(
                     valid_node = False
 
             if valid_node:
-                tree_str += f"{indent}{node_str}"
+                # emitted before the info lookup, which may still fail
+                yield f"{indent}{node_str}"
                 obs_nodes_info[obs_node_id] = {
                     "backend_id": node["backendDOMNodeId"],
                     "union_bound": node["union_bound"],
                     "text": node_str,
                 }
 
-        except:
+        except Exception:
             valid_node = False
 
-        for _, child_node_id in enumerate(node["childIds"]):
+        # mark this to save some tokens
+        child_depth = depth + 1 if valid_node else depth
+        for child_node_id in reversed(node["childIds"]):
             if child_node_id not in node_id_to_idx:
                 continue
-            # mark this to save some tokens
-            child_depth = depth + 1 if valid_node else depth
-            child_str = dfs(
-                node_id_to_idx[child_node_id], child_node_id, child_depth
+            stack.append(
+                (node_id_to_idx[child_node_id], child_node_id, child_depth)
             )
-            if child_str.strip():
-                if tree_str.strip():
-                    tree_str += "\n"
-                tree_str += child_str
 
-        return tree_str
 
-    tree_str = dfs(0, accessibility_tree[0]["nodeId"], 0)
-    return tree_str, obs_nodes_info
+def parse_accessibility_tree(
+    accessibility_tree: AccessibilityTree,
+) -> tuple[str, dict[str, Any]]:
+    """Parse the accessibility tree into a string text"""
+    obs_nodes_info = {}
+    lines = list(iter_accessibility_tree_lines(accessibility_tree, obs_nodes_info))
+    return "\n".join(lines), obs_nodes_info
+
+
+STATIC_TEXT_PATTERN = re.compile(r"\[\d+\] StaticText '([^']+)'")
+
+
+def iter_clean_accessibility_tree_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Drop StaticText lines whose text already appears in one of the last
+    three kept lines.
+
+    Streams, so it can be chained straight onto iter_accessibility_tree_lines
+    without building the whole tree string first. Property values can contain
+    newlines; those pieces are treated as separate lines, as they are once
+    the tree is joined into a string.
+    """
+    # The last three kept lines, rolled through locals rather than a list slice
+    prev3 = prev2 = prev1 = ""
+    search = STATIC_TEXT_PATTERN.search
+    for chunk in lines:
+        for line in chunk.split("\n") if "\n" in chunk else (chunk,):
+            if "statictext" in line.lower():
+                match = search(line)
+                if not match:
+                    continue
+                static_text = match.group(1)
+                if static_text in prev1 or static_text in prev2 or static_text in prev3:
+                    continue
+            prev3, prev2, prev1 = prev2, prev1, line
+            yield line
 
 
 def clean_accesibility_tree(tree_str: str) -> str:
     """further clean accesibility tree"""
-    clean_lines: list[str] = []
-    for line in tree_str.split("\n"):
-        if "statictext" in line.lower():
-            prev_lines = clean_lines[-3:]
-            pattern = r"\[\d+\] StaticText '([^']+)'"
-
-            match = re.search(pattern, line)
-            if match:
-                static_text = match.group(1)
-                if all(
-                    static_text not in prev_line
-                    for prev_line in prev_lines
-                ):
-                    clean_lines.append(line)
-        else:
-            clean_lines.append(line)
+    return "\n".join(iter_clean_accessibility_tree_lines(tree_str.split("\n")))
+
+
+# Roles worth keeping first when the tree has to be cut down: things the
+# agent can act on, and the blocks job listings are usually made of
+PRIORITY_ACTREE_ROLES = {
+    "link",
+    "button",
+    "textbox",
+    "searchbox",
+    "combobox",
+    "listbox",
+    "option",
+    "checkbox",
+    "radio",
+    "switch",
+    "tab",
+    "menuitem",
+    "heading",
+    "listitem",
+    "row",
+}
+
+DECORATIVE_ACTREE_ROLES = {
+    "img",
+    "image",
+    "figure",
+    "separator",
+    "presentation",
+    "none",
+    "LineBreak",
+    "ListMarker",
+}
+
+ACTREE_LINE_PATTERN = re.compile(r"^\t*\[[^\]]+\] (\S+)")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)"""
+    return len(text) // 4 + 1
+
+
+def budget_accessibility_tree(tree_lines: Iterable[str], token_budget: int) -> str:
+    """Cut the lines of a parsed accessibility tree down to roughly
+    `token_budget` tokens and join them.
+
+    Decorative nodes are always dropped. If the rest does not fit, nodes with
+    a priority role are kept first, then the remaining budget is filled with
+    other nodes; in both passes earlier (higher on the page) lines win.
+    Kept lines stay in document order.
+    """
+    lines = []
+    for line in tree_lines:
+        match = ACTREE_LINE_PATTERN.match(line)
+        role = match.group(1) if match else None
+        if role in DECORATIVE_ACTREE_ROLES:
+            continue
+        lines.append((line, role in PRIORITY_ACTREE_ROLES, estimate_tokens(line)))
+
+    if sum(tokens for _, _, tokens in lines) <= token_budget:
+        return "\n".join(line for line, _, _ in lines)
+
+    keep = [False] * len(lines)
+    used = 0
+    for priority_pass in (True, False):
+        for i, (_, is_priority, tokens) in enumerate(lines):
+            if keep[i] or is_priority != priority_pass:
+                continue
+            if used + tokens > token_budget:
+                break
+            keep[i] = True
+            used += tokens
 
-    return "\n".join(clean_lines)
+    return "\n".join(line for i, (line, _, _) in enumerate(lines) if keep[i])